@@ -5,7 +5,7 @@ import logging
 from colorlog import ColoredFormatter
 import aiohttp
 import bosch_thermostat_client as bosch
-from bosch_thermostat_client.const import XMPP, HTTP
+from bosch_thermostat_client.const import XMPP, HTTP, MAX_IN_FLIGHT, RATE_LIMIT
 from bosch_thermostat_client.const.ivt import IVT
 from bosch_thermostat_client.const.nefit import NEFIT
 from bosch_thermostat_client.const.easycontrol import EASYCONTROL
@@ -23,6 +23,9 @@ except ImportError:
 
 
 _LOGGER = logging.getLogger(__name__)
+QUERY_RATE_LIMIT = 3
+SCAN_CONCURRENCY = 4
+SMALLSCAN_ALL = "all"
 logging.basicConfig(level=logging.INFO)
 fmt = "%(asctime)s %(levelname)s (%(threadName)s) [%(name)s] %(message)s"
 datefmt = "%Y-%m-%d %H:%M:%S"
@@ -75,10 +78,39 @@ def add_options(options):
     return _add_options
 
 
-async def _scan(gateway, smallscan, output, stdout):
+async def _scan(
+    gateway,
+    smallscan,
+    output,
+    stdout,
+    ndjson=False,
+    resume=False,
+    concurrency=1,
+    per_circuit=False,
+):
     _LOGGER.info(
         "Successfully connected to gateway. Found UUID: %s", gateway.uuid
     )
+    if smallscan and smallscan.lower() == SMALLSCAN_ALL:
+        if per_circuit:
+            out_file = output if output else f"smallscan_{gateway.uuid}"
+        else:
+            out_file = output if output else f"smallscan_{gateway.uuid}.ndjson"
+        written = await gateway.smallscan_all(
+            out_file, per_circuit=per_circuit, resume=resume, concurrency=concurrency
+        )
+        for filename, count in written.items():
+            _LOGGER.info("Successfully saved %d nodes to file: %s", count, filename)
+        return
+    if ndjson and not smallscan:
+        out_file = output if output else f"rawscan_{gateway.uuid}.ndjson"
+        if stdout:
+            _LOGGER.warning("NDJSON scan is always written to file %s", out_file)
+        written = await gateway.rawscan_stream(
+            out_file, resume=resume, concurrency=concurrency
+        )
+        _LOGGER.info("Successfully saved %d nodes to file: %s", written, out_file)
+        return
     if smallscan:
         result = await gateway.smallscan(_type=smallscan.lower())
         out_file = output if output else f"smallscan_{gateway.uuid}.json"
@@ -97,11 +129,11 @@ async def _scan(gateway, smallscan, output, stdout):
 async def _runquery(gateway, path):
     _LOGGER.debug("Trying to connect to gateway.")
     results = []
-    for p in path:
-        result = await gateway.raw_query(p)
-        if result:
+    for p, result in (await gateway.raw_query_many(path)).items():
+        if isinstance(result, Exception):
+            _LOGGER.error("%s: %s", p, result)
+        elif result:
             results.append(result)
-        await asyncio.sleep(0.3)
     if results:
         _LOGGER.info("Query succeed: %s", path)
         click.secho(json.dumps(results, indent=4, sort_keys=True), fg="green")
@@ -218,9 +250,41 @@ _scan_options = [
         "-s",
         "--smallscan",
         type=click.Choice(
-            ["HC", "DHW", "SENSORS", "RECORDINGS"], case_sensitive=False
+            ["HC", "DHW", "SENSORS", "RECORDINGS", "ALL"], case_sensitive=False
+        ),
+        help=(
+            "Scan only single circuit of thermostat. "
+            "ALL scans every circuit and zone to NDJSON."
+        ),
+    ),
+    click.option(
+        "--per-circuit",
+        default=False,
+        count=True,
+        help=(
+            "With smallscan ALL write file per circuit "
+            "named [output]_[circuit].ndjson."
         ),
-        help="Scan only single circuit of thermostat.",
+    ),
+    click.option(
+        "--ndjson",
+        default=False,
+        count=True,
+        help="Write rawscan as NDJSON, node by node, while scanning. Can be resumed.",
+    ),
+    click.option(
+        "--resume",
+        default=False,
+        count=True,
+        help="Continue interrupted NDJSON scan to the same output file.",
+    ),
+    click.option(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=SCAN_CONCURRENCY,
+        show_default=True,
+        help="Requests sent to gateway at once during NDJSON scan and smallscan ALL.",
     ),
 ]
 
@@ -242,6 +306,10 @@ async def scan(
     debug: int,
     ignore_unknown: int,
     smallscan: str,
+    per_circuit: int,
+    ndjson: int,
+    resume: int,
+    concurrency: int,
 ):
     """Create rawscan of Bosch thermostat."""
     if debug > 0:
@@ -278,13 +346,27 @@ async def scan(
             host=host,
             access_token=token,
             password=password,
+            connector_options=(
+                {MAX_IN_FLIGHT: concurrency}
+                if ndjson or (smallscan and smallscan.lower() == SMALLSCAN_ALL)
+                else None
+            ),
         )
 
         _LOGGER.debug("Trying to connect to gateway.")
         connected = True if ignore_unknown else await gateway.check_connection()
         if connected:
             _LOGGER.info("Running scan")
-            await _scan(gateway, smallscan, output, stdout)
+            await _scan(
+                gateway,
+                smallscan,
+                output,
+                stdout,
+                ndjson=ndjson,
+                resume=resume,
+                concurrency=concurrency,
+                per_circuit=per_circuit,
+            )
         else:
             _LOGGER.error("Couldn't connect to gateway!")
     finally:
@@ -346,6 +428,7 @@ async def query(
             host=host,
             access_token=token,
             password=password,
+            connector_options={RATE_LIMIT: QUERY_RATE_LIMIT},
         )
         await _runquery(gateway, path)
     except FailedAuthException as e:
@@ -1,4 +1,5 @@
 """Circuits module of Bosch thermostat."""
+import asyncio
 import logging
 from bosch_thermostat_client.circuits.circuit import BasicCircuit
 from bosch_thermostat_client.circuits.easycontrol import (
@@ -88,13 +89,18 @@ class Circuits(BoschEntities):
                 program_uri=database[PROGRAM_LIST], connector=self._connector
             )
 
+        circuit_objects = []
         for circuit in circuits:
             if REFERENCES in circuit:
                 circuit_object = self.create_circuit(circuit, database, current_date)
                 if circuit_object:
-                    await circuit_object.initialize()
-                    if circuit_object.state:
-                        self._items.append(circuit_object)
+                    circuit_objects.append(circuit_object)
+        await asyncio.gather(
+            *(circuit_object.initialize() for circuit_object in circuit_objects)
+        )
+        for circuit_object in circuit_objects:
+            if circuit_object.state:
+                self._items.append(circuit_object)
 
     def create_circuit(self, circuit, database, current_date):
         """Create single circuit of given type."""
@@ -2,6 +2,12 @@ from .http import HttpConnector
 from .ivt import IVTXMPPConnector
 from .nefit import NefitConnector
 from .easycontrol import EasycontrolConnector
+from .scheduler import (
+    BACKGROUND,
+    INTERACTIVE_READ,
+    INTERACTIVE_WRITE,
+    request_priority,
+)
 
 from bosch_thermostat_client.const import HTTP
 
@@ -15,4 +21,8 @@ __all__ = [
     "IVTXMPPConnector",
     "HttpConnector",
     "EasycontrolConnector",
+    "request_priority",
+    "BACKGROUND",
+    "INTERACTIVE_READ",
+    "INTERACTIVE_WRITE",
 ]
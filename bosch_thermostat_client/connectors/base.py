@@ -0,0 +1,389 @@
+"""Logic shared by HTTP and XMPP connectors."""
+
+import asyncio
+import copy
+import logging
+
+from bosch_thermostat_client.const import (
+    ADAPTIVE_TIMEOUT,
+    DECRYPT_EXECUTOR,
+    DECRYPT_THRESHOLD,
+    GET,
+    GET_RETRIES,
+    NEGATIVE_CACHE,
+    PUT,
+    PUT_RETRIES,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    RESPONSE_CACHE,
+    REQUEST_TIMEOUT,
+    RESPONSE_CACHE_SIZE,
+    TIMEOUT,
+    WRITE_DEBOUNCE,
+)
+from bosch_thermostat_client.encryption.offload import (
+    DEFAULT_THRESHOLD,
+    get_executor,
+    json_decrypt,
+)
+from bosch_thermostat_client.exceptions import BoschException, DeviceException
+
+from .cache import DEFAULT_CACHE_SIZE, ResponseCache
+from .negative_cache import NegativeCache
+from .rate_limit import TokenBucket
+from .scheduler import (
+    INTERACTIVE_READ,
+    INTERACTIVE_WRITE,
+    RequestScheduler,
+    current_priority,
+)
+from .singleflight import SingleFlight
+from .timeouts import (
+    DEFAULT_GET_RETRIES,
+    DEFAULT_PUT_RETRIES,
+    RetryPolicy,
+    RttEstimator,
+)
+from .write_queue import WriteQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BaseConnector:
+    """Base connector class.
+
+    Subclasses implement _get and _put which send single request.
+    """
+
+    def __init__(
+        self, capacity=1, get_timeout=REQUEST_TIMEOUT, put_timeout=TIMEOUT, **kwargs
+    ):
+        """
+        :param capacity: how many requests might run at once.
+        :param get_timeout: GET timeout used until round trip time is measured.
+        :param put_timeout: PUT timeout used until round trip time is measured.
+        :param adaptive_timeout: compute timeouts from measured round trip
+            times. Default True, False keeps initial timeouts.
+        :param get_retries: how many times timed out GET is repeated.
+            Default 0, every retry waits twice as long as previous attempt.
+        :param put_retries: how many times timed out PUT is repeated. Default 0.
+        :param negative_cache: True to stop requesting URIs gateway doesn't
+            support for a while or JSON filename to also keep them across restarts.
+        :param decrypt_executor: "thread", "process" or Executor to decrypt
+            and parse big responses outside of event loop. Default disabled.
+        :param decrypt_threshold: responses shorter than this number of bytes
+            are decrypted in event loop.
+        :param response_cache: True to cache responses with default TTLs
+            or dict of URI prefix to TTL in seconds to override them.
+        :param response_cache_size: maximum number of cached responses.
+        :param write_debounce: seconds of quiet before PUT is sent.
+            Only the latest value per URI is written. Disabled by default.
+        :param rate_limit: maximum requests per second to gateway. Lowered
+            automatically when gateway answers with errors or times out.
+        :param rate_limit_burst: requests allowed at once after idle time.
+        """
+        self._scheduler = RequestScheduler(capacity=capacity)
+        self._single_flight = SingleFlight()
+        self._cache = None
+        cache_ttls = kwargs.get(RESPONSE_CACHE)
+        if cache_ttls:
+            self._cache = ResponseCache(
+                ttls=cache_ttls if isinstance(cache_ttls, dict) else None,
+                max_entries=kwargs.get(RESPONSE_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+            )
+        self._write_queue = None
+        if kwargs.get(WRITE_DEBOUNCE):
+            self._write_queue = WriteQueue(
+                put=self._send_put, quiet_period=kwargs[WRITE_DEBOUNCE]
+            )
+        self._rate_limiter = None
+        if kwargs.get(RATE_LIMIT):
+            self._rate_limiter = TokenBucket(
+                rate=kwargs[RATE_LIMIT], burst=kwargs.get(RATE_LIMIT_BURST)
+            )
+        self._timeouts = {
+            GET: RttEstimator(initial=get_timeout),
+            PUT: RttEstimator(initial=put_timeout),
+        }
+        if not kwargs.get(ADAPTIVE_TIMEOUT, True):
+            for estimator in self._timeouts.values():
+                estimator.set_fixed(estimator.timeout)
+        self._answers = 0
+        self._decrypt_executor = None
+        if kwargs.get(DECRYPT_EXECUTOR):
+            self._decrypt_executor = get_executor(kwargs[DECRYPT_EXECUTOR])
+        self._decrypt_threshold = kwargs.get(DECRYPT_THRESHOLD, DEFAULT_THRESHOLD)
+        self._negative_cache = None
+        if kwargs.get(NEGATIVE_CACHE):
+            self._negative_cache = NegativeCache(
+                filename=kwargs[NEGATIVE_CACHE]
+                if isinstance(kwargs[NEGATIVE_CACHE], str)
+                else None
+            )
+        self._retry_policies = {
+            GET: RetryPolicy(kwargs.get(GET_RETRIES, DEFAULT_GET_RETRIES)),
+            PUT: RetryPolicy(kwargs.get(PUT_RETRIES, DEFAULT_PUT_RETRIES)),
+        }
+        self._recorded = None
+        self._replay = None
+
+    async def _get(self, path):
+        raise NotImplementedError
+
+    async def _put(self, path, value):
+        raise NotImplementedError
+
+    def _slot(self, write=False):
+        """Wait for free slot according to priority of request."""
+        return self._scheduler.slot(
+            INTERACTIVE_WRITE if write else current_priority(INTERACTIVE_READ)
+        )
+
+    async def _throttle(self):
+        """Wait until rate limiter lets request go."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+    def _request_done(self, success=True):
+        """Report outcome of request so rate limiter can adapt."""
+        if success:
+            self._answers += 1
+        if self._rate_limiter is not None:
+            if success:
+                self._rate_limiter.success()
+            else:
+                self._rate_limiter.failure()
+
+    def set_timeout(self, timeout=None):
+        """Set constant timeout for API calls. None makes it adaptive again."""
+        for estimator in self._timeouts.values():
+            estimator.set_fixed(timeout)
+
+    def _sample_rtt(self, method, rtt, attempt=0):
+        """Feed round trip time of answered request to timeout estimator."""
+        if attempt == 0:
+            # Karn's algorithm. Answer to repeated request might belong
+            # to any of the attempts.
+            self._timeouts[method].sample(rtt)
+
+    async def _with_retries(self, method, path, send):
+        """Call send(timeout, attempt) until it doesn't time out.
+
+        send raises asyncio.TimeoutError when gateway doesn't answer
+        in time. It is re-raised after the last attempt.
+        """
+        policy = self._retry_policies[method]
+        estimator = self._timeouts[method]
+        answers = self._answers
+        for attempt in range(policy.attempts):
+            if attempt:
+                delay = policy.delay(attempt)
+                _LOGGER.debug(
+                    "Retrying %s request to %s in %.2fs", method.upper(), path, delay
+                )
+                await asyncio.sleep(delay)
+            try:
+                return await send(estimator.retry_timeout(attempt), attempt)
+            except asyncio.TimeoutError:
+                if attempt + 1 == policy.attempts:
+                    if method == GET and self._answers != answers:
+                        # Gateway answers other requests, only this URI hangs.
+                        self._unsupported(path)
+                    raise
+
+    def _unsupported(self, path):
+        """Record URI which gateway doesn't support."""
+        if self._negative_cache is not None:
+            self._negative_cache.failed(path)
+
+    @property
+    def negative_cache(self):
+        """Cache of unsupported URIs or None if disabled."""
+        return self._negative_cache
+
+    async def bind_negative_cache(self, uuid, firmware):
+        """Load unsupported URIs stored for this gateway and firmware."""
+        if self._negative_cache is not None:
+            await self._negative_cache.bind(uuid, firmware)
+
+    async def _save_negative_cache(self):
+        if self._negative_cache is not None:
+            await self._negative_cache.save()
+
+    def _offload_decrypt(self, raw):
+        return (
+            self._decrypt_executor is not None
+            and raw is not None
+            and len(raw) >= self._decrypt_threshold
+        )
+
+    async def _json_decrypt(self, raw):
+        """Decrypt and parse response, big one in decrypt executor."""
+        if not self._offload_decrypt(raw):
+            return self._encryption.json_decrypt(raw)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._decrypt_executor,
+            json_decrypt,
+            type(self._encryption),
+            self._encryption.key,
+            self._encryption.backend,
+            raw,
+        )
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    @property
+    def cache(self):
+        """Response cache or None if disabled."""
+        return self._cache
+
+    async def _fetch(self, path):
+        if self._cache is None:
+            return await self._get(path)
+        generation = self._cache.generation
+        data = await self._get(path)
+        self._cache.set(path, data, generation)
+        return data
+
+    async def _fetch_supported(self, path):
+        data = await self._fetch(path)
+        self._negative_cache.succeeded(path)
+        return data
+
+    def record_responses(self):
+        """Start keeping copy of every GET response, None for failed ones."""
+        self._recorded = {}
+
+    def stop_recording(self):
+        """Stop recording and return recorded responses."""
+        recorded, self._recorded = self._recorded, None
+        return recorded or {}
+
+    def replay_responses(self, responses):
+        """Answer GETs of given paths from responses without network.
+
+        None response means path is not supported. Pass None to stop replay.
+        """
+        self._replay = responses
+
+    @property
+    def replaying(self):
+        return self._replay is not None
+
+    def _replayed(self, path):
+        response = self._replay[path]
+        if response is None:
+            raise DeviceException(f"URI {path} is not supported by gateway.")
+        return copy.deepcopy(response)
+
+    async def get(self, path):
+        """Get message from API with given path.
+
+        Concurrent calls for the same path share one request.
+        """
+        if self._recorded is None and self._replay is None:
+            return await self._get_live(path)
+        try:
+            if self._replay is not None and path in self._replay:
+                result = self._replayed(path)
+            else:
+                result = await self._get_live(path)
+        except DeviceException:
+            if self._recorded is not None:
+                self._recorded[path] = None
+            raise
+        if self._recorded is not None:
+            self._recorded[path] = copy.deepcopy(result)
+        return result
+
+    async def _get_live(self, path):
+        if self._cache is not None:
+            cached = self._cache.get(path)
+            if cached is not None:
+                return cached
+        if self._negative_cache is None:
+            return await self._single_flight.run(path, self._fetch, path)
+        if path in self._negative_cache:
+            self._negative_cache.skipped += 1
+            raise DeviceException(f"URI {path} is not supported by gateway.")
+        return await self._single_flight.run(path, self._fetch_supported, path)
+
+    async def _get_result(self, path):
+        try:
+            return path, await self.get(path)
+        except BoschException as err:
+            return path, err
+
+    async def iter_many(self, paths):
+        """Get paths concurrently, yield (path, result) as responses arrive.
+
+        Result is exception if request failed. Number of requests sent
+        at once is limited by connector window as for single get.
+        """
+        tasks = [
+            asyncio.ensure_future(self._get_result(path))
+            for path in dict.fromkeys(paths)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Caller left early, let requests nobody waits for be cancelled.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_many(self, paths):
+        """Get paths concurrently. Return dict of path to result or exception."""
+        results = dict.fromkeys(paths)
+        async for path, result in self.iter_many(results):
+            results[path] = result
+        return results
+
+    async def _send_put(self, path, value):
+        try:
+            return await self._put(path, value)
+        finally:
+            if self._cache is not None:
+                self._cache.invalidate(path)
+
+    async def put(self, path, value):
+        """Send message to API with given path.
+
+        With write debounce returns when the latest queued value is written.
+        """
+        if self._write_queue is not None:
+            return await asyncio.shield(self._write_queue.put(path, value))
+        return await self._send_put(path, value)
+
+    async def flush_writes(self):
+        """Send queued PUTs immediately."""
+        if self._write_queue is not None:
+            await self._write_queue.flush()
+
+    @property
+    def stats(self):
+        """Counters of requests sent and saved by connector."""
+        stats = {
+            "requests": self._single_flight.requests,
+            "coalesced": self._single_flight.coalesced,
+        }
+        if self._cache is not None:
+            stats["cache_hits"] = self._cache.hits
+            stats["cache_misses"] = self._cache.misses
+        if self._write_queue is not None:
+            stats["writes"] = self._write_queue.writes
+            stats["writes_coalesced"] = self._write_queue.coalesced
+        if self._rate_limiter is not None:
+            stats["rate_limit"] = round(self._rate_limiter.rate, 2)
+            stats["rate_limit_failures"] = self._rate_limiter.failures
+        if self._negative_cache is not None:
+            stats["unsupported"] = len(self._negative_cache)
+            stats["unsupported_skipped"] = self._negative_cache.skipped
+        stats["timeouts"] = {
+            method: estimator.stats for method, estimator in self._timeouts.items()
+        }
+        stats["queues"] = self._scheduler.stats
+        return stats
@@ -0,0 +1,97 @@
+"""Read-through cache of gateway responses."""
+
+import copy
+import time
+from collections import OrderedDict
+
+FOREVER = None
+HOUR = 3600
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_CACHE_TTLS = {
+    "/gateway/uuid": FOREVER,
+    "/gateway/versionFirmware": FOREVER,
+    "/gateway/versionHardware": FOREVER,
+    "/gateway/productID": FOREVER,
+    "/system/brand": FOREVER,
+    "/system/info": 6 * HOUR,
+    "/system/bus": 6 * HOUR,
+    "/system/interfaces": 6 * HOUR,
+    "/system/systemType": 6 * HOUR,
+    "/": 5,
+}
+
+
+class ResponseCache:
+    """LRU cache with TTL chosen by the longest matching URI prefix.
+
+    TTL None means entry never expires, TTL 0 means URI is not cached.
+    """
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_CACHE_SIZE):
+        ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self._ttls = sorted(
+            ttls.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, path):
+        """Find TTL for path."""
+        for prefix, ttl in self._ttls:
+            if path.startswith(prefix):
+                return ttl
+        return 0
+
+    def get(self, path):
+        """Return copy of cached response or None."""
+        entry = self._entries.get(path)
+        if entry is not None:
+            expires, value = entry
+            if expires is None or expires > time.monotonic():
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return copy.deepcopy(value)
+            del self._entries[path]
+        self.misses += 1
+        return None
+
+    def set(self, path, value, generation=None):
+        """Store response unless cache got invalidated while it was fetched."""
+        if generation is not None and generation != self.generation:
+            return
+        ttl = self.ttl(path)
+        if ttl == 0 or value is None:
+            return
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._entries[path] = (expires, copy.deepcopy(value))
+        self._entries.move_to_end(path)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, path):
+        """Drop path, its parent and everything below parent.
+
+        Writing one value often changes its siblings as well,
+        eg. operation mode changes current setpoint.
+        """
+        self.generation += 1
+        parent = path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[0]
+        if not parent:
+            self._entries.pop(path, None)
+            return
+        prefixes = (f"{parent}/", f"{parent}?")
+        for key in [
+            key for key in self._entries if key == parent or key.startswith(prefixes)
+        ]:
+            del self._entries[key]
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
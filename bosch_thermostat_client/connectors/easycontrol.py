@@ -6,7 +6,7 @@ from bosch_thermostat_client.const import (
     USER_AGENT,
     CONTENT_TYPE,
     APP_JSON,
-    ACCESS_KEY,
+    SEQ_NO,
 )
 from bosch_thermostat_client.const.easycontrol import EASYCONTROL
 from pathlib import Path
@@ -24,6 +24,8 @@ class EasycontrolConnector(XMPPBaseConnector):
     no_verify = True
     device_type = EASYCONTROL
     ca_certs = Path(ROOT_DIR, "easycontrol_ca.pem")
+    # PUT is sent without Seq-No.
+    _seq_no_methods = (GET,)
 
     disable_starttls = False
     force_starttls = False
@@ -34,7 +36,7 @@ class EasycontrolConnector(XMPPBaseConnector):
         super().__init__(
             host=host,
             encryption=encryption,
-            access_key=kwargs.get(ACCESS_KEY),
+            **kwargs,
         )
 
     def _build_message(self, method, path, data=None):
@@ -45,10 +47,11 @@ class EasycontrolConnector(XMPPBaseConnector):
                 [
                     f"GET {path} HTTP/1.1",
                     f"{USER_AGENT}: {USERAGENT}",
-                    f"Seq-No: {self._seqno}",
+                    f"{SEQ_NO}: {self._seqno}",
                     "\n",
                 ]
             )
+            self._seqno += 1
         elif method == PUT and data:
             body = "\r".join(
                 [
@@ -63,5 +66,4 @@ class EasycontrolConnector(XMPPBaseConnector):
             )
         else:
             return
-        self._seqno += 1
         return body
@@ -1,8 +1,10 @@
 """HTTP connector class to Bosch thermostat."""
 import logging
-import asyncio
 import json
+import time
 from asyncio import TimeoutError as AsyncTimeout
+from functools import partial
+from aiohttp import ClientSession, TCPConnector
 from aiohttp.client_exceptions import (
     ClientResponseError,
     ClientConnectorError,
@@ -10,21 +12,46 @@ from aiohttp.client_exceptions import (
 )
 
 from bosch_thermostat_client.const.ivt import HTTP_HEADER, IVT
-from bosch_thermostat_client.const import APP_JSON, GET, PUT
+from bosch_thermostat_client.const import (
+    APP_JSON,
+    DEFAULT_MAX_IN_FLIGHT,
+    GET,
+    HTTP_POOL,
+    MAX_IN_FLIGHT,
+    PUT,
+    TIMEOUT,
+)
 from bosch_thermostat_client.exceptions import DeviceException, ResponseException
 
+from bosch_thermostat_client.trace import get_tracer
+
+from .base import BaseConnector
+
 _LOGGER = logging.getLogger(__name__)
+_TRACE = get_tracer(__name__)
 
+POOL_KEEPALIVE_TIMEOUT = 30
+POOL_DNS_CACHE_TTL = 300
 
-class HttpConnector:
+
+class HttpConnector(BaseConnector):
     """HTTP connector to Bosch thermostat."""
 
     def __init__(self, host, encryption, device_type=IVT, **kwargs):
-        """Init of HTTP connector."""
-        self._lock = asyncio.Lock()
+        """Init of HTTP connector.
+
+        :param max_in_flight: how many requests might run at once.
+            Default 1 sends requests one by one.
+        :param http_pool: True to use own session with keep-alive pool
+            limited to max_in_flight connections instead of given one.
+        """
+        self._max_in_flight = kwargs.get(MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+        super().__init__(capacity=self._max_in_flight, get_timeout=TIMEOUT, **kwargs)
         self._host = host
         self._websession = kwargs.get("loop")
-        self._request_timeout = 10
+        self._own_session = kwargs.get(HTTP_POOL, False)
+        if self._own_session:
+            self._websession = None
         self._encryption = encryption
         self.device_type = device_type
 
@@ -32,8 +59,8 @@ class HttpConnector:
     def encryption_key(self):
         return self._encryption.key
 
-    async def _request(self, method, path, **kwargs):
-        _LOGGER.debug("Sending %s request to %s", method.__name__.upper(), path)
+    async def _request(self, method, path, attempt=0, **kwargs):
+        _TRACE("request", method=method.__name__, path=path, attempt=attempt)
 
         async def get_response(method_name, res):
             if method_name == PUT:
@@ -46,14 +73,23 @@ class HttpConnector:
                 and res.status == 200
                 and res.content_type == APP_JSON
             ):
-                data = await res.json(loads=self._encryption.json_decrypt)
+                data = await self._json_decrypt((await res.read()).strip())
                 return data
             raise ResponseException(res)
 
         try:
+            await self._throttle()
+            started = time.monotonic()
             async with method(self._format_url(path), **kwargs) as res:
-                return await get_response(method.__name__, res)
+                data = await get_response(method.__name__, res)
+                self._request_done()
+                self._sample_rtt(method.__name__, time.monotonic() - started, attempt)
+                return data
         except ClientResponseError as err:
+            if err.status == 400 or err.status >= 500:
+                self._request_done(success=False)
+            if err.status in (400, 404) and method.__name__ == GET:
+                self._unsupported(path)
             raise DeviceException(f"URI {path} doesn not exist: {err}")
         except ClientConnectorError as err:
             raise DeviceException(err)
@@ -62,41 +98,78 @@ class HttpConnector:
         except ClientError as err:
             raise DeviceException(f"Error connecting to client {path}: {err}")
         except AsyncTimeout:
-            raise DeviceException(f"Connection timed out for {path}.")
+            self._request_done(success=False)
+            raise
+
+    async def connect(self):
+        """Open own session if requested. Otherwise it is managed by caller."""
+        if self._own_session and self._websession is None:
+            self._websession = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=self._max_in_flight,
+                    keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=POOL_DNS_CACHE_TTL,
+                )
+            )
 
     def _format_url(self, path):
         """Format URL to make requests to gateway."""
         return f"http://{self._host}{path}"
 
-    def set_timeout(self, timeout=10):
-        """Set timeout for API calls."""
-        self._request_timeout = timeout
+    async def _send(self, method, path, timeout, attempt, write=False, **kwargs):
+        async with self._slot(write=write):
+            return await self._request(
+                getattr(self._websession, method),
+                path,
+                attempt=attempt,
+                timeout=timeout,
+                **kwargs,
+            )
 
-    async def get(self, path):
+    async def _get(self, path):
         """Get message from API with given path."""
-        async with self._lock:
-            data = await self._request(
-                self._websession.get,
+        await self.connect()
+        try:
+            data = await self._with_retries(
+                GET,
                 path,
-                headers=HTTP_HEADER,
-                timeout=self._request_timeout,
-                skip_auto_headers=["Accept-Encoding", "Accept"],
-                raise_for_status=True,
+                partial(
+                    self._send,
+                    GET,
+                    path,
+                    headers=HTTP_HEADER,
+                    skip_auto_headers=["Accept-Encoding", "Accept"],
+                    raise_for_status=True,
+                ),
             )
-            _LOGGER.debug("Response to GET request %s: %s", path, json.dumps(data))
-            return data
+        except AsyncTimeout:
+            raise DeviceException(f"Connection timed out for {path}.")
+        _TRACE("response", method=GET, path=path, data=data)
+        return data
 
-    async def put(self, path, value):
+    async def _put(self, path, value):
         """Send message to API with given path."""
-        async with self._lock:
-            return await self._request(
-                self._websession.put,
+        await self.connect()
+        try:
+            return await self._with_retries(
+                PUT,
                 path,
-                data=self._encryption.encrypt(json.dumps({"value": value})),
-                headers=HTTP_HEADER,
-                timeout=self._request_timeout,
+                partial(
+                    self._send,
+                    PUT,
+                    path,
+                    write=True,
+                    data=self._encryption.encrypt(json.dumps({"value": value})),
+                    headers=HTTP_HEADER,
+                ),
             )
+        except AsyncTimeout:
+            raise DeviceException(f"Connection timed out for {path}.")
 
     async def close(self, force=False):
-        if force:
+        await self.flush_writes()
+        await self._save_negative_cache()
+        if self._websession and (force or self._own_session):
             await self._websession.close()
+        if self._own_session:
+            self._websession = None
@@ -1,5 +1,12 @@
 """XMPP Connector to talk to bosch."""
-from bosch_thermostat_client.const import PUT, GET, USER_AGENT, CONTENT_TYPE, APP_JSON
+from bosch_thermostat_client.const import (
+    PUT,
+    GET,
+    USER_AGENT,
+    CONTENT_TYPE,
+    APP_JSON,
+    SEQ_NO,
+)
 from bosch_thermostat_client.const.ivt import TELEHEATER, IVT
 from .xmpp import XMPPBaseConnector
 
@@ -24,7 +31,9 @@ class IVTXMPPConnector(XMPPBaseConnector):
             encryption (obj): Encryption object
         """
         self._seqno = 1
-        super().__init__(host=host, access_key=access_key, encryption=encryption)
+        super().__init__(
+            host=host, access_key=access_key, encryption=encryption, **kwargs
+        )
 
     def _build_message(self, method, path, data=None) -> str:
         if not path:
@@ -34,7 +43,7 @@ class IVTXMPPConnector(XMPPBaseConnector):
                 [
                     f"GET {path} HTTP/1.1",
                     f"{USER_AGENT}: {TELEHEATER}",
-                    f"Seq-No: {self._seqno}",
+                    f"{SEQ_NO}: {self._seqno}",
                     "\r\r",
                 ]
             )
@@ -45,7 +54,7 @@ class IVTXMPPConnector(XMPPBaseConnector):
                     f"{USER_AGENT}: {TELEHEATER}",
                     f"{CONTENT_TYPE}: {APP_JSON}",
                     f"Content-Length: {len(data)}",
-                    f"Seq-No: {self._seqno}",
+                    f"{SEQ_NO}: {self._seqno}",
                     "",
                     data.decode("utf-8"),
                 ]
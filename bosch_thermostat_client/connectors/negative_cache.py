@@ -0,0 +1,110 @@
+"""Remember URIs which gateway doesn't support."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_PROBE_INTERVAL = 60
+MAX_PROBE_INTERVAL = 24 * 3600
+
+
+class NegativeCache:
+    """URIs answered with 404/400 or timing out while gateway works.
+
+    Such URI is not requested again until its probe interval passes.
+    Interval doubles with every failed probe, from min_interval to max_interval.
+    Optionally stored in JSON file so dead URIs survive restart. File is
+    valid only for gateway and firmware it was bound to.
+    """
+
+    def __init__(
+        self,
+        filename=None,
+        min_interval=MIN_PROBE_INTERVAL,
+        max_interval=MAX_PROBE_INTERVAL,
+    ):
+        """
+        :param filename: JSON file to persist cache in. None keeps it in memory.
+        """
+        self._filename = filename
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._key = None
+        self._entries = {}
+        self._dirty = False
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        """Check if path is considered dead right now."""
+        entry = self._entries.get(path)
+        return entry is not None and entry[1] > time.time()
+
+    def failed(self, path):
+        """Record failed request. Return seconds until next probe."""
+        failures, _ = self._entries.get(path, (0, 0))
+        interval = min(self._max_interval, self._min_interval * 2**failures)
+        self._entries[path] = (failures + 1, time.time() + interval)
+        self._dirty = True
+        _LOGGER.debug(
+            "URI %s is not supported. Probing it again in %ss", path, interval
+        )
+        return interval
+
+    def succeeded(self, path):
+        if self._entries.pop(path, None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = True
+
+    @property
+    def dead(self):
+        """Paths which are not requested right now."""
+        return [path for path in self._entries if path in self]
+
+    def _read(self):
+        if not self._filename or not os.path.exists(self._filename):
+            return {}
+        try:
+            with open(self._filename, "r") as db_file:
+                return json.load(db_file)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Can't read negative cache %s: %s", self._filename, err)
+            return {}
+
+    def _write(self, data):
+        tmp = f"{self._filename}.tmp"
+        with open(tmp, "w") as db_file:
+            json.dump(data, db_file)
+        os.replace(tmp, self._filename)
+
+    async def bind(self, uuid, firmware):
+        """Load entries stored for this gateway and firmware.
+
+        Entries of other firmware are dropped, upgrade might add URIs.
+        """
+        self._key = f"{uuid}:{firmware}"
+        stored = await asyncio.to_thread(self._read)
+        if stored.get("key") == self._key:
+            for path, entry in stored.get("entries", {}).items():
+                self._entries.setdefault(path, tuple(entry))
+            _LOGGER.debug("Loaded %d unsupported URIs", len(self._entries))
+
+    async def save(self):
+        """Store entries to file if cache is persistent and changed."""
+        if not self._filename or not self._key or not self._dirty:
+            return
+        data = {"key": self._key, "entries": dict(self._entries)}
+        try:
+            await asyncio.to_thread(self._write, data)
+            self._dirty = False
+        except OSError as err:
+            _LOGGER.warning("Can't save negative cache %s: %s", self._filename, err)
@@ -0,0 +1,75 @@
+"""Limit request rate to single gateway."""
+
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+RATE_INCREASE = 0.1
+RATE_DECREASE = 0.5
+MIN_RATE_RATIO = 0.1
+
+
+class TokenBucket:
+    """Token bucket with AIMD adaptation of its rate.
+
+    Every successful request raises rate by RATE_INCREASE up to max rate,
+    every failure (400 response or timeout) multiplies it by RATE_DECREASE.
+    """
+
+    def __init__(
+        self,
+        rate,
+        burst=None,
+        min_rate=None,
+        increase=RATE_INCREASE,
+        decrease=RATE_DECREASE,
+    ):
+        """
+        :param rate: maximum requests per second
+        :param burst: how many requests might be sent at once after idle time
+        :param min_rate: rate never goes below it. Default 10% of rate
+        """
+        self._max_rate = rate
+        self._min_rate = min_rate or rate * MIN_RATE_RATIO
+        self._rate = rate
+        self._burst = burst or max(1, rate)
+        self._increase = increase
+        self._decrease = decrease
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.failures = 0
+
+    @property
+    def rate(self):
+        """Current rate in requests per second."""
+        return self._rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        """Wait for token."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def success(self):
+        self._rate = min(self._max_rate, self._rate + self._increase)
+
+    def failure(self):
+        self.failures += 1
+        self._refill()
+        self._rate = max(self._min_rate, self._rate * self._decrease)
+        self._tokens = min(self._tokens, 0)
+        _LOGGER.debug("Request failed. Lowering rate to %.2f req/s", self._rate)
@@ -0,0 +1,186 @@
+"""Route XMPP responses to requests waiting for them."""
+
+import asyncio
+import logging
+import re
+from collections import deque
+
+from bosch_thermostat_client.const import BODY_400, GET, ID, PUT, WRONG_ENCRYPTION
+from bosch_thermostat_client.exceptions import EncryptionException, MsgException
+
+_LOGGER = logging.getLogger(__name__)
+
+NO_CONTENT_REGEX = re.compile(r"HTTP/1.[0-1] 20[0-9] No Content")
+
+
+def normalize_path(path):
+    """Strip query and trailing slash so request path equals response id."""
+    if not path:
+        return path
+    return path.split("?", 1)[0].rstrip("/") or "/"
+
+
+class PendingRequest:
+    """Single request waiting for response from gateway."""
+
+    __slots__ = ("method", "path", "seq_no", "message", "future", "correlated")
+
+    def __init__(self, method, path, seq_no=None, message=None):
+        self.method = method
+        self.path = path
+        self.seq_no = seq_no
+        self.message = message
+        # Response was matched by Seq-No or id, not just guessed.
+        self.correlated = False
+        self.future = asyncio.get_running_loop().create_future()
+
+    def resolve(self, result=None, exception=None):
+        if self.future.done():
+            _LOGGER.debug(
+                "Future is already done. "
+                "If it happens too often that it might be a bug. Report it."
+            )
+            return
+        if exception:
+            self.future.set_exception(exception)
+        else:
+            self.future.set_result(result)
+
+
+class ResponseRouter:
+    """Index of pending requests.
+
+    Responses are matched by Seq-No if gateway sends it back,
+    otherwise by normalized path for GET or by order of requests.
+    Error without Seq-No is delivered only if one request is waiting.
+    Lookup by Seq-No is O(1) and by id looks only at requests of that
+    path. Fallbacks for responses carrying neither scan pending requests,
+    which are few as their number is limited by max_in_flight.
+    """
+
+    def __init__(self):
+        self._by_seq = {}
+        self._by_path = {}
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def pending(self):
+        """Pending requests ordered from the oldest one."""
+        return list(self._pending.values())
+
+    def register(self, method, path, seq_no=None, message=None):
+        """Register request before sending it."""
+        request = PendingRequest(method, path, seq_no, message)
+        self._pending[id(request)] = request
+        if seq_no is not None:
+            self._by_seq[seq_no] = request
+        if method == GET:
+            self._by_path.setdefault(normalize_path(path), deque()).append(request)
+        return request
+
+    def unregister(self, request):
+        """Remove request after it's done, cancelled or timed out."""
+        self._pending.pop(id(request), None)
+        if request.seq_no is not None and self._by_seq.get(request.seq_no) is request:
+            del self._by_seq[request.seq_no]
+        if request.method == GET:
+            path = normalize_path(request.path)
+            queue = self._by_path.get(path)
+            if queue:
+                try:
+                    queue.remove(request)
+                except ValueError:
+                    pass
+                if not queue:
+                    del self._by_path[path]
+
+    def _oldest(self, method=None):
+        for request in self._pending.values():
+            if request.future.done():
+                continue
+            if method is None or request.method == method:
+                return request
+        return None
+
+    def _only(self):
+        """The only request waiting for response or None."""
+        waiting = [req for req in self._pending.values() if not req.future.done()]
+        return waiting[0] if len(waiting) == 1 else None
+
+    def _by_id(self, response_id):
+        """Request of GET answered by response with given id.
+
+        Response id has no query, so requests of the same path with
+        different query can't be told apart.
+        """
+        waiting = [
+            request
+            for request in self._by_path.get(normalize_path(response_id), ())
+            if not request.future.done()
+        ]
+        if waiting and all(request.path == waiting[0].path for request in waiting):
+            return waiting[0]
+        return None
+
+    def _find_failed(self, seq_no):
+        if seq_no is not None:
+            # None if request of Seq-No is not waiting anymore.
+            request = self._by_seq.get(seq_no)
+            return request, request is not None
+        # Gateway doesn't tell which request failed,
+        # it's safe to blame only the single waiting request.
+        return self._only(), False
+
+    def _find(self, body, http_response, seq_no):
+        """Return (request, correlated).
+
+        Request is correlated if response points at it by Seq-No or id.
+        """
+        if seq_no is not None and seq_no in self._by_seq:
+            return self._by_seq[seq_no], True
+        if body == BODY_400 or http_response == WRONG_ENCRYPTION:
+            return self._find_failed(seq_no)
+        if NO_CONTENT_REGEX.match(http_response):
+            return self._oldest(PUT), False
+        if isinstance(body, dict):
+            request = self._by_id(body.get(ID))
+            return request, request is not None
+        return None, False
+
+    def route(self, body, http_response, seq_no=None):
+        """Deliver response to the request waiting for it."""
+        request, correlated = self._find(body, http_response, seq_no)
+        if not request:
+            _LOGGER.debug(
+                "No request is waiting for response %s with Seq-No %s",
+                http_response,
+                seq_no,
+            )
+            return False
+        request.correlated = correlated
+        if body == BODY_400:
+            request.resolve(exception=MsgException("400 HTTP Error"))
+        elif body is None and http_response == WRONG_ENCRYPTION:
+            request.resolve(
+                exception=EncryptionException("Can't decrypt for %s" % request.path)
+            )
+        elif request.method == PUT and NO_CONTENT_REGEX.match(http_response):
+            request.resolve(True)
+        elif request.method == GET and body:
+            request.resolve(body)
+        else:
+            return False
+        return True
+
+    def fail(self, exception, seq_no=None):
+        """Fail request which response can't be read."""
+        request, correlated = self._find_failed(seq_no)
+        if not request:
+            _LOGGER.debug("No request is waiting for failed response: %s", exception)
+            return False
+        request.correlated = correlated
+        request.resolve(exception=exception)
+        return True
@@ -0,0 +1,160 @@
+"""Priority aware scheduling of requests to gateway."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+INTERACTIVE_WRITE = 0
+INTERACTIVE_READ = 1
+BACKGROUND = 2
+PRIORITIES = {
+    INTERACTIVE_WRITE: "interactive_write",
+    INTERACTIVE_READ: "interactive_read",
+    BACKGROUND: "background",
+}
+
+STARVATION_TIMEOUT = 5
+
+_request_priority = ContextVar("bosch_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority):
+    """Run requests made inside the block with given priority.
+
+    Eg. wrap periodic polling with request_priority(BACKGROUND)
+    so user actions don't wait behind it.
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority(default=INTERACTIVE_READ):
+    """Priority set by request_priority or default."""
+    priority = _request_priority.get()
+    return default if priority is None else priority
+
+
+class RequestScheduler:
+    """Let at most capacity requests run, highest priority first.
+
+    Request waiting longer than max_wait is served before higher
+    priorities, so background polling is never starved completely.
+    """
+
+    def __init__(self, capacity=1, max_wait=STARVATION_TIMEOUT):
+        self._capacity = max(1, capacity)
+        self._max_wait = max_wait
+        self._active = 0
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._granted = {priority: 0 for priority in PRIORITIES}
+        self._wait_time = {priority: 0.0 for priority in PRIORITIES}
+        self._max_wait_time = {priority: 0.0 for priority in PRIORITIES}
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def active(self):
+        return self._active
+
+    @property
+    def queue_depth(self):
+        """Number of waiting requests per priority class."""
+        return {
+            name: sum(1 for _, future in self._queues[priority] if not future.done())
+            for priority, name in PRIORITIES.items()
+        }
+
+    @property
+    def stats(self):
+        """Queue depth, granted requests and total/max queue wait per class."""
+        depth = self.queue_depth
+        return {
+            name: {
+                "queued": depth[name],
+                "granted": self._granted[priority],
+                "wait_time": round(self._wait_time[priority], 3),
+                "max_wait_time": round(self._max_wait_time[priority], 3),
+            }
+            for priority, name in PRIORITIES.items()
+        }
+
+    def _waiting(self):
+        return any(self._queues.values())
+
+    def _grant(self, priority, started):
+        waited = time.monotonic() - started
+        self._granted[priority] += 1
+        self._wait_time[priority] += waited
+        self._max_wait_time[priority] = max(self._max_wait_time[priority], waited)
+
+    async def acquire(self, priority=INTERACTIVE_READ):
+        started = time.monotonic()
+        if self._active < self._capacity and not self._waiting():
+            self._active += 1
+            self._grant(priority, started)
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (started, future)
+        self._queues[priority].append(entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation. Pass it on.
+                self.release()
+            else:
+                try:
+                    self._queues[priority].remove(entry)
+                except ValueError:
+                    pass
+            raise
+        self._grant(priority, started)
+
+    def release(self):
+        self._active -= 1
+        self._wake()
+
+    def _next(self):
+        now = time.monotonic()
+        starving = None
+        for priority, queue in self._queues.items():
+            while queue and queue[0][1].done():
+                queue.popleft()
+            if not queue:
+                continue
+            started = queue[0][0]
+            if now - started > self._max_wait and (
+                starving is None or started < self._queues[starving][0][0]
+            ):
+                starving = priority
+        if starving is not None:
+            return self._queues[starving].popleft()
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()
+        return None
+
+    def _wake(self):
+        while self._active < self._capacity:
+            entry = self._next()
+            if entry is None:
+                return
+            self._active += 1
+            entry[1].set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority=INTERACTIVE_READ):
+        """Hold one of capacity slots for the time of request."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,141 @@
+"""Keep XMPP session to Bosch relay alive."""
+
+import asyncio
+import logging
+import random
+from contextlib import suppress
+
+from slixmpp.exceptions import IqError, IqTimeout
+
+from bosch_thermostat_client.const import TIMEOUT
+from bosch_thermostat_client.exceptions import FailedAuthException
+
+_LOGGER = logging.getLogger(__name__)
+
+PING_TIMEOUT = 10
+MIN_BACKOFF = 1
+MAX_BACKOFF = 300
+
+
+class XMPPSessionSupervisor:
+    """Connect eagerly, ping the server and reconnect when session is lost."""
+
+    def __init__(
+        self,
+        connector,
+        ping_interval,
+        ping_timeout=PING_TIMEOUT,
+        min_backoff=MIN_BACKOFF,
+        max_backoff=MAX_BACKOFF,
+    ):
+        """
+        :param connector: XMPPBaseConnector to supervise
+        :param ping_interval: seconds between xep_0199 pings
+        :param ping_timeout: seconds to wait for pong before session is dead
+        :param min_backoff: first reconnect delay in seconds
+        :param max_backoff: maximum reconnect delay in seconds
+        """
+        self._connector = connector
+        self._ping_interval = ping_interval
+        self._ping_timeout = ping_timeout
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._task = None
+        self._lost = asyncio.Event()
+        self._stopped = False
+        self.reconnects = 0
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start supervising if not running yet."""
+        if not self.running:
+            self._stopped = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop supervising. Doesn't close session."""
+        self._stopped = True
+        self._lost.set()
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def wait_connected(self, timeout=TIMEOUT):
+        """Wait until session is up. Raise asyncio.TimeoutError otherwise."""
+        self.start()
+        await asyncio.wait_for(self._connector.connected_event.wait(), timeout)
+
+    def session_lost(self):
+        """Called by connector when stream got disconnected."""
+        self._lost.set()
+
+    def _backoff(self, attempt):
+        delay = min(self._max_backoff, self._min_backoff * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _run(self):
+        attempt = 0
+        while not self._stopped:
+            try:
+                if await self._connect():
+                    if self.reconnects:
+                        _LOGGER.info(
+                            "XMPP session to %s restored.",
+                            self._connector.serial_number,
+                        )
+                    attempt = 0
+                    self._connector.resend_pending()
+                    await self._keepalive()
+                    self.reconnects += 1
+            except FailedAuthException as err:
+                _LOGGER.error("%s Not trying to reconnect.", err)
+                return
+            if self._stopped:
+                return
+            delay = self._backoff(attempt)
+            attempt += 1
+            _LOGGER.info("XMPP session is down. Reconnecting in %.1f s.", delay)
+            await asyncio.sleep(delay)
+
+    async def _connect(self):
+        connector = self._connector
+        self._lost.clear()
+        connector.connected_event.clear()
+        connector.connect_client()
+        try:
+            await asyncio.wait_for(connector.connected_event.wait(), TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Can't connect to XMPP server!. "
+                "Check your network connection or credentials!"
+            )
+            connector.client.abort()
+            return False
+        if not connector.auth_success:
+            raise FailedAuthException("Can't authorize to XMPP server.")
+        return True
+
+    async def _keepalive(self):
+        """Return when session is lost."""
+        ping = self._connector.client.plugin["xep_0199"]
+        while not self._stopped:
+            try:
+                await asyncio.wait_for(self._lost.wait(), self._ping_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                rtt = await ping.ping(timeout=self._ping_timeout)
+                _LOGGER.debug("XMPP ping answered in %.3f s", rtt)
+            except IqError:
+                # Server answered with error. It's still alive.
+                pass
+            except IqTimeout:
+                _LOGGER.warning("XMPP ping timed out. Dropping session.")
+                self._connector.client.abort()
+                return
@@ -0,0 +1,58 @@
+"""Share single in-flight request between concurrent callers."""
+
+import asyncio
+import copy
+
+
+class SingleFlight:
+    """Run at most one call per key at the same time.
+
+    Callers asking for a key which is already being fetched wait for
+    the same result instead of sending another request. They get a copy
+    of it, as entities tend to modify responses they receive.
+    Call is cancelled only when every caller waiting for it is cancelled.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._waiters = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self):
+        return len(self._calls)
+
+    async def run(self, key, func, *args):
+        """Await func(*args) or result of already running call for key."""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await self._wait(task))
+        task = asyncio.ensure_future(func(*args))
+        self._calls[key] = task
+        self.requests += 1
+
+        def _done(finished):
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+            if not finished.cancelled():
+                # Mark exception as retrieved in case every caller is gone.
+                finished.exception()
+
+        task.add_done_callback(_done)
+        return await self._wait(task)
+
+    async def _wait(self, task):
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                # Nobody else waits for the result.
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
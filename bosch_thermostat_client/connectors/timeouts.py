@@ -0,0 +1,101 @@
+"""Adaptive request timeouts and retry policies."""
+
+import random
+
+MIN_TIMEOUT = 2
+MAX_TIMEOUT = 30
+CLOCK_GRANULARITY = 0.1
+
+DEFAULT_GET_RETRIES = 0
+DEFAULT_PUT_RETRIES = 0
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 5
+
+
+class RttEstimator:
+    """Estimate timeout from measured round trip times like TCP does (RFC 6298).
+
+    timeout = SRTT + 4 * RTTVAR clamped to <min_timeout, max_timeout>.
+    Until first sample is measured initial timeout is used.
+    Retry of timed out request gets doubled timeout, estimate itself
+    is changed only by samples.
+    """
+
+    alpha = 1 / 8
+    beta = 1 / 4
+    k = 4
+
+    def __init__(self, initial, min_timeout=MIN_TIMEOUT, max_timeout=MAX_TIMEOUT):
+        self._initial = initial
+        self._min_timeout = min_timeout
+        self._max_timeout = max(max_timeout, initial)
+        self._fixed = None
+        self.srtt = None
+        self.rttvar = None
+        self._timeout = initial
+
+    @property
+    def timeout(self):
+        """Timeout in seconds for next request."""
+        return self._fixed if self._fixed is not None else self._timeout
+
+    def set_fixed(self, timeout):
+        """Use constant timeout. None restores adaptive one."""
+        self._fixed = timeout
+
+    def _clamp(self, value):
+        return min(self._max_timeout, max(self._min_timeout, value))
+
+    def sample(self, rtt):
+        """Update estimate with round trip time of successful request.
+
+        Pass only requests which were sent once (Karn's algorithm),
+        response to retransmitted one can't be told apart.
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.beta) * self.rttvar + self.beta * abs(
+                self.srtt - rtt
+            )
+            self.srtt = (1 - self.alpha) * self.srtt + self.alpha * rtt
+        self._timeout = self._clamp(
+            self.srtt + max(CLOCK_GRANULARITY, self.k * self.rttvar)
+        )
+
+    def retry_timeout(self, attempt):
+        """Timeout of given attempt, doubled for every retry."""
+        if self._fixed is not None:
+            return self._fixed
+        return self._clamp(self._timeout * 2**attempt)
+
+    @property
+    def stats(self):
+        return {
+            "srtt": None if self.srtt is None else round(self.srtt, 3),
+            "rttvar": None if self.rttvar is None else round(self.rttvar, 3),
+            "timeout": round(self.timeout, 3),
+        }
+
+
+class RetryPolicy:
+    """How many times and after what delay timed out request is repeated."""
+
+    def __init__(self, retries, delay=RETRY_DELAY, max_delay=MAX_RETRY_DELAY):
+        """
+        :param retries: number of retries after first attempt
+        :param delay: base of exponential backoff in seconds
+        :param max_delay: maximum delay between attempts
+        """
+        self.retries = retries
+        self._delay = delay
+        self._max_delay = max_delay
+
+    @property
+    def attempts(self):
+        return self.retries + 1
+
+    def delay(self, attempt):
+        """Delay before given retry (counted from 1) with full jitter."""
+        return random.uniform(0, min(self._max_delay, self._delay * 2 ** attempt))
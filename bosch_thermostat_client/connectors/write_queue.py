@@ -0,0 +1,88 @@
+"""Debounce PUT requests per URI."""
+
+import asyncio
+import logging
+from contextlib import suppress
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PendingWrite:
+    """Latest value waiting to be sent to URI."""
+
+    __slots__ = ("value", "future", "handle")
+
+    def __init__(self, future):
+        self.value = None
+        self.future = future
+        self.handle = None
+
+
+class WriteQueue:
+    """Keep only the latest value per URI and send it after quiet period.
+
+    Every caller gets future resolved with result of the write which
+    finally got sent, eg. last step of slider drag.
+    """
+
+    def __init__(self, put, quiet_period):
+        """
+        :param put: coroutine function sending single PUT
+        :param quiet_period: seconds without new value before sending
+        """
+        self._put = put
+        self._quiet_period = quiet_period
+        self._pending = {}
+        self._writing = {}
+        self.writes = 0
+        self.coalesced = 0
+
+    def put(self, path, value):
+        """Queue value for path. Return future of the write."""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(path)
+        if pending:
+            pending.handle.cancel()
+            self.coalesced += 1
+        else:
+            pending = PendingWrite(loop.create_future())
+            self._pending[path] = pending
+        pending.value = value
+        pending.handle = loop.call_later(self._quiet_period, self._flush, path)
+        return pending.future
+
+    def _flush(self, path):
+        pending = self._pending.pop(path, None)
+        if pending:
+            pending.handle.cancel()
+            previous = self._writing.get(path)
+            task = asyncio.ensure_future(self._write(path, pending, previous))
+            self._writing[path] = task
+            task.add_done_callback(
+                lambda done: self._writing.pop(path, None)
+                if self._writing.get(path) is done
+                else None
+            )
+
+    async def _write(self, path, pending, previous=None):
+        if previous:
+            # Don't let older value overtake newer one.
+            with suppress(Exception):
+                await previous
+        self.writes += 1
+        _LOGGER.debug("Sending debounced value %s to %s", pending.value, path)
+        try:
+            result = await self._put(path, pending.value)
+        except Exception as err:
+            if not pending.future.done():
+                pending.future.set_exception(err)
+        else:
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def flush(self):
+        """Send all queued values now and wait for them."""
+        for path in list(self._pending):
+            self._flush(path)
+        if self._writing:
+            await asyncio.gather(*self._writing.values(), return_exceptions=True)
@@ -8,6 +8,8 @@ from slixmpp.exceptions import IqError, IqTimeout
 from slixmpp.xmlstream.handler import Callback
 from slixmpp.xmlstream.matcher import StanzaPath
 import asyncio
+import time
+from functools import partial
 from bosch_thermostat_client.exceptions import (
     DeviceException,
     MsgException,
@@ -17,13 +19,24 @@ from bosch_thermostat_client.exceptions import (
 from bosch_thermostat_client.const import (
     GET,
     PUT,
-    REQUEST_TIMEOUT,
     BODY_400,
     WRONG_ENCRYPTION,
     ACCESS_KEY,
+    SEQ_NO,
+    MAX_IN_FLIGHT,
+    DEFAULT_MAX_IN_FLIGHT,
+    KEEPALIVE,
+    TIMEOUT,
 )
 
+from bosch_thermostat_client.trace import get_tracer
+
+from .base import BaseConnector
+from .router import ResponseRouter
+from .session import XMPPSessionSupervisor
+
 _LOGGER = logging.getLogger(__name__)
+_TRACE = get_tracer(__name__)
 
 
 class BoschClientXMPP(ClientXMPP):
@@ -33,17 +46,32 @@ class BoschClientXMPP(ClientXMPP):
         self.ca_certs = ca_certs
 
 
-class XMPPBaseConnector:
+class XMPPBaseConnector(BaseConnector):
     ca_certs = None
+    _seqno = None
+    # Requests which carry Seq-No header, so gateway echoes it back.
+    _seq_no_methods = (GET, PUT)
 
     def __init__(self, host, encryption, **kwargs):
         """
         :param host: aka serial number
         :param password:
+        :param max_in_flight: how many requests might wait for response at once.
+            Default 1 sends requests one by one. Gateways which don't send
+            Seq-No back always get requests one by one.
+        :param keepalive: ping interval in seconds. If set, session is opened
+            eagerly, kept alive and reconnected when lost.
         """
+        max_in_flight = kwargs.get(MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+        if self._seqno is None and max_in_flight != 1:
+            _LOGGER.debug(
+                "Gateway doesn't send Seq-No, ignoring max_in_flight %s",
+                max_in_flight,
+            )
+            max_in_flight = 1
+        super().__init__(capacity=max_in_flight, **kwargs)
         self.serial_number = host
         self._encryption = encryption
-        self._lock = asyncio.Lock()
 
         identifier = self.serial_number + "@" + self.xmpp_host
         self._from = self._rrc_contact_prefix + identifier
@@ -55,6 +83,7 @@ class XMPPBaseConnector:
         self.client.register_plugin("xep_0199")  # XMPP Ping
         self.client.add_event_handler("session_start", self.session_start)
         self.client.add_event_handler("session_end", self.session_end)
+        self.client.add_event_handler("disconnected", self._disconnected)
         self.client.add_event_handler("auth_success", lambda ev: self._auth(True))
         self.client.add_event_handler("failed_auth", lambda ev: self._auth(False))
 
@@ -73,9 +102,16 @@ class XMPPBaseConnector:
         self.disconnect_event = asyncio.Event()
         self._auth_event = asyncio.Event()
         self._auth_success = False
+        self._connect_lock = asyncio.Lock()
         self.received_message = None
 
-        self.listeners = set()
+        self._router = ResponseRouter()
+        self._decrypt_tasks = set()
+        self._supervisor = None
+        if kwargs.get(KEEPALIVE):
+            self._supervisor = XMPPSessionSupervisor(
+                self, ping_interval=kwargs[KEEPALIVE]
+            )
 
     def _auth(self, success: bool) -> None:
         """Called after authentication.
@@ -102,7 +138,77 @@ class XMPPBaseConnector:
             reply["os"] = ""
             reply.send()
 
+    @property
+    def auth_success(self):
+        return self._auth_success
+
+    def connect_client(self):
+        """Start connecting to XMPP server."""
+        self.client.connect(
+            use_ssl=self.use_ssl,
+            force_starttls=self.force_starttls,
+            disable_starttls=self.disable_starttls,
+        )
+
+    async def connect(self):
+        """Open session before first request."""
+        try:
+            await self._ensure_connected()
+        except asyncio.TimeoutError:
+            _LOGGER.error(
+                "Can't connect to XMPP server!. "
+                "Check your network connection or credentials!"
+            )
+
+    async def _ensure_connected(self):
+        if self._supervisor:
+            await self._supervisor.wait_connected(timeout=TIMEOUT)
+        elif not self._auth_success:
+            # Requests sent at once before session exists connect only once.
+            async with self._connect_lock:
+                if not self._auth_success:
+                    self.connect_client()
+                    await asyncio.wait_for(
+                        self.connected_event.wait(), timeout=TIMEOUT
+                    )
+        if not self._auth_success:
+            raise FailedAuthException("Can't authorize to XMPP server.")
+
+    def _disconnected(self, event):
+        self._auth_success = False
+        self.connected_event.clear()
+        if self._supervisor:
+            self._supervisor.session_lost()
+
+    def resend_pending(self):
+        """Send again requests which were in flight when session died."""
+        for request in self._router.pending:
+            if not request.future.done():
+                _LOGGER.debug("Sending again request to %s", request.path)
+                self.client.send_message(
+                    mto=self._to, mbody=request.message, mtype="chat"
+                )
+
+    async def _wait_response(self, request, timeout):
+        if not self._supervisor:
+            return await asyncio.wait_for(request.future, timeout)
+        while True:
+            try:
+                return await asyncio.wait_for(asyncio.shield(request.future), timeout)
+            except asyncio.TimeoutError:
+                if self.connected_event.is_set():
+                    raise
+            # Session died while waiting. Supervisor sends request again
+            # after reconnect, so wait for it and give response another chance.
+            await self._supervisor.wait_connected(timeout=TIMEOUT)
+
     async def close(self, force):
+        await self.flush_writes()
+        await self._save_negative_cache()
+        if self._supervisor:
+            await self._supervisor.stop()
+        for task in self._decrypt_tasks:
+            task.cancel()
         self.client.disconnect()
         await asyncio.wait_for(self.disconnect_event.wait(), 10)
 
@@ -123,91 +229,94 @@ class XMPPBaseConnector:
     def _build_message(self, method, path, data=None):
         pass
 
-    async def get(self, path):
-        _LOGGER.debug("Sending GET request to %s by %s", path, id(self))
+    async def _get(self, path):
+        _TRACE("request", method=GET, path=path, connector=id(self))
         data = await self._request(method=GET, path=path)
-        _LOGGER.debug("Response to GET request %s: %s", path, json.dumps(data))
+        _TRACE("response", method=GET, path=path, data=data)
         if not data:
             raise DeviceException(f"Error requesting data from {path}")
         return data
 
-    async def put(self, path, value):
-        _LOGGER.debug("Sending PUT request to %s with value %s", path, value)
+    async def _put(self, path, value):
+        _TRACE("request", method=PUT, path=path, value=value)
         data = await self._request(
             method=PUT,
             encrypted_msg=self._encryption.encrypt(json.dumps({"value": value})),
             path=path,
-            timeout=10,
         )
         if data:
             return True
 
-    async def _request(self, method, path, encrypted_msg=None, timeout=REQUEST_TIMEOUT):
-        data = None
+    async def _request(self, method, path, encrypted_msg=None):
         try:
-            if not self._auth_success:
-                self.client.connect(
-                    use_ssl=self.use_ssl, force_starttls=self.force_starttls, disable_starttls=self.disable_starttls
-                )
-                await asyncio.wait_for(self.connected_event.wait(), timeout=10)
-                if not self._auth_success:
-                    raise FailedAuthException("Can't authorize to XMPP server.")
+            await self._ensure_connected()
         except asyncio.TimeoutError:
             _LOGGER.error(
-                "Can't connect to XMPP server!. Check your network connection or credentials!"
+                "Can't connect to XMPP server!. "
+                "Check your network connection or credentials!"
             )
             return None
-        await self._lock.acquire()
-        msg_to_send = self._build_message(method=method, path=path, data=encrypted_msg)
         try:
-            future = asyncio.Future()
-
-            def listener(recv_body, http_response):
-                if future.done() or future.cancelled():
-                    _LOGGER.debug(
-                        "Future is already done. If it happens too often that it might be a bug. Report it."
-                    )
-                    return
-                if method == PUT and re.match(r"HTTP/1.[0-1] 20[0-9] No Content", http_response):
-                    future.set_result(True)
-                if recv_body == BODY_400:
-                    future.set_exception(MsgException("400 HTTP Error"))
-                elif recv_body is None and http_response == WRONG_ENCRYPTION:
-                    future.set_exception(
-                        EncryptionException("Can't decrypt for %s" % path)
-                    )
-                elif method == GET and recv_body.get("id") in path:
-                    try:
-                        future.set_result(recv_body)
-                    except asyncio.InvalidStateError as err:
-                        _LOGGER.error(
-                            "If you see this log please attach it to your issue/send it on Discord. Err message: %s. Recv body: %s, Path: %s",
-                            err,
-                            json.dumps(recv_body),
-                            path,
-                        )
-                        pass
+            return await self._with_retries(
+                method,
+                path,
+                partial(self._send_request, method, path, encrypted_msg),
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.info("Request to %s timed out", path)
+            return None
 
+    async def _send_request(self, method, path, encrypted_msg, timeout, attempt):
+        data = None
+        async with self._slot(write=method == PUT):
+            seq_no = self._seqno if method in self._seq_no_methods else None
+            msg_to_send = self._build_message(
+                method=method, path=path, data=encrypted_msg
+            )
+            request = self._router.register(
+                method=method, path=path, seq_no=seq_no, message=msg_to_send
+            )
+            reconnects = self._supervisor.reconnects if self._supervisor else 0
             try:
-                self.listeners.add(listener)
+                await self._throttle()
+                started = time.monotonic()
                 self.client.send_message(mto=self._to, mbody=msg_to_send, mtype="chat")
-                data = await asyncio.wait_for(future, timeout)
+                data = await self._wait_response(request, timeout)
+                self._request_done()
+                if not self._supervisor or self._supervisor.reconnects == reconnects:
+                    self._sample_rtt(method, time.monotonic() - started, attempt)
             except IqError as e:
                 _LOGGER.error("Error sending message: %s", e)
             except IqTimeout:
                 _LOGGER.error("IqTimeout sending message")
-            except (asyncio.TimeoutError, MsgException):
+            except asyncio.TimeoutError:
+                self._request_done(success=False)
+                raise
+            except MsgException:
                 _LOGGER.info("Msg exception for %s", path)
+                self._request_done(success=False)
+                if method == GET and request.correlated:
+                    self._unsupported(path)
             except EncryptionException as err:
-                _LOGGER.warn(err)
+                _LOGGER.warning(err)
                 raise EncryptionException(err)
             except asyncio.InvalidStateError as err:
                 _LOGGER.error("Unknown error occured. Please check logs. %s", err)
             finally:
-                self.listeners.remove(listener)
-        finally:
-            self._lock.release()
-            return data
+                self._router.unregister(request)
+        return data
+
+    @staticmethod
+    def _parse_seq_no(headers):
+        """Find Seq-No header in gateway response."""
+        for header in headers:
+            name, _, value = header.partition(":")
+            if name.strip().lower() == SEQ_NO.lower():
+                try:
+                    return int(value.strip())
+                except ValueError:
+                    return None
+        return None
 
     def main_listener(self, msg):
         if msg["type"] not in ("normal", "chat"):
@@ -215,31 +324,44 @@ class XMPPBaseConnector:
         body = msg["body"]
         if not body:
             return
-
-        def notify_error(body, response):
-            if len(self.listeners) == 1:
-                for listener in self.listeners:
-                    listener(body, response)
-                    break
-
         try:
             body_arr = body.split("\n")
         except AttributeError:
             return
         http_response = body_arr[0]
+        seq_no = self._parse_seq_no(body_arr[1:-1])
         if re.match(r"HTTP/1.[0-1] 20*", http_response):
+            raw = body_arr[-1:][0]
+            if self._offload_decrypt(raw):
+                task = asyncio.ensure_future(
+                    self._route_decrypted(raw, http_response, seq_no)
+                )
+                self._decrypt_tasks.add(task)
+                task.add_done_callback(self._decrypt_tasks.discard)
+                return
             try:
-                decrypted_body = self._encryption.json_decrypt(body_arr[-1:][0])
+                decrypted_body = self._encryption.json_decrypt(raw)
             except EncryptionException:
-                notify_error(body=None, response=WRONG_ENCRYPTION)
+                self._router.route(None, WRONG_ENCRYPTION, seq_no)
             else:
-                for listener in self.listeners:
-                    listener(decrypted_body, http_response)
+                self._router.route(decrypted_body, http_response, seq_no)
             return
         if re.match(r"HTTP/1.[0-1] 40*", http_response):
             _LOGGER.info(f"400 HTTP Error - {body_arr}")
-            notify_error(body=BODY_400, response=http_response)
-    
+            self._router.route(BODY_400, http_response, seq_no)
+
+    async def _route_decrypted(self, raw, http_response, seq_no):
+        """Decrypt big response in executor and pass it to waiting request."""
+        try:
+            decrypted_body = await self._json_decrypt(raw)
+        except EncryptionException:
+            self._router.route(None, WRONG_ENCRYPTION, seq_no)
+        except DeviceException as err:
+            _LOGGER.error("Unable to decode response: %s", err)
+            self._router.fail(err, seq_no)
+        else:
+            self._router.route(decrypted_body, http_response, seq_no)
+
     @staticmethod
     def discard_ssl_invalid_chain(event):
         """Do nothing if ssl certificate is invalid."""
@@ -14,6 +14,22 @@ TIMEOUT = 10
 REQUEST_TIMEOUT = 6
 BODY_400 = "400Error"
 WRONG_ENCRYPTION = "WrongEncryption"
+SEQ_NO = "Seq-No"
+MAX_IN_FLIGHT = "max_in_flight"
+DEFAULT_MAX_IN_FLIGHT = 1
+KEEPALIVE = "keepalive"
+RESPONSE_CACHE = "response_cache"
+RESPONSE_CACHE_SIZE = "response_cache_size"
+WRITE_DEBOUNCE = "write_debounce"
+RATE_LIMIT = "rate_limit"
+RATE_LIMIT_BURST = "rate_limit_burst"
+ADAPTIVE_TIMEOUT = "adaptive_timeout"
+GET_RETRIES = "get_retries"
+PUT_RETRIES = "put_retries"
+NEGATIVE_CACHE = "negative_cache"
+HTTP_POOL = "http_pool"
+DECRYPT_EXECUTOR = "decrypt_executor"
+DECRYPT_THRESHOLD = "decrypt_threshold"
 
 USER_AGENT = "User-Agent"
 CONTENT_TYPE = "Content-Type"
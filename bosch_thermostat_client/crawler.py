@@ -0,0 +1,64 @@
+"""Breadth-first crawler of Bosch API references."""
+import asyncio
+import re
+from collections import deque
+
+from bosch_thermostat_client.const import ID, REFERENCES
+
+from .exceptions import DeviceException
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def iter_crawl_positions(
+    url, deep, get, exclude=None, concurrency=DEFAULT_CONCURRENCY
+):
+    """Crawl references breadth-first, yield (position, response) of leaves.
+
+    Leaf is response without references or one found at given deep.
+    Position is tuple of reference indexes from url, sorting by it gives
+    order of depth-first crawl. Every URI is fetched once, failing URIs
+    are skipped. At most `concurrency` requests run at once.
+    """
+    pending = deque([((), url, deep)])
+    visited = {url}
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                position, uri, remaining = pending.popleft()
+                running[asyncio.ensure_future(get(uri))] = (position, remaining)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position, remaining = running.pop(task)
+                try:
+                    resp = task.result()
+                except DeviceException:
+                    continue
+                if (REFERENCES not in resp or remaining == 0) and ID in resp:
+                    if not exclude or not re.match(exclude, resp[ID]):
+                        yield position, resp
+                elif REFERENCES in resp and remaining > 0:
+                    for idx, ref in enumerate(resp[REFERENCES]):
+                        if ID in ref and ref[ID] not in visited:
+                            visited.add(ref[ID])
+                            pending.append((position + (idx,), ref[ID], remaining - 1))
+    finally:
+        for task in running:
+            task.cancel()
+
+
+async def iter_crawl(url, deep, get, exclude=None, concurrency=DEFAULT_CONCURRENCY):
+    """Crawl references breadth-first, yield leaf responses as they arrive."""
+    async for _, resp in iter_crawl_positions(url, deep, get, exclude, concurrency):
+        yield resp
+
+
+async def crawl_all(url, deep, get, exclude=None, concurrency=DEFAULT_CONCURRENCY):
+    """Crawl references concurrently, return leaves in depth-first order."""
+    found = [
+        found
+        async for found in iter_crawl_positions(url, deep, get, exclude, concurrency)
+    ]
+    found.sort(key=lambda item: item[0])
+    return [resp for _, resp in found]
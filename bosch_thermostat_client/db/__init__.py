@@ -4,6 +4,7 @@ import asyncio
 import logging
 import json
 import os
+from functools import partial
 
 from bosch_thermostat_client.const import DEFAULT, FIRMWARE_VERSION
 from bosch_thermostat_client.const.nefit import NEFIT
@@ -16,6 +17,10 @@ from bosch_thermostat_client.const.ivt import (
 )
 from bosch_thermostat_client.const.easycontrol import EASYCONTROL
 
+from . import shared
+from .bundle import get_bundle
+from .error_index import build_error_index
+
 _LOGGER = logging.getLogger(__name__)
 
 MAINPATH = os.path.join(os.path.dirname(__file__))
@@ -36,7 +41,12 @@ async def async_open_json(file):
 
 
 def open_json(file):
-    """Open json file."""
+    """Open json file. Use compiled bundle if it contains the file."""
+    bundle = get_bundle()
+    if bundle is not None:
+        datastore = bundle.load(file)
+        if datastore is not None:
+            return datastore
     try:
         with open(file, "r") as db_file:
             datastore = json.load(db_file)
@@ -52,18 +62,46 @@ async def get_initial_db(device_type):
     return await async_open_json(filename)
 
 
+def _firmware_db_path(device_type, firmware_version):
+    filename = DEVICE_TYPES[device_type].format(
+        firmware_version.replace(".", "")
+    )
+    return os.path.join(MAINPATH, filename)
+
+
+def _open_firmware_db(device_type, firmware_version):
+    filepath = _firmware_db_path(device_type, firmware_version)
+    _LOGGER.debug("Attempt to load database from file %s", filepath)
+    _db = open_json(filepath)
+    return _db if _db.get(FIRMWARE_VERSION) == firmware_version else None
+
+
 async def get_db_of_firmware(device_type, firmware_version):
     """Get db of specific device."""
     if not firmware_version:
         _LOGGER.error("Can't find your fw version.")
         return None
-    filename = DEVICE_TYPES[device_type].format(
-        firmware_version.replace(".", "")
+    return await asyncio.to_thread(_open_firmware_db, device_type, firmware_version)
+
+
+async def get_shared_initial_db(device_type, owner=None):
+    """Get initial db shared by all gateways. Don't modify it."""
+    filename = os.path.join(MAINPATH, f"db_{device_type}.json")
+    return await shared.schemas.get(
+        (device_type,), partial(open_json, filename), owner
+    )
+
+
+async def get_shared_db_of_firmware(device_type, firmware_version, owner=None):
+    """Get db of specific device shared by all gateways. Don't modify it."""
+    if not firmware_version:
+        _LOGGER.error("Can't find your fw version.")
+        return None
+    return await shared.schemas.get(
+        (device_type, firmware_version),
+        partial(_open_firmware_db, device_type, firmware_version),
+        owner,
     )
-    filepath = os.path.join(MAINPATH, filename)
-    _LOGGER.debug("Attempt to load database from file %s", filepath)
-    _db = await async_open_json(filepath)
-    return _db if _db.get(FIRMWARE_VERSION) == firmware_version else None
 
 
 def get_custom_db(firmware_version, _db):
@@ -89,12 +127,28 @@ def get_easycontrol_errors() -> dict:
     return open_json(os.path.join(MAINPATH, "errorcodes_easycontrol.json"))
 
 
-async def async_get_errors(device_type) -> dict:
-    """Get error codes of all devices."""
+def get_errors(device_type) -> dict:
+    """Get error codes of device type."""
     if device_type == EASYCONTROL:
-        return await asyncio.to_thread(get_easycontrol_errors)
+        return get_easycontrol_errors()
     elif device_type == NEFIT:
-        return await asyncio.to_thread(get_nefit_errors)
+        return get_nefit_errors()
     elif device_type == IVT:
-        return (await asyncio.to_thread(get_nefit_errors)) | (await asyncio.to_thread(get_ivt_errors))
+        return get_nefit_errors() | get_ivt_errors()
     return {}
+
+
+async def async_get_errors(device_type) -> dict:
+    """Get error codes of all devices."""
+    return await asyncio.to_thread(get_errors, device_type)
+
+
+def _load_error_index(device_type):
+    return build_error_index(device_type, get_errors(device_type))
+
+
+async def get_shared_error_index(device_type, owner=None):
+    """Get compiled error codes shared by all gateways."""
+    return await shared.error_indexes.get(
+        device_type, partial(_load_error_index, device_type), owner
+    )
@@ -0,0 +1,8 @@
+"""Compile database bundle: python -m bosch_thermostat_client.db"""
+from .bundle import build_bundle
+
+stats = build_bundle()
+print(
+    f"Compiled {stats['files']} files into {stats['blobs']} unique sections: "
+    f"{stats['source_size']} -> {stats['bundle_size']} bytes"
+)
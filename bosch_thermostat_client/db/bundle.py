@@ -0,0 +1,190 @@
+"""Compiled bundle of JSON databases.
+
+All databases are stored in one file read through mmap in marshal
+format, which Python loads about twice as fast as JSON. Top level sections
+of firmware schemas shared by many firmware versions are stored once.
+
+Layout: MAGIC, marshal version, Python major and minor version,
+4 bytes length of index, marshalled index, blobs. Marshal format may
+change between Python versions, so bundle of other Python is not used.
+Index maps file path relative to db directory (without .json) either
+to blob number or for firmware schemas to {section: blob number}.
+It also keeps size, mtime and hash of every source file. JSON file
+edited after bundle was built is read instead of stale bundle entry.
+
+Building wheel compiles it (see build_db.py), in source tree build it
+with: python -m bosch_thermostat_client.db
+"""
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+MAINPATH = os.path.dirname(__file__)
+BUNDLE_FILE = os.path.join(MAINPATH, "bundle.bin")
+MAGIC = b"BOSCHDB4"
+HEADER = struct.Struct("<8sBBBI")
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+def _relpath(path, root=MAINPATH):
+    relpath = os.path.relpath(path, root).replace(os.sep, "/")
+    return relpath[:-5] if relpath.endswith(".json") else relpath
+
+
+def _source_files(root):
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename.endswith(".json"):
+                yield os.path.join(dirpath, filename)
+
+
+def _stamp(path, stat=None):
+    """Size, mtime and sha256 of source file."""
+    stat = stat or os.stat(path)
+    with open(path, "rb") as source:
+        digest = hashlib.sha256(source.read()).digest()
+    return stat.st_size, stat.st_mtime_ns, digest
+
+
+def build_bundle(root=MAINPATH, output=BUNDLE_FILE):
+    """Compile all JSON files under root into bundle. Return statistics."""
+    files = {}
+    sources = {}
+    blobs = []
+    blob_ids = {}
+    source_size = 0
+
+    def add_blob(value):
+        blob = marshal.dumps(value)
+        digest = hashlib.sha256(blob).digest()
+        if digest not in blob_ids:
+            blob_ids[digest] = len(blobs)
+            blobs.append(blob)
+        return blob_ids[digest]
+
+    for path in sorted(_source_files(root)):
+        source_size += os.path.getsize(path)
+        with open(path, "r") as db_file:
+            data = json.load(db_file)
+        relpath = _relpath(path, root)
+        sources[relpath] = _stamp(path)
+        if "/" in relpath:
+            # Firmware schema, most sections are the same in next firmware.
+            files[relpath] = {name: add_blob(value) for name, value in data.items()}
+        else:
+            files[relpath] = add_blob(data)
+    offsets = []
+    offset = 0
+    for blob in blobs:
+        offsets.append((offset, len(blob)))
+        offset += len(blob)
+    index = marshal.dumps({"files": files, "sources": sources, "blobs": offsets})
+    tmp = f"{output}.tmp"
+    with open(tmp, "wb") as bundle_file:
+        bundle_file.write(
+            HEADER.pack(MAGIC, marshal.version, *sys.version_info[:2], len(index))
+        )
+        bundle_file.write(index)
+        for blob in blobs:
+            bundle_file.write(blob)
+    os.replace(tmp, output)
+    return {
+        "files": len(files),
+        "blobs": len(blobs),
+        "source_size": source_size,
+        "bundle_size": os.path.getsize(output),
+    }
+
+
+class Bundle:
+    """Read only view of compiled bundle."""
+
+    def __init__(self, filename=BUNDLE_FILE, root=MAINPATH):
+        """
+        :param root: directory of JSON files bundle was built from
+        """
+        self._root = root
+        with open(filename, "rb") as bundle_file:
+            self._mmap = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *python, index_size = HEADER.unpack_from(self._mmap)
+        if (
+            magic != MAGIC
+            or version != marshal.version
+            or tuple(python) != sys.version_info[:2]
+        ):
+            self._mmap.close()
+            raise ValueError(f"{filename} is not database bundle of this Python")
+        start = HEADER.size
+        index = marshal.loads(self._mmap[start : start + index_size])
+        self._files = index["files"]
+        self._sources = index["sources"]
+        self._data_start = start + index_size
+        self._blobs = index["blobs"]
+
+    def __contains__(self, path):
+        return _relpath(path, self._root) in self._files
+
+    def _blob(self, number):
+        offset, length = self._blobs[number]
+        offset += self._data_start
+        return marshal.loads(self._mmap[offset : offset + length])
+
+    def is_fresh(self, path):
+        """Check if source file didn't change since bundle was built.
+
+        Hash is compared only if mtime differs, eg. after reinstall.
+        """
+        relpath = _relpath(path, self._root)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            # Only bundle is installed.
+            return True
+        size, mtime_ns, digest = self._sources[relpath]
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            return True
+        return _stamp(path, stat)[2] == digest
+
+    def load(self, path):
+        """Load file stored in bundle.
+
+        Return None if it's not there or its source file was edited.
+        """
+        entry = self._files.get(_relpath(path, self._root))
+        if entry is None:
+            return None
+        if not self.is_fresh(path):
+            _LOGGER.debug("Database bundle is older than %s", path)
+            return None
+        if isinstance(entry, int):
+            return self._blob(entry)
+        return {name: self._blob(number) for name, number in entry.items()}
+
+    def close(self):
+        self._mmap.close()
+
+
+def get_bundle():
+    """Bundle shipped with package or None if it's not built."""
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                try:
+                    _bundle = Bundle()
+                except (OSError, ValueError) as err:
+                    _LOGGER.debug("Database bundle not available: %s", err)
+                    _bundle = False
+    return _bundle or None
@@ -0,0 +1,112 @@
+"""Error code tables compiled for constant time lookup.
+
+Indexes are built once from error code JSON and shared read only
+by notification sensors of all gateways.
+"""
+from bosch_thermostat_client.const.easycontrol import EASYCONTROL
+from bosch_thermostat_client.const.ivt import IVT
+
+UNKNOWN_ERROR = "Unknown error"
+
+
+class EasycontrolErrorIndex:
+    """Messages keyed by (dcd, ccd, act, fc).
+
+    Matching rules of former row scan are precomputed:
+    only row of ccd matches anything, then first row matching both
+    failure-type and error-class, then last row matching one of them.
+    """
+
+    def __init__(self, errorcodes):
+        self._single = {}
+        self._exact = {}
+        self._by_act = {}
+        self._by_fc = {}
+        for dcd, ccds in errorcodes.items():
+            for ccd, rows in ccds.items():
+                if len(rows) == 1:
+                    self._single[(dcd, ccd)] = rows[0]["message"]
+                    continue
+                for idx, row in enumerate(rows):
+                    act = row["failure-type"]
+                    fc = row["error-class"]
+                    self._exact.setdefault((dcd, ccd, act, fc), row["message"])
+                    self._by_act[(dcd, ccd, act)] = (idx, row["message"])
+                    self._by_fc[(dcd, ccd, fc)] = (idx, row["message"])
+
+    def __len__(self):
+        return len(self._single) + len(self._exact)
+
+    def message(self, dcd, ccd, act, fc):
+        """Return message of error or Unknown error."""
+        msg = self._single.get((dcd, ccd))
+        if msg is not None:
+            return msg
+        msg = self._exact.get((dcd, ccd, act, fc))
+        if msg is not None:
+            return msg
+        partial = max(
+            self._by_act.get((dcd, ccd, act), (-1, UNKNOWN_ERROR)),
+            self._by_fc.get((dcd, ccd, fc), (-1, UNKNOWN_ERROR)),
+        )
+        return partial[1]
+
+
+class IvtErrorIndex:
+    """Title and flattened attributes keyed by ccd."""
+
+    def __init__(self, errorcodes):
+        self._rows = {}
+        for ccd, row in errorcodes.items():
+            fields = []
+            for key, description in row.items():
+                if isinstance(description, list):
+                    for alternative in description:
+                        for altkey, value in alternative.items():
+                            fields.append((key, f"_{altkey}", value))
+                else:
+                    fields.append((key, "", description))
+            self._rows[ccd] = (row.get("title", UNKNOWN_ERROR), tuple(fields))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def title(self, ccd):
+        row = self._rows.get(ccd)
+        return row[0] if row else UNKNOWN_ERROR
+
+    def fields(self, ccd):
+        """Return tuple of (key, key tail, value)."""
+        row = self._rows.get(ccd)
+        return row[1] if row else ()
+
+
+class NefitErrorIndex:
+    """Descriptions keyed by (display code, cause code)."""
+
+    def __init__(self, errorcodes):
+        self._codes = frozenset(errorcodes)
+        self._descriptions = {
+            (code, cause): value.get("description", "")
+            for code, causes in errorcodes.items()
+            for cause, value in causes.items()
+        }
+
+    def __contains__(self, code):
+        return code in self._codes
+
+    def __len__(self):
+        return len(self._descriptions)
+
+    def description(self, code, cause):
+        """Return description or None if cause is unknown for code."""
+        return self._descriptions.get((code, cause))
+
+
+def build_error_index(device_type, errorcodes):
+    """Compile error codes of device type."""
+    if device_type == EASYCONTROL:
+        return EasycontrolErrorIndex(errorcodes)
+    if device_type == IVT:
+        return IvtErrorIndex(errorcodes)
+    return NefitErrorIndex(errorcodes)
@@ -0,0 +1,166 @@
+"""Databases shared by all gateways in process.
+
+Firmware schemas and error tables are parsed once per process no matter
+how many gateways use them. Shared schemas are frozen when loaded, gateway
+gets its own top level dict (overlay) referencing shared sections.
+"""
+import asyncio
+import copy
+import sys
+import threading
+import weakref
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Shared database is read only, copy it before changing.")
+
+
+class ReadOnlyDict(dict):
+    """Dict which can't be changed.
+
+    Still a dict for isinstance and json.dumps. deepcopy gives plain dict.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """List which can't be changed. deepcopy gives plain list."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(obj):
+    """Read only copy of JSON like object."""
+    if isinstance(obj, dict):
+        return ReadOnlyDict((key, freeze(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return ReadOnlyList(freeze(item) for item in obj)
+    return obj
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate memory used by JSON like object."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "size", "owners")
+
+    def __init__(self, value):
+        self.value = value
+        self.size = None
+        self.owners = weakref.WeakSet()
+
+
+class SharedStore:
+    """Load every key once and hand out the same object afterwards."""
+
+    def __init__(self, frozen=False):
+        """
+        :param frozen: freeze loaded JSON so no user can change it
+        """
+        self._entries = {}
+        self._frozen = frozen
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                value = loader()
+                if self._frozen:
+                    value = freeze(value)
+                entry = self._entries[key] = _Entry(value)
+            return entry
+
+    async def get(self, key, loader, owner=None):
+        """Return shared value of key, call loader in thread if missing.
+
+        :param owner: object using value, only counted in stats
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, key, loader)
+        if owner is not None:
+            entry.owners.add(owner)
+        return entry.value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Memory used by every loaded value and number of its users."""
+        result = {}
+        for key, entry in list(self._entries.items()):
+            if not entry.value:
+                continue
+            if entry.size is None:
+                entry.size = deep_sizeof(entry.value)
+            result[key] = {"size": entry.size, "users": len(entry.owners)}
+        return result
+
+
+schemas = SharedStore(frozen=True)
+error_indexes = SharedStore()
+
+
+def schema_view(firmware_db, initial_db, exclude=()):
+    """Per gateway top level dict over shared sections.
+
+    Keys of initial_db win like in former firmware_db.update(initial_db).
+    """
+    view = dict(firmware_db)
+    view.update((key, value) for key, value in initial_db.items() if key not in exclude)
+    return view
+
+
+def shared_stats():
+    """Memory of shared schemas and error tables, one record per unique key."""
+    return {
+        "schemas": {"/".join(key): value for key, value in schemas.stats().items()},
+        "error_indexes": error_indexes.stats(),
+    }
@@ -1,6 +1,12 @@
 from .ivt import IVTEncryption
 from .nefit import NefitEncryption
 from .easycontrol import EasycontrolEncryption
+from .backends import available_backends
 
 
-__all__ = ["IVTEncryption", "NefitEncryption", "EasycontrolEncryption"]
+__all__ = [
+    "IVTEncryption",
+    "NefitEncryption",
+    "EasycontrolEncryption",
+    "available_backends",
+]
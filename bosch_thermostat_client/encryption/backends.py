@@ -0,0 +1,158 @@
+"""AES-ECB implementations used to talk to gateway.
+
+Fastest available backend is picked automatically, pure Python pyaes
+is the fallback which is always installed.
+"""
+from pyaes import AESModeOfOperationECB
+from pyaes.aes import AES
+
+from bosch_thermostat_client.exceptions import EncryptionException
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 16
+# Below it numpy call overhead costs more than pure Python loop.
+NUMPY_MIN_BLOCKS = 8
+
+
+class PyaesBackend:
+    """Pure Python AES."""
+
+    name = "pyaes"
+    available = True
+
+    def __init__(self, key):
+        # Key schedule is computed once per key, ECB keeps no other state.
+        self._aes = AESModeOfOperationECB(key)
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt data which length is multiple of BLOCK_SIZE."""
+        encrypt = self._aes.encrypt
+        return b"".join(
+            encrypt(data[i : i + BLOCK_SIZE]) for i in range(0, len(data), BLOCK_SIZE)
+        )
+
+    def decrypt(self, data: bytes) -> bytes:
+        """Decrypt data which length is multiple of BLOCK_SIZE."""
+        decrypt = self._aes.decrypt
+        return b"".join(
+            decrypt(data[i : i + BLOCK_SIZE]) for i in range(0, len(data), BLOCK_SIZE)
+        )
+
+
+class CryptographyBackend:
+    """AES from OpenSSL through cryptography package."""
+
+    name = "cryptography"
+    available = Cipher is not None
+
+    def __init__(self, key):
+        cipher = Cipher(algorithms.AES(key), modes.ECB())
+        # ECB context never buffers whole blocks, so it can be reused
+        # for every message without finalizing.
+        self._encryptor = cipher.encryptor()
+        self._decryptor = cipher.decryptor()
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._encryptor.update(data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        return self._decryptor.update(data)
+
+
+def _words(values):
+    """pyaes tables and round keys as uint32 array. pyaes may keep them signed."""
+    return (np.array(values, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32)
+
+
+class NumpyBackend:
+    """Table driven AES over all blocks at once with NumPy.
+
+    Used when cryptography is not installed. Short messages go
+    through pyaes as vectorizing them doesn't pay off.
+    """
+
+    name = "numpy"
+    available = np is not None
+    _tables = None
+
+    def __init__(self, key):
+        aes = AES(key)
+        self._ke = _words(aes._Ke)
+        self._kd = _words(aes._Kd)
+        self._small = PyaesBackend(key)
+        if NumpyBackend._tables is None:
+            NumpyBackend._tables = self._build_tables()
+
+    @staticmethod
+    def _build_tables():
+        return {
+            "encrypt": (
+                tuple(_words(t) for t in (AES.T1, AES.T2, AES.T3, AES.T4)),
+                _words(AES.S),
+                np.array([[(i + shift) % 4 for i in range(4)] for shift in (1, 2, 3)]),
+            ),
+            "decrypt": (
+                tuple(_words(t) for t in (AES.T5, AES.T6, AES.T7, AES.T8)),
+                _words(AES.Si),
+                np.array([[(i + shift) % 4 for i in range(4)] for shift in (3, 2, 1)]),
+            ),
+        }
+
+    def _crypt(self, data, keys, direction):
+        (t0, t1, t2, t3), sbox, (idx1, idx2, idx3) = self._tables[direction]
+        state = np.frombuffer(data, dtype=">u4").astype(np.uint32).reshape(-1, 4)
+        state ^= keys[0]
+        rounds = len(keys) - 1
+        for r in range(1, rounds):
+            state = (
+                t0[state >> 24]
+                ^ t1[(state[:, idx1] >> 16) & 0xFF]
+                ^ t2[(state[:, idx2] >> 8) & 0xFF]
+                ^ t3[state[:, idx3] & 0xFF]
+                ^ keys[r]
+            )
+        state = (
+            (sbox[state >> 24] << 24)
+            | (sbox[(state[:, idx1] >> 16) & 0xFF] << 16)
+            | (sbox[(state[:, idx2] >> 8) & 0xFF] << 8)
+            | sbox[state[:, idx3] & 0xFF]
+        ) ^ keys[rounds]
+        return state.astype(">u4").tobytes()
+
+    def encrypt(self, data: bytes) -> bytes:
+        if len(data) < NUMPY_MIN_BLOCKS * BLOCK_SIZE:
+            return self._small.encrypt(data)
+        return self._crypt(data, self._ke, "encrypt")
+
+    def decrypt(self, data: bytes) -> bytes:
+        if len(data) < NUMPY_MIN_BLOCKS * BLOCK_SIZE:
+            return self._small.decrypt(data)
+        return self._crypt(data, self._kd, "decrypt")
+
+
+BACKENDS = (CryptographyBackend, NumpyBackend, PyaesBackend)
+
+
+def available_backends():
+    """Installed backends by name, the preferred one first."""
+    return {backend.name: backend for backend in BACKENDS if backend.available}
+
+
+def get_backend(name=None):
+    """Find backend class by name or the preferred one if name is None."""
+    backends = available_backends()
+    if name is None:
+        return next(iter(backends.values()))
+    try:
+        return backends[name]
+    except KeyError:
+        raise EncryptionException(f"AES backend {name} is not available.")
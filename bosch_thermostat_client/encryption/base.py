@@ -4,11 +4,13 @@ import base64
 import hashlib
 import binascii
 import json
-from pyaes import PADDING_NONE, AESModeOfOperationECB, Decrypter, Encrypter
+from functools import cached_property
 
 from bosch_thermostat_client.const import BS
 from bosch_thermostat_client.exceptions import EncryptionException, DeviceException
 
+from .backends import get_backend
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -17,15 +19,18 @@ class BaseEncryption:
 
     jsondecoder = json.JSONDecoder
 
-    def __init__(self, access_key, password=None):
+    def __init__(self, access_key, password=None, backend=None):
         """
         Initialize encryption.
 
         :param str access_key: Access key to Bosch thermostat.
             If no password specified assumed as ready key to encrypt.
         :param str password: Password created with Bosch app.
+        :param str backend: AES backend name, eg. pyaes.
+            Default is the fastest one installed.
         """
         self._bs = BS
+        self._backend = get_backend(backend)
         if password and access_key:
             key_hash = hashlib.md5(bytearray(access_key, "utf8") + self.magic)
             password_hash = hashlib.md5(self.magic + bytearray(password, "utf8"))
@@ -35,26 +40,40 @@ class BaseEncryption:
             self._saved_key = access_key
             self._key = binascii.unhexlify(self._saved_key)
 
+    @cached_property
+    def _cipher(self):
+        """AES context of the key, created once."""
+        return self._backend(self._key)
+
+    @property
+    def backend(self):
+        """Name of AES backend in use."""
+        return self._backend.name
+
     @property
     def key(self):
         """Return key to store in config entry."""
         return self._saved_key
 
+    def _loads(self, text):
+        """Parse decrypted JSON."""
+        return json.loads(text, cls=self.jsondecoder)
+
     def json_decrypt(self, raw):
         try:
             if raw:
-                return json.loads(self.decrypt(raw), cls=self.jsondecoder)
+                return self._loads(self.decrypt(raw))
             return None
         except json.JSONDecodeError:
             raise DeviceException("Unable to decode Json response.")
 
     def encrypt(self, raw) -> bytes:
         """Encrypt raw message."""
+        if isinstance(raw, str):
+            raw = raw.encode("utf8")
         if len(raw) % self._bs != 0:
             raw = self._pad(raw)
-        cipher = Encrypter(AESModeOfOperationECB(self._key), padding=PADDING_NONE)
-        ciphertext = cipher.feed(raw) + cipher.feed()
-        return base64.b64encode(ciphertext)
+        return base64.b64encode(self._cipher.encrypt(raw))
 
     def decrypt(self, enc):
         """
@@ -69,10 +88,7 @@ class BaseEncryption:
                 enc = base64.b64decode(enc)
                 if len(enc) % self._bs != 0:
                     enc = self._pad(enc)
-                cipher = Decrypter(
-                    AESModeOfOperationECB(self._key), padding=PADDING_NONE
-                )
-                decrypted = cipher.feed(enc) + cipher.feed()
+                decrypted = self._cipher.decrypt(enc)
                 return decrypted.decode("utf8").rstrip(chr(0))
             return decrypted
         except UnicodeDecodeError as err:
@@ -81,6 +97,48 @@ class BaseEncryption:
         except Exception as err:
             raise EncryptionException(f"Unable to decrypt: {err}")
 
+    def decrypt_blocks(self, data: bytes) -> bytes:
+        """Decrypt raw ciphertext of many ECB blocks in one backend call."""
+        if len(data) % self._bs != 0:
+            data = self._pad(data)
+        return self._cipher.decrypt(data)
+
+    def decrypt_many(self, messages) -> list:
+        """
+        Decrypt many base64 encoded messages in one pass.
+
+        ECB blocks are independent, so all messages are joined and
+        decrypted as one buffer. Message which can't be decrypted
+        gets EncryptionException in its place.
+        """
+        results = []
+        chunks = []
+        for enc in messages:
+            if not enc or len(enc) <= 2:
+                results.append("{}")
+                continue
+            try:
+                chunk = base64.b64decode(enc)
+            except Exception as err:
+                results.append(EncryptionException(f"Unable to decrypt: {err}"))
+                continue
+            if len(chunk) % self._bs != 0:
+                chunk = self._pad(chunk)
+            results.append(len(chunk))
+            chunks.append(chunk)
+        decrypted = memoryview(self.decrypt_blocks(b"".join(chunks)))
+        offset = 0
+        for i, length in enumerate(results):
+            if not isinstance(length, int):
+                continue
+            plain = decrypted[offset : offset + length]
+            offset += length
+            try:
+                results[i] = str(plain, "utf8").rstrip(chr(0))
+            except UnicodeDecodeError as err:
+                results[i] = EncryptionException(f"Unable to decrypt: {err}")
+        return results
+
     def _pad(self, _s):
         """Pad of encryption."""
-        return _s + ((self._bs - len(_s) % self._bs) * chr(0))
+        return _s + ((self._bs - len(_s) % self._bs) * b"\x00")
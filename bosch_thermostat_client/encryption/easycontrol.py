@@ -3,24 +3,79 @@ from bosch_thermostat_client.const.easycontrol import MAGIC_EASYCONTROL
 from bosch_thermostat_client.helper import check_base64
 from bosch_thermostat_client.const import VALUE, TYPE
 from .base import BaseEncryption
+from functools import lru_cache
+import binascii
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 STRING_VALUE = "stringValue"
 FLOAT_VALUE = "floatValue"
 
 
+@lru_cache(maxsize=1024)
+def _decode_base64(value):
+    # Same leniency as check_base64, eg. newlines and spaces are skipped.
+    try:
+        return binascii.a2b_base64(value).decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return value
+
+
+def decode_string_value(value):
+    """Decode base64 encoded stringValue, plain text is returned as is.
+
+    Decodes the same strings as check_base64, decoded values are cached
+    as the same names come in every scan.
+    """
+    if isinstance(value, str):
+        return _decode_base64(value)
+    return check_base64(value)
+
+
+def edge_object(dct):
+    """Convert values of EasyControl JSON object by its type."""
+    object_type = dct.get(TYPE, None)
+    if object_type and VALUE in dct:
+        if object_type == STRING_VALUE:
+            dct[VALUE] = decode_string_value(dct[VALUE])
+        elif object_type == FLOAT_VALUE:
+            dct[VALUE] = float(dct[VALUE])
+    return dct
+
+
+def edge_post_process(obj):
+    """Apply edge_object to every object of already parsed JSON.
+
+    Conversion of one object doesn't depend on others, so they are
+    visited in any order without recursion.
+    """
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if type(item) is dict:
+            if TYPE in item:
+                edge_object(item)
+            children = item.values()
+        elif type(item) is list:
+            children = item
+        else:
+            continue
+        for child in children:
+            if type(child) is dict or type(child) is list:
+                stack.append(child)
+    return obj
+
+
 class EdgeDecoder(json.JSONDecoder):
     def __init__(self, *args, **kwargs):
         json.JSONDecoder.__init__(self, object_hook=self.object_hook, *args, **kwargs)
 
     def object_hook(self, dct):
-        object_type = dct.get(TYPE, None)
-        if object_type and VALUE in dct:
-            if object_type == STRING_VALUE:
-                dct[VALUE] = check_base64(dct[VALUE])
-            elif object_type == FLOAT_VALUE:
-                dct[VALUE] = float(dct[VALUE])
-        return dct
+        return edge_object(dct)
 
 
 class EasycontrolEncryption(BaseEncryption):
@@ -28,3 +83,14 @@ class EasycontrolEncryption(BaseEncryption):
 
     magic = MAGIC_EASYCONTROL
     jsondecoder = EdgeDecoder
+
+    def _loads(self, text):
+        """Parse with orjson if installed and convert values afterwards."""
+        if orjson is None:
+            return super()._loads(text)
+        try:
+            parsed = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Eg. integers bigger than 64 bits, let json module decide.
+            return super()._loads(text)
+        return edge_post_process(parsed)
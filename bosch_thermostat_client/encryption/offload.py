@@ -0,0 +1,43 @@
+"""Decrypt big responses outside of event loop."""
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+THREAD = "thread"
+PROCESS = "process"
+DEFAULT_THRESHOLD = 8192
+
+_executors = {}
+_executors_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor(kind, max_workers=None):
+    """Executor shared by all gateways in process or given one.
+
+    :param kind: "thread", "process" or Executor instance
+    """
+    if isinstance(kind, Executor):
+        return kind
+    if kind not in (THREAD, PROCESS):
+        raise ValueError(f"Unknown decrypt executor {kind}")
+    with _executors_lock:
+        if kind not in _executors:
+            pool = ThreadPoolExecutor if kind == THREAD else ProcessPoolExecutor
+            _executors[kind] = pool(max_workers=max_workers)
+        return _executors[kind]
+
+
+def json_decrypt(encryption_class, key, backend, raw):
+    """Base64 decode, decrypt and parse JSON in worker thread or process.
+
+    Every worker keeps its own cipher per key, AES contexts
+    are not safe to share between threads.
+    """
+    ciphers = getattr(_local, "ciphers", None)
+    if ciphers is None:
+        ciphers = _local.ciphers = {}
+    cache_key = (encryption_class, key, backend)
+    encryption = ciphers.get(cache_key)
+    if encryption is None:
+        encryption = ciphers[cache_key] = encryption_class(key, backend=backend)
+    return encryption.json_decrypt(raw)
@@ -1,9 +1,13 @@
 """Gateway module connecting to Bosch thermostat."""
 from __future__ import annotations
+import asyncio
 import logging
+import time
+from contextlib import contextmanager
 from typing import Any
 
 from bosch_thermostat_client.circuits import Circuits
+from bosch_thermostat_client.connectors import BACKGROUND, request_priority
 from bosch_thermostat_client.const import (
     DATE,
     DHW,
@@ -16,14 +20,17 @@ from bosch_thermostat_client.const import (
     MODELS,
     NAME,
     NUMBER,
+    REFERENCES,
     REFS,
     ROOT_PATHS,
     SC,
     SELECT,
     SENSORS,
     SENSOR,
+    STATUS,
     SWITCH,
     TYPE,
+    URI,
     UUID,
     VALUE,
     BASE_FIRMWARE_VERSION,
@@ -31,15 +38,33 @@ from bosch_thermostat_client.const import (
     CRAWL_SENSORS,
     SWITCHES,
 )
-from bosch_thermostat_client.db import get_custom_db, get_db_of_firmware, get_initial_db, async_get_errors
+from bosch_thermostat_client.const.ivt import CURRENT_SETPOINT
+from bosch_thermostat_client.db import (
+    get_custom_db,
+    get_initial_db,
+    get_shared_db_of_firmware,
+    get_shared_error_index,
+    get_shared_initial_db,
+)
+from bosch_thermostat_client.db.shared import schema_view
 from bosch_thermostat_client.exceptions import (
+    BoschException,
     DeviceException,
     FirmwareException,
     UnknownDevice,
 )
 from bosch_thermostat_client.helper import deep_into
+from bosch_thermostat_client.scan import DEFAULT_CONCURRENCY, NdjsonSink, stream_scan
 from bosch_thermostat_client.sensors import Sensors
+from bosch_thermostat_client.sensors.sensors import NOTIFICATIONS
 from bosch_thermostat_client.switches import Switches
+from .topology import (
+    build_snapshot,
+    diff_responses,
+    save_snapshot,
+    snapshot_matches,
+    snapshot_responses,
+)
 from datetime import datetime
 import json
 
@@ -66,27 +91,89 @@ class BaseGateway:
         self._initialized = None
         self.initialization_msg = None
         self._bus_type = None
-        self._errors = None
+        self._error_index = None
+        self._bootstrap_timings = {}
+        self._topology = None
+        self._info_responses = {}
+        self._revalidation = None
 
     async def get_base_db(self):
-        return await get_initial_db(self.device_type)
+        return await get_shared_initial_db(self.device_type, owner=self)
+
+    async def connect(self):
+        """Open connection to gateway before first request."""
+        if self._connector.replaying:
+            # Restored gateway connects on first request.
+            return
+        await self._connector.connect()
+
+    @contextmanager
+    def _stage(self, name):
+        """Measure duration of bootstrap stage, cancelled one is not kept."""
+        start = time.monotonic()
+        cancelled = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                self._bootstrap_timings[name] = time.monotonic() - start
+                _LOGGER.debug(
+                    "Bootstrap stage %s took %.3fs",
+                    name,
+                    self._bootstrap_timings[name],
+                )
+
+    async def _timed(self, name, coro):
+        with self._stage(name):
+            return await coro
+
+    @property
+    def bootstrap_timings(self) -> dict[str, float]:
+        """Duration in seconds of every finished bootstrap stage."""
+        return dict(self._bootstrap_timings)
 
     async def initialize(self):
         """Initialize gateway asynchronously."""
-        initial_db = await self.get_base_db()
-        await self._update_info(initial_db.get(GATEWAY))
+        # Database files are read while connection is being established.
+        _, initial_db = await asyncio.gather(
+            self._timed("connect", self.connect()),
+            self._timed("initial_db", self.get_base_db()),
+        )
+        with self._stage("gateway_info"):
+            # Kept for topology snapshot made by get_capabilities.
+            self._connector.record_responses()
+            try:
+                await self._update_info(initial_db.get(GATEWAY))
+            finally:
+                self._info_responses = self._connector.stop_recording()
         self._firmware_version = self._data[GATEWAY].get(FIRMWARE_VERSION)
         self._device = self.get_device_model(initial_db)
         if self._device and VALUE in self._device:
-            _LOGGER.debug("Found device %s", json.dumps(self._device))
-            self._db = await get_db_of_firmware(self._device[TYPE], self._firmware_version)
-            if self._db:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Found device %s", json.dumps(self._device))
+            firmware_db, _ = await asyncio.gather(
+                self._timed(
+                    "firmware_db",
+                    get_shared_db_of_firmware(
+                        self._device[TYPE], self._firmware_version, owner=self
+                    ),
+                ),
+                self._timed(
+                    "negative_cache",
+                    self._connector.bind_negative_cache(
+                        self._data[GATEWAY].get(UUID), self._firmware_version
+                    ),
+                ),
+            )
+            if firmware_db:
                 _LOGGER.debug(
                     f"Loading database: {self._device[TYPE]} for firmware {self._firmware_version}"
                 )
-                initial_db.pop(MODELS, None)
-                self._db.update(initial_db)
-                self._errors = await async_get_errors(self.device_type)
+                # Schema is shared with other gateways, only top level is ours.
+                self._db = schema_view(firmware_db, initial_db, exclude=(MODELS,))
                 self._initialized = True
                 return
             raise FirmwareException(
@@ -107,6 +194,23 @@ class BaseGateway:
     async def _update_info(self, initial_db):
         raise NotImplementedError
 
+    async def _fetch_info(self, initial_db):
+        """Get gateway info URIs concurrently.
+
+        Return list of (name, response) of URIs which answered.
+        """
+        responses = await self._connector.get_many(initial_db.values())
+        fetched = []
+        for name, uri in initial_db.items():
+            response = responses[uri]
+            if isinstance(response, DeviceException):
+                _LOGGER.debug("Can't fetch data for update_info %s", response)
+            elif isinstance(response, Exception):
+                raise response
+            else:
+                fetched.append((name, response))
+        return fetched
+
     def get_device_model(self, _db):
         raise NotImplementedError
 
@@ -238,29 +342,178 @@ class BaseGateway:
             return self._data[GATEWAY][key]
         return None
 
+    async def _initialize_circuits_or_skip(self, circuit):
+        try:
+            return await self._timed(
+                f"circuits_{circuit}", self.initialize_circuits(circuit)
+            )
+        except DeviceException as err:
+            _LOGGER.debug("Circuit %s not found. Skipping it. %s", circuit, err)
+            return None
+
     async def get_capabilities(self):
+        """Initialize circuits, sensors and switches concurrently.
+
+        They depend only on firmware database, requests of all of them
+        share connector window.
+        """
+        circuit_types = list(self.circuit_types.keys())
+        tasks = [
+            asyncio.ensure_future(self._initialize_circuits_or_skip(circuit))
+            for circuit in circuit_types
+        ]
+        tasks.append(
+            asyncio.ensure_future(self._timed("sensors", self.initialize_sensors()))
+        )
+        tasks.append(
+            asyncio.ensure_future(self._timed("switches", self.initialize_switches()))
+        )
+        self._connector.record_responses()
+        try:
+            with self._stage("capabilities"):
+                results = await asyncio.gather(*tasks)
+        finally:
+            # Stage failed, others are stopped before error is reported.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            responses = {**self._info_responses, **self._connector.stop_recording()}
         supported = []
-        for circuit in self.circuit_types.keys():
-            try:
-                circuit_object = await self.initialize_circuits(circuit)
-                if circuit_object:
-                    supported.append(circuit)
-                    if circuit_object[0].number_switches:
-                        supported.append(NUMBER)
-            except DeviceException as err:
-                _LOGGER.debug("Circuit %s not found. Skipping it. %s", circuit, err)
-                pass
-        await self.initialize_sensors()
-        await self.initialize_switches()
+        for circuit, circuit_object in zip(circuit_types, results):
+            if circuit_object:
+                supported.append(circuit)
+                if circuit_object[0].number_switches:
+                    supported.append(NUMBER)
         supported.append(SWITCH)
         if NUMBER not in supported and self.number_switches:
             supported.append(NUMBER)
         if SELECT not in supported and self.select_switches:
             supported.append(SELECT)
         supported.append(SENSOR)
+        if responses:
+            self._topology = build_snapshot(
+                uuid=self.uuid,
+                firmware=self._firmware_version,
+                responses=responses,
+                value_paths=self._topology_value_paths(),
+            )
 
         return supported
 
+    def _topology_value_paths(self):
+        """Paths whose values decide which gateway and circuits are found."""
+        paths = set(self._info_responses)
+        for circuit_type in self.circuit_types:
+            for circuit in self.get_circuits(circuit_type):
+                for key in (STATUS, CURRENT_SETPOINT):
+                    if key in circuit.get_data:
+                        paths.add(circuit.get_data[key][URI])
+        return paths
+
+    def export_topology(self) -> dict | None:
+        """Snapshot of topology discovered by initialize and get_capabilities."""
+        return self._topology
+
+    async def save_topology(self, filename: str) -> None:
+        """Write topology snapshot to file."""
+        if self._topology:
+            await save_snapshot(filename, self._topology)
+
+    async def restore_topology(self, snapshot: dict, uuid: str | None = None):
+        """Initialize gateway and its entities from snapshot without network.
+
+        Return supported types like get_capabilities or None if snapshot
+        doesn't fit this gateway and regular initialize is needed.
+        Revalidation is scheduled once restore finishes, it fills values
+        of entities and rebuilds them if gateway changed.
+        """
+        if not snapshot_matches(snapshot, uuid=uuid):
+            return None
+        self._connector.replay_responses(snapshot["responses"])
+        try:
+            with self._stage("restore"):
+                await self.initialize()
+                supported = await self.get_capabilities()
+        finally:
+            self._connector.replay_responses(None)
+        self._revalidation = asyncio.ensure_future(self._revalidate_restored())
+        return supported
+
+    @property
+    def revalidation(self) -> asyncio.Task | None:
+        """Revalidation scheduled by restore_topology."""
+        return self._revalidation
+
+    async def _revalidate_restored(self):
+        try:
+            return await self.revalidate_topology(rebuild=True)
+        except BoschException as err:
+            _LOGGER.warning(
+                "Can't revalidate topology of gateway %s: %s", self.uuid, err
+            )
+
+    def _entities(self):
+        """Every entity created by get_capabilities."""
+        switches = [self.switches] if self.switches else []
+        for circuit_type in self.circuit_types:
+            for circuit in self.get_circuits(circuit_type):
+                # Sensors of circuit keep their data in circuit.
+                yield circuit
+                switches.append(circuit.regular_switches)
+        yield from self.sensors
+        for switch_group in switches:
+            yield from switch_group.switches
+            yield from switch_group.selects
+            yield from switch_group.number_switches
+
+    def _refresh_entities(self, responses):
+        """Replace values of entities by fetched responses."""
+        for entity in self._entities():
+            for key, item in entity.get_data.items():
+                if item.get(URI) in responses:
+                    entity.process_results(responses[item[URI]], key)
+
+    async def revalidate_topology(self, rebuild: bool = False) -> list[str]:
+        """Compare snapshot with gateway in background priority.
+
+        Return paths whose topology differs (references, type,
+        allowed values, UUID or firmware). With rebuild discovery runs
+        again if anything changed so new snapshot can be exported,
+        otherwise fetched values replace those of entities.
+        """
+        if not self._topology:
+            return []
+        old = self._topology["responses"]
+        with request_priority(BACKGROUND):
+            fetched = await self._connector.get_many(old)
+        # Failed requests might be just timeouts, they prove nothing.
+        fresh = {
+            path: response
+            for path, response in fetched.items()
+            if not isinstance(response, Exception)
+        }
+        gateway_db = self._db.get(GATEWAY, {})
+        changed = diff_responses(
+            {path: old[path] for path in fresh},
+            fresh,
+            value_paths=(gateway_db.get(UUID), gateway_db.get(FIRMWARE_VERSION)),
+        )
+        if changed:
+            _LOGGER.warning(
+                "Topology of gateway %s changed since snapshot: %s", self.uuid, changed
+            )
+            if rebuild:
+                await self.initialize()
+                await self.get_capabilities()
+                return changed
+        else:
+            self._topology["responses"] = {
+                **old,
+                **snapshot_responses(fresh, self._topology_value_paths()),
+            }
+        self._refresh_entities(fresh)
+        return changed
+
     async def initialize_circuits(self, circ_type):
         """Initialize circuits objects of given type (dhw/hcs)."""
         self._data[circ_type] = Circuits(
@@ -277,8 +530,14 @@ class BaseGateway:
     async def initialize_sensors(self):
         """Initialize sensors objects."""
         if SENSORS in self._db:
+            if NOTIFICATIONS in self._db[SENSORS] and self._error_index is None:
+                self._error_index = await get_shared_error_index(
+                    self.device_type, owner=self
+                )
             self._data[SENSORS] = Sensors(
-                connector=self._connector, sensors_db=self._db[SENSORS], errors=self._errors
+                connector=self._connector,
+                sensors_db=self._db[SENSORS],
+                error_index=self._error_index,
             )
         if CRAWL_SENSORS in self._db:
             _LOGGER.info("Initializing Crawl Sensors.")
@@ -297,14 +556,38 @@ class BaseGateway:
     async def rawscan(self):
         """Print out all info from gateway."""
         rawlist = []
-        for root in ROOT_PATHS:
-            single_scan = await deep_into(root, [], self._connector.get)
-            rawlist.append(single_scan if single_scan else {root: "not found"})
+        with request_priority(BACKGROUND):
+            for root in ROOT_PATHS:
+                single_scan = await deep_into(root, [], self._connector.get)
+                rawlist.append(single_scan if single_scan else {root: "not found"})
         return rawlist
 
+    async def rawscan_stream(
+        self, output: str, resume: bool = False, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> int:
+        """Scan all info from gateway to NDJSON file as it is fetched.
+
+        With resume URIs stored in checkpoint of previous scan to the same
+        output are not fetched again. Return number of written nodes.
+        """
+        sink = await NdjsonSink.open(output, resume=resume)
+        try:
+            with request_priority(BACKGROUND):
+                return await stream_scan(
+                    ROOT_PATHS, self._connector.get, sink, concurrency=concurrency
+                )
+        finally:
+            await sink.close()
+
     async def smallscan(self, _type=HC, circuit_number=None):
-        """Print out all info from gateway from HC1 or DHW1 only for now."""
-        """TODO: add zones support."""
+        with request_priority(BACKGROUND):
+            return await self._smallscan(_type, circuit_number)
+
+    async def _smallscan(self, _type=HC, circuit_number=None):
+        """Print out all info from gateway from HC1 or DHW1 only.
+
+        Use smallscan_all to scan every circuit at once.
+        """
         rawlist = []
         if _type == HC:
             _LOGGER.info("Scanning HC1")
@@ -329,6 +612,76 @@ class BaseGateway:
             rawlist.append(await deep_into(uri, [], self._connector.get))
         return rawlist
 
+    async def _discover_circuit_roots(self):
+        """Return {circuit id: URIs of its refs} for every circuit of gateway."""
+        db_keys = [
+            db_key
+            for db_key in self.circuit_types.values()
+            if REFS in self._db.get(db_key, {})
+        ]
+        listed = await self._connector.get_many(f"/{db_key}" for db_key in db_keys)
+        roots = {}
+        for db_key in db_keys:
+            response = listed[f"/{db_key}"]
+            if isinstance(response, Exception):
+                _LOGGER.debug("No circuits of %s: %s", db_key, response)
+                continue
+            for circuit in response.get(REFERENCES, []):
+                if ID in circuit:
+                    roots[circuit[ID]] = [
+                        f"{circuit[ID]}/{item[ID]}"
+                        for item in self._db[db_key][REFS].values()
+                    ]
+        return roots
+
+    async def smallscan_all(
+        self,
+        output: str,
+        per_circuit: bool = False,
+        resume: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[str, int]:
+        """Scan every heating, DHW, solar circuit and zone concurrently.
+
+        Nodes are streamed to NDJSON file output or with per_circuit
+        to file {output}_{circuit}.ndjson per circuit. Circuits share
+        visited URIs, so common node is scanned once.
+        Return number of written nodes per file.
+        """
+        with request_priority(BACKGROUND):
+            circuits = await self._discover_circuit_roots()
+            _LOGGER.info("Scanning circuits %s", ", ".join(circuits))
+            if not per_circuit:
+                circuits = {
+                    output: [root for roots in circuits.values() for root in roots]
+                }
+            else:
+                circuits = {
+                    f"{output}_{circuit.split('/')[-1]}.ndjson": roots
+                    for circuit, roots in circuits.items()
+                }
+            sinks = {}
+            try:
+                for filename in circuits:
+                    sinks[filename] = await NdjsonSink.open(filename, resume=resume)
+                visited = set()
+                written = await asyncio.gather(
+                    *(
+                        stream_scan(
+                            roots,
+                            self._connector.get,
+                            sinks[filename],
+                            concurrency=concurrency,
+                            visited=visited,
+                        )
+                        for filename, roots in circuits.items()
+                    )
+                )
+            finally:
+                for sink in sinks.values():
+                    await sink.close()
+        return dict(zip(circuits, written))
+
     async def check_connection(self):
         """Check if we are able to connect to Bosch device and return UUID."""
         try:
@@ -349,6 +702,13 @@ class BaseGateway:
         except DeviceException as err:
             _LOGGER.error(err)
 
+    async def raw_query_many(self, paths: list[str]) -> dict[str, Any]:
+        """Run RAW queries concurrently.
+
+        Return dict of path to response or exception if query failed.
+        """
+        return await self._connector.get_many(paths)
+
     async def raw_put(self, path: str, value: Any) -> None:
         """Run RAW PUT."""
         try:
@@ -357,12 +717,14 @@ class BaseGateway:
             _LOGGER.error(err)
 
     async def close(self, force: bool = False) -> None:
+        if self._revalidation:
+            self._revalidation.cancel()
         await self._connector.close(force)
 
     async def check_firmware_validity(self):
         """Run query against firmware version."""
         fw = await self._connector.get(self._db.get(BASE_FIRMWARE_VERSION))
-        if await get_db_of_firmware(self._device[TYPE], fw.get(VALUE, "")):
+        if await get_shared_db_of_firmware(self._device[TYPE], fw.get(VALUE, "")):
             return True
         raise FirmwareException(
             "You might have unsupported firmware version %s. Maybe it get updated?"
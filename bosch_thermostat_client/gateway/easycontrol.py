@@ -24,7 +24,6 @@ from bosch_thermostat_client.const.easycontrol import (
     DV
 )
 from bosch_thermostat_client.encryption import EasycontrolEncryption as Encryption
-from bosch_thermostat_client.exceptions import DeviceException
 
 from .base import BaseGateway
 
@@ -46,6 +45,7 @@ class EasycontrolGateway(BaseGateway):
         password=None,
         session=None,
         easycontrol_connector=None,
+        connector_options=None,
     ):
         """
         Initialize gateway.
@@ -54,6 +54,7 @@ class EasycontrolGateway(BaseGateway):
         :param password:
         :param host:
         :param device_type -> IVT or NEFIT or EASYCONTROL
+        :param connector_options: extra options passed to connector eg. max_in_flight
         """
         self._access_token = access_token.replace("-", "")
         if password:
@@ -69,6 +70,7 @@ class EasycontrolGateway(BaseGateway):
             access_key=self._access_token,
             encryption=Encryption(access_key, password),
             device_type=EASYCONTROL,
+            **(connector_options or {}),
         )
         self._session_type = session_type
         self._data = {GATEWAY: {}, ZN: None, DHW: None, DV: None, SENSORS: None}
@@ -76,16 +78,11 @@ class EasycontrolGateway(BaseGateway):
 
     async def _update_info(self, initial_db):
         """Update gateway info from Bosch device."""
-        for name, uri in initial_db.items():
-            try:
-                response = await self._connector.get(uri)
-                if VALUE in response:
-                    self._data[GATEWAY][name] = response[VALUE]
-                elif name == SYSTEM_BUS:
-                    self._data[GATEWAY][SYSTEM_BUS] = response.get(REFERENCES, [])
-            except DeviceException as err:
-                _LOGGER.debug("Can't fetch data for update_info %s", err)
-                pass
+        for name, response in await self._fetch_info(initial_db):
+            if VALUE in response:
+                self._data[GATEWAY][name] = response[VALUE]
+            elif name == SYSTEM_BUS:
+                self._data[GATEWAY][SYSTEM_BUS] = response.get(REFERENCES, [])
 
     def get_device_model(self, _db):
         """Find device model."""
@@ -23,7 +23,6 @@ from bosch_thermostat_client.const.ivt import (
     SYSTEM_INFO,
 )
 from bosch_thermostat_client.encryption import IVTEncryption as Encryption
-from bosch_thermostat_client.exceptions import DeviceException
 
 from .base import BaseGateway
 
@@ -44,6 +43,7 @@ class IVTGateway(BaseGateway):
         access_key=None,
         password=None,
         session=None,
+        connector_options=None,
     ):
         """IVT Gateway constructor
 
@@ -53,6 +53,8 @@ class IVTGateway(BaseGateway):
             host (str): host IP or hostname for HTTP or serial number for XMPP
             access_key (str): access key to Bosch Gateway
             password (str, optional): Password to Bosch Gateway. Defaults to None.
+            connector_options (dict, optional): Extra options of connector
+                eg. max_in_flight. Defaults to None.
         """
         self._access_token = access_token.replace("-", "")
         if password:
@@ -64,22 +66,18 @@ class IVTGateway(BaseGateway):
             loop=session,
             access_key=self._access_token,
             encryption=Encryption(access_key, password),
+            **(connector_options or {}),
         )
         self._data = {GATEWAY: {}, HC: None, DHW: None, SENSORS: None}
         super().__init__(host)
 
     async def _update_info(self, initial_db):
         """Update gateway info from Bosch device."""
-        for name, uri in initial_db.items():
-            try:
-                response = await self._connector.get(uri)
-                if VALUE in response:
-                    self._data[GATEWAY][name] = response[VALUE]
-                elif name == SYSTEM_INFO:
-                    self._data[GATEWAY][SYSTEM_INFO] = response.get(VALUES, [])
-            except DeviceException as err:
-                _LOGGER.debug("Can't fetch data for update_info %s", err)
-                pass
+        for name, response in await self._fetch_info(initial_db):
+            if VALUE in response:
+                self._data[GATEWAY][name] = response[VALUE]
+            elif name == SYSTEM_INFO:
+                self._data[GATEWAY][SYSTEM_INFO] = response.get(VALUES, [])
 
     def get_device_model(self, _db):
         """Find device model."""
@@ -20,7 +20,6 @@ from bosch_thermostat_client.const import (
     SENSORS,
 )
 from bosch_thermostat_client.const.nefit import NEFIT, PRODUCT_ID, CIRCUIT_TYPES
-from bosch_thermostat_client.exceptions import DeviceException
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,6 +39,7 @@ class NefitGateway(BaseGateway):
         access_key=None,
         password=None,
         session=None,
+        connector_options=None,
     ):
         """
         Initialize gateway.
@@ -48,6 +48,7 @@ class NefitGateway(BaseGateway):
         :param password:
         :param host:
         :param device_type -> NEFIT
+        :param connector_options: extra options passed to connector eg. max_in_flight
         """
         self._access_token = access_token.replace("-", "")
 
@@ -64,6 +65,7 @@ class NefitGateway(BaseGateway):
             access_key=self._access_token,
             encryption=Encryption(access_key, password),
             device_type=NEFIT,
+            **(connector_options or {}),
         )
         self._session_type = session_type
         self._data = {GATEWAY: {}, HC: None, DHW: None, SENSORS: None}
@@ -71,16 +73,11 @@ class NefitGateway(BaseGateway):
 
     async def _update_info(self, initial_db):
         """Update gateway info from Bosch device."""
-        for name, uri in initial_db.items():
-            try:
-                response = await self._connector.get(uri)
-                if VALUE in response:
-                    self._data[GATEWAY][name] = response[VALUE]
-                elif name == SYSTEM_BUS:
-                    self._data[GATEWAY][SYSTEM_BUS] = response.get(REFERENCES, [])
-            except DeviceException as err:
-                _LOGGER.debug("Can't fetch data for update_info %s", err)
-                pass
+        for name, response in await self._fetch_info(initial_db):
+            if VALUE in response:
+                self._data[GATEWAY][name] = response[VALUE]
+            elif name == SYSTEM_BUS:
+                self._data[GATEWAY][SYSTEM_BUS] = response.get(REFERENCES, [])
 
     def get_device_model(self, _db):
         """Find device model."""
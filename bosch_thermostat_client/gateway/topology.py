@@ -0,0 +1,156 @@
+"""Snapshot of discovered gateway topology for warm start.
+
+Snapshot keeps structure of GET responses seen during initialize and
+get_capabilities: types, references and allowed values, but no current
+values except gateway info. Gateway restored from it runs the same
+discovery code against stored structure, so circuits, sensors, switches,
+database and bus type are rebuilt without asking gateway. Values come
+with revalidation scheduled after restore.
+"""
+import asyncio
+import json
+import logging
+import os
+
+from bosch_thermostat_client.const import (
+    ID,
+    MAX_VALUE,
+    MIN_VALUE,
+    REFERENCES,
+    TYPE,
+    UNITS,
+    USED,
+    VALUE,
+    VALUES,
+    WRITEABLE,
+)
+from bosch_thermostat_client.const.easycontrol import STEP_SIZE
+from bosch_thermostat_client.const.ivt import ALLOWED_VALUES, STATE
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2
+STRUCTURE_KEYS = (
+    ID,
+    TYPE,
+    ALLOWED_VALUES,
+    MIN_VALUE,
+    MAX_VALUE,
+    STEP_SIZE,
+    UNITS,
+    WRITEABLE,
+    USED,
+    STATE,
+)
+
+
+def snapshot_key(uuid, firmware):
+    return f"{uuid}:{firmware}"
+
+
+def response_structure(response, with_value=False):
+    """Copy of response without its current state."""
+    if not isinstance(response, dict):
+        return response
+    structure = {key: response[key] for key in STRUCTURE_KEYS if key in response}
+    if REFERENCES in response:
+        structure[REFERENCES] = [
+            {key: ref[key] for key in (ID, TYPE) if key in ref}
+            for ref in response[REFERENCES]
+            if isinstance(ref, dict)
+        ]
+    if with_value:
+        for key in (VALUE, VALUES):
+            if key in response:
+                structure[key] = response[key]
+    return structure
+
+
+def snapshot_responses(responses, value_paths=()):
+    """Structure of responses, paths in value_paths keep their values."""
+    return {
+        path: response_structure(response, path in value_paths)
+        for path, response in responses.items()
+    }
+
+
+def build_snapshot(uuid, firmware, responses, value_paths=()):
+    """Create JSON serializable snapshot."""
+    return {
+        "version": SNAPSHOT_VERSION,
+        "key": snapshot_key(uuid, firmware),
+        "responses": snapshot_responses(responses, value_paths),
+    }
+
+
+def snapshot_matches(snapshot, uuid=None, firmware=None):
+    """Check if snapshot can be used for gateway of given uuid and firmware."""
+    if not snapshot or snapshot.get("version") != SNAPSHOT_VERSION:
+        return False
+    if not snapshot.get("responses"):
+        return False
+    stored_uuid, _, stored_firmware = snapshot.get("key", "").partition(":")
+    if uuid is not None and str(uuid) != stored_uuid:
+        return False
+    if firmware is not None and firmware != stored_firmware:
+        return False
+    return True
+
+
+def response_shape(response, with_value=False):
+    """Part of response which describes topology, not current state."""
+    if not isinstance(response, dict):
+        return response is not None
+    shape = [
+        response.get(TYPE),
+        tuple(
+            ref.get(ID) for ref in response.get(REFERENCES, []) if isinstance(ref, dict)
+        ),
+        tuple(response.get(ALLOWED_VALUES, ())),
+    ]
+    if with_value:
+        shape.append(response.get(VALUE))
+    return tuple(shape)
+
+
+def diff_responses(old, new, value_paths=()):
+    """Return sorted paths which topology differs between responses.
+
+    :param value_paths: paths which value is part of topology eg. firmware
+    """
+    changed = []
+    for path, response in old.items():
+        with_value = path in value_paths
+        if response_shape(response, with_value) != response_shape(
+            new.get(path), with_value
+        ):
+            changed.append(path)
+    return sorted(changed)
+
+
+def _read(filename):
+    try:
+        with open(filename, "r") as snapshot_file:
+            return json.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("Can't read topology snapshot %s: %s", filename, err)
+        return None
+
+
+def _write(filename, snapshot):
+    tmp = f"{filename}.tmp"
+    with open(tmp, "w") as snapshot_file:
+        json.dump(snapshot, snapshot_file, separators=(",", ":"))
+    os.replace(tmp, filename)
+
+
+async def load_snapshot(filename):
+    """Load snapshot from file. Return None if it's missing or broken."""
+    return await asyncio.to_thread(_read, filename)
+
+
+async def save_snapshot(filename, snapshot):
+    """Atomically write snapshot to file."""
+    await asyncio.to_thread(_write, filename, snapshot)
@@ -28,6 +28,8 @@ from bosch_thermostat_client.const import (
 )
 from bosch_thermostat_client.const.easycontrol import STEP_SIZE
 from bosch_thermostat_client.const.ivt import ALLOWED_VALUES, STATE, INVALID
+from bosch_thermostat_client.connectors.scheduler import BACKGROUND, request_priority
+from bosch_thermostat_client.crawler import crawl_all, iter_crawl
 
 from .exceptions import DeviceException, EncryptionException
 import base64
@@ -77,19 +79,28 @@ def get_all_intervals():
 
 async def crawl(url, _list, deep, get, exclude):
     """Crawl for Bosch API correct values."""
-    try:
-        resp = await get(url)
-        if (REFERENCES not in resp or deep == 0) and ID in resp:
-            if not exclude or not re.match(exclude, resp[ID]):
-                _list.append(resp)
-        else:
-            if REFERENCES in resp:
-                for uri in resp[REFERENCES]:
-                    if ID in uri and deep > 0:
-                        await crawl(uri[ID], _list, deep - 1, get, exclude)
-        return _list
-    except DeviceException:
-        return _list
+    _list.extend(await crawl_all(url, deep, get, exclude))
+    return _list
+
+
+def scrub_node(resp):
+    """Remove IP addresses and confidential values from scanned node."""
+    if URI in resp:
+        resp[URI] = remove_all_ip_occurs(resp[URI])
+    if ID in resp and resp[ID] in CONFIDENTIAL_URI:
+        resp[VALUE] = "-1"
+        if ALLOWED_VALUES in resp:
+            resp[ALLOWED_VALUES] = ["-1"]
+    if "setpointProperty" in resp and URI in resp["setpointProperty"]:
+        resp["setpointProperty"][URI] = remove_all_ip_occurs(
+            resp["setpointProperty"][URI]
+        )
+    if resp.get(TYPE) == "stringValue" and VALUE in resp:
+        resp[VALUE] = check_base64(resp[VALUE])
+    for ref in resp.get(REFERENCES, []):
+        if URI in ref:
+            ref[URI] = remove_all_ip_occurs(ref[URI])
+    return resp
 
 
 async def deep_into(url, _list, get):
@@ -97,8 +108,6 @@ async def deep_into(url, _list, get):
     try:
         resp = await get(url)
         new_resp = resp
-        if URI in new_resp:
-            new_resp[URI] = remove_all_ip_occurs(resp[URI])
         if ENERGY_HISTORY_ENTRIES in new_resp.get(ID, ""):
             page = new_resp.get(VALUE, 1) - 1
             page_uri = f"{ENERGY_HISTORY}?entry={page}"
@@ -113,23 +122,9 @@ async def deep_into(url, _list, get):
                     _list.append(ivs_resp)
                 except (DeviceException, EncryptionException):
                     pass
-        if ID in new_resp and new_resp[ID] in CONFIDENTIAL_URI:
-            new_resp[VALUE] = "-1"
-            if ALLOWED_VALUES in new_resp:
-                new_resp[ALLOWED_VALUES] = ["-1"]
-        if "setpointProperty" in new_resp and URI in new_resp["setpointProperty"]:
-            new_resp["setpointProperty"][URI] = remove_all_ip_occurs(
-                new_resp["setpointProperty"][URI]
-            )
-        if TYPE in resp and resp[TYPE] == "stringValue":
-            new_resp[VALUE] = check_base64(new_resp[VALUE])
-        _list.append(resp)
+        _list.append(scrub_node(resp))
         if REFERENCES in resp:
-            for idx, val in enumerate(resp[REFERENCES]):
-                val2 = val
-                if URI in val2:
-                    val2[URI] = remove_all_ip_occurs(val2[URI])
-                new_resp[REFERENCES][idx] = val2
+            for val in resp[REFERENCES]:
                 await deep_into(val[ID], _list, get)
     except (DeviceException, EncryptionException):
         pass
@@ -155,7 +150,17 @@ class BoschEntities:
 
     async def retrieve_from_module(self, deep, path, exclude=None):
         """Retrieve all json objects with simple values."""
-        return await crawl(path, [], deep, self._get, exclude)
+        with request_priority(BACKGROUND):
+            return await crawl(path, [], deep, self._get, exclude)
+
+    async def _background_get(self, path):
+        with request_priority(BACKGROUND):
+            return await self._get(path)
+
+    async def iter_from_module(self, deep, path, exclude=None):
+        """Yield json objects with simple values as they are fetched."""
+        async for resp in iter_crawl(path, deep, self._background_get, exclude):
+            yield resp
 
     def get_items(self):
         """Get items."""
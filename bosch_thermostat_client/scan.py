@@ -0,0 +1,175 @@
+"""Streaming scan of whole gateway tree.
+
+Every fetched node is written as one line of NDJSON right away, so
+interrupted scan loses nothing. Next to output a checkpoint file keeps
+scanned URIs with their references and scan started again with resume
+continues where the previous one stopped, retrying URIs which failed.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+
+from bosch_thermostat_client.const import (
+    ENERGY_HISTORY,
+    ENERGY_HISTORY_ENTRIES,
+    ID,
+    INTERVAL,
+    RECORDINGS,
+    REFERENCES,
+    VALUE,
+)
+
+from .exceptions import DeviceException, EncryptionException
+from .helper import get_all_intervals, scrub_node
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+NOT_FOUND = "not found"
+
+
+class NdjsonSink:
+    """Write nodes to NDJSON file and scanned URIs to checkpoint file.
+
+    File operations run in thread, create sink with open() in event loop.
+    """
+
+    def __init__(self, filename, resume=False):
+        self.filename = filename
+        self.checkpoint_filename = f"{filename}.checkpoint"
+        self.done = {}
+        self.not_found = set()
+        if resume:
+            self._read_checkpoint()
+        else:
+            for name in (filename, self.checkpoint_filename):
+                if os.path.exists(name):
+                    os.remove(name)
+        self._output = open(filename, "a")
+        self._checkpoint = open(self.checkpoint_filename, "a")
+
+    @classmethod
+    async def open(cls, filename, resume=False):
+        return await asyncio.to_thread(cls, filename, resume)
+
+    def _read_checkpoint(self):
+        try:
+            with open(self.checkpoint_filename, "r") as checkpoint:
+                for line in checkpoint:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Line cut by interrupted scan.
+                        continue
+                    if record["refs"] is None:
+                        self.not_found.add(record["uri"])
+                    else:
+                        self.done[record["uri"]] = record["refs"]
+        except FileNotFoundError:
+            pass
+
+    def _append(self, nodes, uri, refs):
+        for node in nodes:
+            self._output.write(json.dumps(node, separators=(",", ":")) + "\n")
+        self._output.flush()
+        if uri is not None:
+            self._checkpoint.write(json.dumps({"uri": uri, "refs": refs}) + "\n")
+            self._checkpoint.flush()
+
+    async def write(self, nodes, uri=None, refs=None):
+        """Write nodes, then remember URI as scanned with its references."""
+        await asyncio.to_thread(self._append, nodes, uri, refs)
+        if uri is not None:
+            self.done[uri] = refs
+
+    async def write_not_found(self, root):
+        """Write root as not found once, it stays to be tried on resume."""
+        if root in self.not_found:
+            return
+        await asyncio.to_thread(self._append, [{root: NOT_FOUND}], root, None)
+        self.not_found.add(root)
+
+    def _close(self):
+        self._output.close()
+        self._checkpoint.close()
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+
+async def _scan_node(url, get):
+    """Fetch node with its extra pages. Return (nodes, references)."""
+    resp = await get(url)
+    nodes = []
+    if ENERGY_HISTORY_ENTRIES in resp.get(ID, ""):
+        page = resp.get(VALUE, 1) - 1
+        page_uri = f"{ENERGY_HISTORY}?entry={page}"
+        en_resp = await get(page_uri)
+        en_resp[ID] = page_uri
+        nodes.append(en_resp)
+    if RECORDINGS in resp.get(ID, "") and REFERENCES not in resp:
+        for ivs in get_all_intervals():
+            try:
+                nodes.append(await get(f"{url}?{INTERVAL}={ivs}"))
+            except (DeviceException, EncryptionException):
+                pass
+    nodes.append(scrub_node(resp))
+    refs = [ref[ID] for ref in resp.get(REFERENCES, []) if ID in ref]
+    return nodes, refs
+
+
+async def stream_scan(roots, get, sink, concurrency=DEFAULT_CONCURRENCY, visited=None):
+    """Scan trees under roots concurrently and write nodes to sink.
+
+    Every URI is fetched once. URIs done according to sink are not
+    fetched again, only their stored references are followed.
+    Failed URIs are not done, so they are fetched again on resume,
+    failed root is written as not found only the first time.
+    Scans running at once might share visited set, then URI reachable
+    from both is written only by the first one.
+    Return number of nodes written.
+    """
+    pending = deque()
+    if visited is None:
+        visited = set()
+
+    def follow(uri, root=None):
+        if uri in visited:
+            return
+        visited.add(uri)
+        if uri in sink.done:
+            for ref in sink.done[uri]:
+                follow(ref)
+        else:
+            pending.append((uri, root))
+
+    for root in roots:
+        follow(root, root)
+    written = 0
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                uri, root = pending.popleft()
+                running[asyncio.ensure_future(_scan_node(uri, get))] = (uri, root)
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                uri, root = running.pop(task)
+                try:
+                    nodes, refs = task.result()
+                except (DeviceException, EncryptionException) as err:
+                    # Not checkpointed, resumed scan tries it again.
+                    _LOGGER.debug("Can't scan %s: %s", uri, err)
+                    if root:
+                        await sink.write_not_found(root)
+                    continue
+                await sink.write(nodes, uri, refs)
+                written += len(nodes)
+                for ref in refs:
+                    follow(ref)
+    finally:
+        for task in running:
+            task.cancel()
+    return written
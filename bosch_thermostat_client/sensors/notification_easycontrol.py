@@ -1,16 +1,17 @@
-from bosch_thermostat_client.db import (
-    get_easycontrol_errors,
-)
+from bosch_thermostat_client.db.error_index import EasycontrolErrorIndex
 from bosch_thermostat_client.const.ivt import INVALID
+from bosch_thermostat_client.trace import get_tracer
 from .sensor import Sensor
 from bosch_thermostat_client.const import (
     RESULT,
     VALUE,
 )
 
+_TRACE = get_tracer(__name__)
+
 
 class NotificationSensor(Sensor):
-    errorcodes: dict
+    error_index: EasycontrolErrorIndex
 
     def __init__(
         self,
@@ -18,27 +19,10 @@ class NotificationSensor(Sensor):
     ) -> None:
         """Notification sensor init."""
         super().__init__(**kwargs)
-        self.errorcodes = kwargs.get("errorcodes", {})
+        self.error_index = kwargs.get("error_index") or EasycontrolErrorIndex({})
 
     def get_error_message(self, dcd: str, ccd: str, act: str, fc: str) -> str:
-        msg = "Unknown error"
-        _dcd_lvl = self.errorcodes.get(dcd)
-        if not _dcd_lvl:
-            return msg
-        _ccd_lvl = _dcd_lvl.get(ccd)
-        if not _ccd_lvl:
-            return msg
-        if len(_ccd_lvl) == 1:
-            return _ccd_lvl[0]["message"]
-        for row in _ccd_lvl:
-            _failure_type = row["failure-type"]
-            _error_class = row["error-class"]
-            if act == _failure_type and fc == _error_class:
-                return row["message"]
-            if act == _failure_type or fc == _error_class:
-                # if not both, save as message
-                msg = row["message"]
-        return msg
+        return self.error_index.message(dcd, ccd, act, fc)
 
     def process_results(self, result, key=None, return_data=False):
         """Convert multi-level json object to one level object."""
@@ -47,7 +31,7 @@ class NotificationSensor(Sensor):
         if result:
             vals = result.get(VALUE, [])
             if vals:
-                print("vals", vals)
+                _TRACE("notifications", path=self.path, values=vals)
                 data[RESULT] = {}
                 for idx, val in enumerate(vals):
                     if "ccd" in val:
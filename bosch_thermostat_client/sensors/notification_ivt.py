@@ -1,4 +1,4 @@
-from bosch_thermostat_client.db import get_ivt_errors, get_nefit_errors
+from bosch_thermostat_client.db.error_index import IvtErrorIndex
 from bosch_thermostat_client.const.ivt import INVALID
 from .sensor import Sensor
 from bosch_thermostat_client.const import (
@@ -9,7 +9,7 @@ from bosch_thermostat_client.const import (
 
 
 class NotificationSensor(Sensor):
-    errorcodes: dict
+    error_index: IvtErrorIndex
 
     def __init__(
         self,
@@ -17,7 +17,7 @@ class NotificationSensor(Sensor):
     ) -> None:
         """Notification sensor init."""
         super().__init__(**kwargs)
-        self.errorcodes = kwargs.get("errorcodes", {})
+        self.error_index = kwargs.get("error_index") or IvtErrorIndex({})
 
     def process_results(self, result, key=None, return_data=False):
         """Convert multi-level json object to one level object."""
@@ -31,19 +31,11 @@ class NotificationSensor(Sensor):
                     if "ccd" in val:
                         ccd = str(val["ccd"])
                         key_suffix = "" if idx == 0 else f"_{idx}"
-                        data[RESULT][f"{VALUE}{key_suffix}"] = self.errorcodes.get(
-                            ccd, {"title": "Unknown error"}
-                        )["title"]
+                        title = self.error_index.title(ccd)
+                        data[RESULT][f"{VALUE}{key_suffix}"] = title
                         data[RESULT][f"errorCode{key_suffix}"] = f'{val["dcd"]}-{ccd}'
-                        for key, description in self.errorcodes.get(ccd, {}).items():
-                            if isinstance(description, list):
-                                for alternative in description:
-                                    for altkey in alternative:
-                                        data[RESULT][
-                                            f"{key}{key_suffix}_{altkey}"
-                                        ] = alternative[altkey]
-                            else:
-                                data[RESULT][f"{key}{key_suffix}"] = description
+                        for key, tail, description in self.error_index.fields(ccd):
+                            data[RESULT][f"{key}{key_suffix}{tail}"] = description
                     else:
                         data[RESULT] = {VALUE: val}
             else:
@@ -1,5 +1,4 @@
-from errno import errorcode
-from bosch_thermostat_client.db import get_nefit_errors
+from bosch_thermostat_client.db.error_index import NefitErrorIndex
 from .sensor import Sensor
 from bosch_thermostat_client.const import (
     MIN_VALUE,
@@ -11,7 +10,7 @@ from bosch_thermostat_client.const import (
 
 
 class NotificationSensor(Sensor):
-    errorcodes: dict
+    error_index: NefitErrorIndex
     _allowed_types = "notification"
 
     def __init__(
@@ -42,7 +41,7 @@ class NotificationSensor(Sensor):
             attr_id: {RESULT: {}, URI: path, TYPE: kind},
             "cause": {RESULT: {}, URI: cause_uri, TYPE: kind},
         }
-        self.errorcodes = kwargs.get("errorcodes", {})
+        self.error_index = kwargs.get("error_index") or NefitErrorIndex({})
 
     @property
     def state(self):
@@ -52,13 +51,13 @@ class NotificationSensor(Sensor):
             val = result.get(VALUE, "")
             if not val:
                 return "No notifications"
-            if val in self.errorcodes:
-                row = self.errorcodes[val]
+            if val in self.error_index:
                 cause = self._data["cause"].get(RESULT)
-                if (
-                    cause.get(VALUE, 0) > cause.get(MIN_VALUE, 200)
-                    and str(cause.get(VALUE, 0)) in row
-                ):
-                    return row[str(cause.get(VALUE, 0))].get("description", "")
+                if cause.get(VALUE, 0) > cause.get(MIN_VALUE, 200):
+                    description = self.error_index.description(
+                        val, str(cause.get(VALUE, 0))
+                    )
+                    if description is not None:
+                        return description
             return val
         return "No notifications"
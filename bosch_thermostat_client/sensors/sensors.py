@@ -1,3 +1,5 @@
+import asyncio
+
 from bosch_thermostat_client.const import (
     ID,
     REGULAR,
@@ -20,6 +22,7 @@ from bosch_thermostat_client.helper import (
     BoschEntities,
 )
 from bosch_thermostat_client.sensors.ecus_recording import EcusRecordingSensor
+from bosch_thermostat_client.trace import get_tracer
 
 from .sensor import Sensor
 from .recording import RecordingSensor
@@ -30,9 +33,10 @@ NOTIFICATIONS = "notifications"
 STATE = "state"
 ENERGY = "energy"
 
+_TRACE = get_tracer(__name__)
+
 
 def get_sensor_class(device_type, sensor_type):
-    print("de", device_type, sensor_type)
     if device_type == IVT:
         from .notification_ivt import NotificationSensor
     elif device_type == EASYCONTROL:
@@ -60,7 +64,13 @@ class Sensors(BoschEntities):
     """Sensors object containing multiple Sensor objects."""
 
     def __init__(
-        self, connector, sensors_db: dict | None = None, uri_prefix=None, data=None, parent=None, errors: dict | None = None
+        self,
+        connector,
+        sensors_db: dict | None = None,
+        uri_prefix=None,
+        data=None,
+        parent=None,
+        error_index=None,
     ):
         """
         Initialize sensors.
@@ -87,12 +97,17 @@ class Sensors(BoschEntities):
                     "parent": parent,
                     **sensor,
                 }
-                if sensor_id == NOTIFICATIONS and errors:
-                    kwargs["errorcodes"] = errors
+                if sensor_id == NOTIFICATIONS and error_index is not None:
+                    kwargs["error_index"] = error_index
                 SensorClass = get_sensor_class(
                     device_type=connector.device_type, sensor_type=sensor_id
                 )
-                print("sensr", SensorClass)
+                _TRACE(
+                    "sensor",
+                    id=sensor_id,
+                    device_type=connector.device_type,
+                    sensor_class=SensorClass.__name__,
+                )
                 self._items[sensor_id] = SensorClass(
                     **kwargs,
                 )
@@ -101,13 +116,20 @@ class Sensors(BoschEntities):
         """Initialize recording sensors."""
         fetched_sensors = []
 
-        for record in crawl_sensors:
-            retrieved = {
-                VALUE: await self.retrieve_from_module(
+        # Records are crawled concurrently, sensors are added in order of database.
+        crawled = await asyncio.gather(
+            *(
+                self.retrieve_from_module(
                     deep=record[DEEP],
                     path=record[URI],
                     exclude=record.get("exclude"),
-                ),
+                )
+                for record in crawl_sensors
+            )
+        )
+        for record, found in zip(crawl_sensors, crawled):
+            retrieved = {
+                VALUE: found,
                 DB_RECORD: record,
                 RECORDING: record.get(SENSOR_TYPE, REGULAR) == RECORDING,
             }
@@ -1,6 +1,8 @@
 """
 Switches of Bosch thermostat.
 """
+import asyncio
+
 from bosch_thermostat_client.const import (
     DEFAULT_STEP,
     ID,
@@ -64,7 +66,7 @@ class Switches(BoschEntities):
 
             items, ChoosenSwitch = get_switch_type(switch=switch, retrieved=retrieved)
             if items is not None and ChoosenSwitch:
-                items[switch_id] = ChoosenSwitch(
+                return items, switch_id, ChoosenSwitch(
                     connector=self._connector,
                     attr_id=switch_id,
                     name=switch[NAME],
@@ -75,44 +77,69 @@ class Switches(BoschEntities):
                     default_step=switch.get(DEFAULT_STEP),
                     parent=self._parent,
                 )
+            return None
+
+        async def prepare_base_switches(switch, _base):
+            if _base in self._bases:
+                base = self._bases[_base]
+            else:
+                base = await self._get(_base)
+                self._bases[_base] = base
+            prepared = []
+            for ref in base.get("references", []):
+                ref_id = ref.get(ID)
+                if not ref_id:
+                    continue
+                uri = (
+                    f"{self._uri_prefix}{ref_id}{switch[ID]}"
+                    if self._uri_prefix
+                    else f"{ref_id}{switch[ID]}"
+                )
+                name = ref_id.split("/")[-1]
+                _switch = {
+                    **switch,
+                    ID: f"{ref_id}{switch[ID]}",
+                    NAME: f"{switch[NAME]} {name}",
+                }
+                prepared.append(
+                    prepare_switch(
+                        switch_id=f"{name}{switch[ID]}", switch=_switch, uri=uri
+                    )
+                )
+            results = await asyncio.gather(*prepared, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(
+                    result, DeviceException
+                ):
+                    raise result
+            return [result for result in results if isinstance(result, tuple)]
 
-        for switch_id, switch in switches.items():
+        async def prepare_switches(switch_id, switch):
             try:
                 _base = switch.get("base")
                 if _base:
-                    if _base in self._bases:
-                        base = self._bases[_base]
-                    else:
-                        base = await self._get(_base)
-                        self._bases[_base] = base
-                    for ref in base.get("references", []):
-                        ref_id = ref.get(ID)
-                        if not ref_id:
-                            continue
-                        uri = (
-                            f"{self._uri_prefix}{ref_id}{switch[ID]}"
-                            if self._uri_prefix
-                            else f"{ref_id}{switch[ID]}"
-                        )
-                        name = ref_id.split("/")[-1]
-                        _switch = {
-                            **switch,
-                            ID: f"{ref_id}{switch[ID]}",
-                            NAME: f"{switch[NAME]} {name}",
-                        }
-                        await prepare_switch(
-                            switch_id=f"{name}{switch[ID]}", switch=_switch, uri=uri
-                        )
-                else:
-                    uri = (
-                        f"{self._uri_prefix}/{switch[ID]}"
-                        if self._uri_prefix
-                        else switch[ID]
-                    )
-                    await prepare_switch(switch_id=switch_id, switch=switch, uri=uri)
-
+                    return await prepare_base_switches(switch, _base)
+                uri = (
+                    f"{self._uri_prefix}/{switch[ID]}"
+                    if self._uri_prefix
+                    else switch[ID]
+                )
+                prepared = await prepare_switch(
+                    switch_id=switch_id, switch=switch, uri=uri
+                )
+                return [prepared] if prepared else []
             except DeviceException:
-                pass
+                return []
+
+        # Switches are probed concurrently, but added in order of database.
+        for prepared in await asyncio.gather(
+            *(
+                prepare_switches(switch_id, switch)
+                for switch_id, switch in switches.items()
+            )
+        ):
+            for items, switch_id, switch_object in prepared:
+                items[switch_id] = switch_object
 
     def __iter__(self):
         return iter(self._items.values())
@@ -0,0 +1,49 @@
+"""Debug tracing which costs nothing when DEBUG logging is off."""
+import json
+import logging
+
+
+class _Fields:
+    __slots__ = ("fields",)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(
+            f"{name}={json.dumps(value, default=str)}"
+            for name, value in self.fields.items()
+        )
+
+
+class Tracer:
+    """Log events with key=value fields at DEBUG level.
+
+    The only cost of disabled tracer is one level check, fields are
+    formatted when record is emitted. They are also attached to record
+    as `trace` attribute for structured log handlers.
+    """
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, name):
+        self._logger = logging.getLogger(name)
+
+    @property
+    def enabled(self):
+        return self._logger.isEnabledFor(logging.DEBUG)
+
+    def __call__(self, event, **fields):
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(
+                "%s %s",
+                event,
+                _Fields(fields),
+                extra={"trace": {"event": event, **fields}},
+                stacklevel=2,
+            )
+
+
+def get_tracer(name):
+    """Tracer logging to logger of given name."""
+    return Tracer(name)
@@ -0,0 +1,21 @@
+"""Compile database bundle into wheel, pdm runs it during build.
+
+Only bundle module is loaded, the package itself needs dependencies
+which are not installed in isolated build environment.
+"""
+import importlib.util
+import os
+
+DB_DIR = os.path.join("bosch_thermostat_client", "db")
+
+
+def build(src, dst):
+    spec = importlib.util.spec_from_file_location(
+        "bundle", os.path.join(src, DB_DIR, "bundle.py")
+    )
+    bundle = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bundle)
+    output = os.path.join(dst, DB_DIR, "bundle.bin")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    stats = bundle.build_bundle(root=os.path.join(src, DB_DIR), output=output)
+    print(f"Compiled {stats['files']} database files into {output}")
@@ -2,6 +2,7 @@
 
 source venv/bin/activate
 rm -rf dist/*
-python3 setup.py sdist bdist_wheel
+# Database bundle is compiled into wheel by build_db.py.
+pdm build
 python3 -m twine upload dist/*
 
@@ -0,0 +1,59 @@
+""" Benchmark of database loading at gateway startup.
+
+Compares JSON files with compiled bundle. Build bundle first:
+python -m bosch_thermostat_client.db
+Run: python examples/benchmark_db_startup.py
+"""
+import json
+import os
+import timeit
+
+from bosch_thermostat_client.db import MAINPATH
+from bosch_thermostat_client.db.bundle import Bundle
+
+ROUNDS = 50
+# Initial db, firmware db and error codes read by one gateway.
+STARTUPS = {
+    "IVT RC300": ("db_IVT", "rc300_rc200/040703", "errorcodes_ivt"),
+    "EasyControl": ("db_EASYCONTROL", "easycontrol/050200", "errorcodes_easycontrol"),
+}
+
+
+def read_json(path):
+    with open(path, "r") as db_file:
+        return json.load(db_file)
+
+
+def main():
+    bundle = Bundle()
+    for label, files in STARTUPS.items():
+        paths = [os.path.join(MAINPATH, f"{name}.json") for name in files]
+        for path in paths:
+            assert bundle.load(path) == read_json(path), path
+
+        def from_json():
+            for path in paths:
+                read_json(path)
+
+        def from_bundle():
+            for path in paths:
+                bundle.load(path)
+
+        def from_new_bundle():
+            new_bundle = Bundle()
+            for path in paths:
+                new_bundle.load(path)
+            new_bundle.close()
+
+        print(label)
+        for name, func in (
+            ("JSON files", from_json),
+            ("bundle", from_bundle),
+            ("bundle incl. open", from_new_bundle),
+        ):
+            elapsed = timeit.timeit(func, number=ROUNDS) / ROUNDS
+            print(f"  {name:<20} {elapsed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+""" Benchmark of AES backends on big gateway responses.
+
+Payloads mimic /recordings and /energy/historyHourly pages.
+Run: python examples/benchmark_decrypt.py
+"""
+import base64
+import json
+import random
+import timeit
+
+from pyaes import PADDING_NONE, AESModeOfOperationECB, Decrypter
+
+from bosch_thermostat_client.encryption import IVTEncryption, available_backends
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+PASSWORD = "passworddddd"
+ROUNDS = 20
+
+
+def recordings_page():
+    return {
+        "id": "/recordings/system/heatSources/hs1/actualPower?interval=2023-01-15",
+        "type": "recordings",
+        "writeable": 0,
+        "recordable": 0,
+        "recording": [
+            {"y": round(random.uniform(0, 100), 1), "c": 60} for _ in range(24)
+        ],
+        "interval": "2023-01-15",
+        "sampleRate": "P1H",
+    }
+
+
+def energy_page():
+    return {
+        "id": "/energy/historyHourly?entry=1",
+        "type": "arrayData",
+        "writeable": 0,
+        "recordable": 0,
+        "value": [
+            {
+                "entries": 2800,
+                "next": "/energy/historyHourly?entry=51",
+                "entry": [
+                    {
+                        "d": "15-01-2023",
+                        "h": hour % 24,
+                        "T": round(random.uniform(-10, 10), 1),
+                        "hh": round(random.uniform(0, 3), 2),
+                        "hw": round(random.uniform(0, 1), 2),
+                        "hs": 0,
+                    }
+                    for hour in range(50)
+                ],
+            }
+        ],
+    }
+
+
+def legacy_decrypt(key, enc):
+    """Decryption as done before pluggable backends."""
+    cipher = Decrypter(AESModeOfOperationECB(key), padding=PADDING_NONE)
+    return cipher.feed(enc) + cipher.feed()
+
+
+def bench(name, payloads):
+    encryption = IVTEncryption(ACCESS_KEY, PASSWORD, backend="pyaes")
+    messages = [encryption.encrypt(json.dumps(payload)) for payload in payloads]
+    raw = [encryption._pad(base64.b64decode(msg)) for msg in messages]
+    size = sum(len(r) for r in raw)
+    print(f"{name}: {len(messages)} responses, {size / 1024:.1f} KiB of ciphertext")
+
+    def report(label, func):
+        elapsed = timeit.timeit(func, number=ROUNDS) / ROUNDS
+        print(f"  {label:<28} {elapsed * 1000:9.3f} ms")
+
+    report("legacy pyaes", lambda: [legacy_decrypt(encryption._key, r) for r in raw])
+    for backend in available_backends():
+        client = IVTEncryption(ACCESS_KEY, PASSWORD, backend=backend)
+        report(f"{backend} decrypt", lambda: [client.decrypt(m) for m in messages])
+        report(f"{backend} decrypt_many", lambda: client.decrypt_many(messages))
+
+
+if __name__ == "__main__":
+    bench("/recordings", [recordings_page() for _ in range(10)])
+    bench("/energy/historyHourly", [energy_page() for _ in range(10)])
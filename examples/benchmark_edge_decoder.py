@@ -0,0 +1,93 @@
+""" Benchmark of EasyControl response decoding.
+
+Payload mimics EasyControl scan dump: zones, devices and programs with
+base64 encoded names, plain string values and float values.
+Run: python examples/benchmark_edge_decoder.py
+"""
+import base64
+import json
+import random
+import timeit
+
+from bosch_thermostat_client.encryption import easycontrol
+from bosch_thermostat_client.helper import check_base64
+
+ROUNDS = 500
+
+
+class LegacyEdgeDecoder(json.JSONDecoder):
+    """EdgeDecoder before fast path."""
+
+    def __init__(self, *args, **kwargs):
+        json.JSONDecoder.__init__(self, object_hook=self.object_hook, *args, **kwargs)
+
+    def object_hook(self, dct):
+        object_type = dct.get("type", None)
+        if object_type and "value" in dct:
+            if object_type == "stringValue":
+                dct["value"] = check_base64(dct["value"])
+            elif object_type == "floatValue":
+                dct["value"] = float(dct["value"])
+        return dct
+
+
+def name(text):
+    return base64.b64encode(text.encode("utf-8")).decode()
+
+
+def scan_dump():
+    zones = [
+        {
+            "id": f"/zones/zn{i}",
+            "type": "refEnum",
+            "references": [
+                {"id": f"/zones/zn{i}/name", "type": "stringValue",
+                 "value": name(f"Room {i} Kitchen")},
+                {"id": f"/zones/zn{i}/userMode", "type": "stringValue",
+                 "value": random.choice(["clock", "manual", "off"])},
+                {"id": f"/zones/zn{i}/temperatureActual", "type": "floatValue",
+                 "value": round(random.uniform(15, 25), 1), "unitOfMeasure": "C"},
+                {"id": f"/zones/zn{i}/temperatureHeatingSetpoint", "type": "floatValue",
+                 "value": 21.0, "minValue": 5, "maxValue": 30},
+            ],
+        }
+        for i in range(1, 21)
+    ]
+    devices = [
+        {"id": f"/devices/device{i}/name", "type": "stringValue",
+         "value": name(f"Thermostat {i}")}
+        for i in range(1, 41)
+    ]
+    return json.dumps({"id": "/", "type": "refEnum", "references": zones + devices})
+
+
+def main():
+    text = scan_dump()
+    print(f"EasyControl dump: {len(text) / 1024:.1f} KiB")
+    legacy = json.loads(text, cls=LegacyEdgeDecoder)
+    assert json.loads(text, cls=easycontrol.EdgeDecoder) == legacy
+    decoders = {
+        "legacy EdgeDecoder": lambda: json.loads(text, cls=LegacyEdgeDecoder),
+        "EdgeDecoder": lambda: json.loads(text, cls=easycontrol.EdgeDecoder),
+    }
+    if easycontrol.orjson:
+        assert easycontrol.edge_post_process(easycontrol.orjson.loads(text)) == legacy
+        decoders["orjson + post-pass"] = lambda: easycontrol.edge_post_process(
+            easycontrol.orjson.loads(text)
+        )
+    for label, func in decoders.items():
+        elapsed = timeit.timeit(func, number=ROUNDS) / ROUNDS
+        print(f"  {label:<28} {elapsed * 1000:8.3f} ms")
+        if label.startswith("legacy"):
+            continue
+
+        def cold():
+            easycontrol._decode_base64.cache_clear()
+            func()
+
+        elapsed = timeit.timeit(cold, number=ROUNDS) / ROUNDS
+        print(f"  {label + ' (cold cache)':<28} {elapsed * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Connector answering from memory instead of gateway, shared by tests."""
+
+import asyncio
+import copy
+from functools import partial
+from unittest import mock
+
+from bosch_thermostat_client.connectors.base import BaseConnector
+from bosch_thermostat_client.const.ivt import IVT
+from bosch_thermostat_client.exceptions import DeviceException
+from bosch_thermostat_client.gateway import ivt
+from bosch_thermostat_client.gateway.ivt import IVTGateway
+
+
+class FakeConnector(BaseConnector):
+    """Answer GETs from responses or values and remember every request.
+
+    responses map path to whole response, values map path to value of
+    plain {"id", "value"} response and are changed by PUT. Other paths
+    and paths in failing raise DeviceException like gateway answering 404.
+    Answer of path is late by its delays seconds and waits while release
+    is cleared. Requests raise error if it's set.
+    """
+
+    device_type = IVT
+
+    def __init__(self, responses=None, values=None, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = dict(responses or {})
+        self.values = dict(values or {})
+        self.failing = set()
+        self.delays = {}
+        self.error = None
+        self.gets = []
+        self.puts = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    @property
+    def encryption_key(self):
+        return "key"
+
+    async def connect(self):
+        pass
+
+    async def close(self, force=False):
+        pass
+
+    def respond(self, path):
+        if path in self.responses:
+            return copy.deepcopy(self.responses[path])
+        if path in self.values:
+            return {"id": path, "value": self.values[path]}
+        raise DeviceException(f"URI {path} not found")
+
+    async def _get(self, path):
+        await self._throttle()
+        self.gets.append(path)
+        # Value is read when request is sent, release delays only the answer.
+        try:
+            response = self.respond(path)
+        except DeviceException as err:
+            response = err
+        await asyncio.sleep(self.delays.get(path, 0))
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        if path in self.failing:
+            raise DeviceException(path)
+        if isinstance(response, DeviceException):
+            raise response
+        self._request_done()
+        return response
+
+    async def _put(self, path, value):
+        self.puts.append((path, value))
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        self.values[path] = value
+        return True
+
+
+def fake_gateway(responses=None, connector=FakeConnector, **kwargs):
+    """IVTGateway talking to connector which answers from responses."""
+    with mock.patch.object(
+        ivt, "connector_ivt_chooser", lambda _: partial(connector, responses)
+    ):
+        return IVTGateway("xmpp", "host", "a-b-c", "0" * 64, **kwargs)
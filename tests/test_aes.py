@@ -1,21 +1,64 @@
+import os
 import unittest
-from bosch_thermostat_client.encryption import Encryption
+
+from bosch_thermostat_client.encryption import IVTEncryption as Encryption
+from bosch_thermostat_client.encryption import available_backends
+from bosch_thermostat_client.encryption.backends import BLOCK_SIZE, NUMPY_MIN_BLOCKS
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+PASSWORD = "passworddddd"
 
 
 class AesTest(unittest.TestCase):
+    """Run the same vectors against every installed AES backend."""
 
-    def setup(self):
-        self.client = Encryption('abc1abc2abc3abc4', 'passworddddd')
+    def clients(self):
+        for backend in available_backends():
+            yield Encryption(ACCESS_KEY, PASSWORD, backend=backend)
 
     # encrypt and decrypt a string
     def test_crypt(self):
-        text = 'super_secret'
-        text_encrypted = self.client.encrypt(text)
-        text_decrypted = self.client.decrypt(text_encrypted)
-        self.assertEqual(text, text_decrypted)
+        text = "super_secret"
+        for client in self.clients():
+            with self.subTest(backend=client.backend):
+                text_encrypted = client.encrypt(text)
+                text_decrypted = client.decrypt(text_encrypted)
+                self.assertEqual(text, text_decrypted)
 
     # decrypt a known encrypted string
     def test_decrypt(self):
-        text_encrypted = b'TTZEYuh9QQoc0fjUgElBwA=='
-        text_decrypted = self.client.decrypt(text_encrypted)
-        self.assertEqual("super_secret", text_decrypted)
+        text_encrypted = b"TTZEYuh9QQoc0fjUgElBwA=="
+        for client in self.clients():
+            with self.subTest(backend=client.backend):
+                text_decrypted = client.decrypt(text_encrypted)
+                self.assertEqual("super_secret", text_decrypted)
+
+    # encrypt to a known string
+    def test_encrypt(self):
+        for client in self.clients():
+            with self.subTest(backend=client.backend):
+                self.assertEqual(
+                    client.encrypt("super_secret"), b"TTZEYuh9QQoc0fjUgElBwA=="
+                )
+
+    # every backend produces the same ciphertext
+    def test_backends_agree(self):
+        text = os.urandom(160).hex()
+        results = {client.backend: client.encrypt(text) for client in self.clients()}
+        self.assertEqual(len(set(results.values())), 1, results)
+
+    # batch of blocks big enough for vectorized backends decrypts the same
+    def test_decrypt_blocks_agree(self):
+        data = os.urandom(BLOCK_SIZE * NUMPY_MIN_BLOCKS * 4)
+        results = {
+            client.backend: client.decrypt_blocks(data) for client in self.clients()
+        }
+        self.assertEqual(len(set(results.values())), 1, list(results))
+
+    # many messages decrypted in one pass by every backend
+    def test_decrypt_many(self):
+        texts = ["super_secret", os.urandom(200).hex(), "x" * 16]
+        for client in self.clients():
+            with self.subTest(backend=client.backend):
+                messages = [client.encrypt(text) for text in texts] + [b""]
+                self.assertEqual(client.decrypt_many(messages), texts + ["{}"])
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from bosch_thermostat_client.exceptions import DeviceException
+
+from .fake_connector import fake_gateway
+from .test_scan import CIRCUITS, CircuitConnector, refs
+
+ROOTS = ("/heatingCircuits/hc1", "/heatingCircuits/hc2", "/dhwCircuits/dhw1")
+
+
+class RootsConnector(CircuitConnector):
+    """Circuit roots reference their status, so circuits are created."""
+
+    def respond(self, path):
+        if path in ROOTS:
+            return {"id": path, "type": "refEnum", "references": refs(f"{path}/status")}
+        return super().respond(path)
+
+
+class BootstrapTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.gateway = fake_gateway(CIRCUITS, connector=RootsConnector)
+        self.connector = self.gateway._connector
+        await self.gateway.initialize()
+
+    def assertNoTasksLeft(self):
+        current = asyncio.current_task()
+        self.assertFalse([task for task in asyncio.all_tasks() if task is not current])
+
+    def test_initialize_timings(self):
+        self.assertTrue(self.gateway.initialized)
+        self.assertEqual(self.gateway.firmware, "04.07.03")
+        self.assertLessEqual(
+            {"connect", "initial_db", "gateway_info", "firmware_db", "negative_cache"},
+            set(self.gateway.bootstrap_timings),
+        )
+
+    # slow heating circuits don't change order of results
+    async def test_order(self):
+        self.connector.delays = {
+            "/heatingCircuits": 0.05,
+            "/heatingCircuits/hc1": 0.02,
+        }
+        supported = await self.gateway.get_capabilities()
+        self.assertEqual(supported, ["hc", "dhw", "switch", "sensor"])
+        self.assertEqual(
+            [circuit.name for circuit in self.gateway.heating_circuits], ["hc1", "hc2"]
+        )
+        self.assertEqual(
+            [circuit.name for circuit in self.gateway.dhw_circuits], ["dhw1"]
+        )
+        # Hot water circuit was discovered while heating circuits waited.
+        gets = self.connector.gets
+        self.assertLess(gets.index(ROOTS[2]), gets.index(ROOTS[0]))
+        timings = self.gateway.bootstrap_timings
+        self.assertGreaterEqual(timings["circuits_hc"], 0.05)
+        self.assertLess(timings["circuits_dhw"], timings["circuits_hc"])
+        self.assertLessEqual(
+            {"sensors", "switches", "circuits_sc", "capabilities"}, set(timings)
+        )
+        self.assertIsNone(self.connector._recorded)
+        self.assertNoTasksLeft()
+
+    # circuit type gateway doesn't have is skipped, others are kept
+    async def test_missing_circuit(self):
+        self.connector.failing = {"/dhwCircuits"}
+        supported = await self.gateway.get_capabilities()
+        self.assertEqual(supported, ["hc", "switch", "sensor"])
+        self.assertEqual(len(self.gateway.heating_circuits), 2)
+        self.assertEqual(self.gateway.get_circuits("dhw"), [])
+
+    # failing stage raises its error and stops stages still running
+    async def test_failing_stage(self):
+        self.connector.release.clear()
+        with mock.patch.object(
+            self.gateway, "initialize_switches", side_effect=RuntimeError("broken")
+        ):
+            with self.assertRaisesRegex(RuntimeError, "broken"):
+                await self.gateway.get_capabilities()
+        self.assertNoTasksLeft()
+        self.assertIsNone(self.connector._recorded)
+        self.assertIn("capabilities", self.gateway.bootstrap_timings)
+        self.assertNotIn("circuits_hc", self.gateway.bootstrap_timings)
+
+    async def test_connection_error(self):
+        self.connector.error = DeviceException("gateway offline")
+        self.connector.failing = set()
+        self.connector.release.clear()
+        task = asyncio.ensure_future(self.gateway.get_capabilities())
+        await asyncio.sleep(0.01)
+        self.connector.release.set()
+        # Circuits are skipped, sensors and switches don't request anything.
+        self.assertEqual(await task, ["switch", "sensor"])
+        self.assertNoTasksLeft()
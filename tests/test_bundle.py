@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from bosch_thermostat_client.db.bundle import HEADER, Bundle, build_bundle
+
+DATABASE = {
+    "db_IVT": {"dhwCircuits": {"refs": {"a": 1}}},
+    "rc300_rc200/040703": {"firmware": "04.07.03", "heatingCircuits": {}},
+}
+
+
+class BundleTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.root = self._dir.name
+        for name, data in DATABASE.items():
+            self.dump(name, data)
+        self.output = os.path.join(self.root, "bundle.bin")
+        build_bundle(root=self.root, output=self.output)
+        self.bundle = Bundle(self.output, root=self.root)
+
+    def tearDown(self):
+        self.bundle.close()
+        self._dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.root, f"{name}.json")
+
+    def dump(self, name, data):
+        os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+        with open(self.path(name), "w") as db_file:
+            json.dump(data, db_file)
+
+    def test_load(self):
+        for name, data in DATABASE.items():
+            self.assertEqual(self.bundle.load(self.path(name)), data)
+        self.assertIsNone(self.bundle.load(self.path("missing")))
+
+    # JSON edited after bundle was built wins
+    def test_stale(self):
+        self.dump("db_IVT", {"dhwCircuits": {"refs": {"edited": 1}}})
+        self.assertFalse(self.bundle.is_fresh(self.path("db_IVT")))
+        self.assertIsNone(self.bundle.load(self.path("db_IVT")))
+        self.assertIsNotNone(self.bundle.load(self.path("rc300_rc200/040703")))
+
+    # same content with new mtime eg. after reinstall is still fresh
+    def test_touched(self):
+        path = self.path("db_IVT")
+        future = time.time() + 100
+        os.utime(path, (future, future))
+        self.assertTrue(self.bundle.is_fresh(path))
+        self.dump("db_IVT", {"dhwCircuits": {"refs": {"b": 1}}})
+        os.utime(path, (future, future))
+        self.assertFalse(self.bundle.is_fresh(path))
+
+    # bundle of other Python is rejected, so JSON is read instead
+    def test_other_python(self):
+        with open(self.output, "r+b") as bundle_file:
+            header = bytearray(bundle_file.read(HEADER.size))
+            header[10] += 1
+            bundle_file.seek(0)
+            bundle_file.write(header)
+        with self.assertRaises(ValueError):
+            Bundle(self.output, root=self.root)
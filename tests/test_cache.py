@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from bosch_thermostat_client.connectors.cache import ResponseCache
+
+from .fake_connector import FakeConnector
+
+HC1_MODE = "/heatingCircuits/hc1/operationMode"
+HC1_SETPOINT = "/heatingCircuits/hc1/currentRoomSetpoint"
+HC2_MODE = "/heatingCircuits/hc2/operationMode"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch(
+            "bosch_thermostat_client.connectors.cache.time.monotonic", self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ttl(self):
+        cache = ResponseCache(ttls={"/short": 10, "/never": 0})
+        cache.set("/short/a", {"value": 1})
+        cache.set("/never/a", {"value": 1})
+        cache.set("/gateway/uuid", {"value": "123"})
+        self.assertEqual(cache.get("/short/a"), {"value": 1})
+        self.assertIsNone(cache.get("/never/a"))
+        self.clock.now += 11
+        self.assertIsNone(cache.get("/short/a"))
+        self.assertEqual(len(cache), 1)
+        # Firmware and uuid never expire.
+        self.clock.now += 10**6
+        self.assertEqual(cache.get("/gateway/uuid"), {"value": "123"})
+
+    def test_longest_prefix(self):
+        cache = ResponseCache(ttls={"/a": 10, "/a/b": 0})
+        self.assertEqual(cache.ttl("/a/c"), 10)
+        self.assertEqual(cache.ttl("/a/b/c"), 0)
+        self.assertEqual(cache.ttl("/other"), 5)
+
+    def test_lru(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("/a", 1)
+        cache.set("/b", 2)
+        cache.get("/a")
+        cache.set("/c", 3)
+        self.assertIsNone(cache.get("/b"))
+        self.assertEqual(cache.get("/a"), 1)
+        self.assertEqual(cache.get("/c"), 3)
+
+    # caller changing response doesn't change cached one
+    def test_copy(self):
+        cache = ResponseCache()
+        response = {"value": [1]}
+        cache.set("/a", response)
+        response["value"].append(2)
+        cache.get("/a")["value"].append(3)
+        self.assertEqual(cache.get("/a"), {"value": [1]})
+
+    # write drops its URI, siblings and parent
+    def test_invalidate(self):
+        cache = ResponseCache()
+        for path in ("/heatingCircuits/hc1", HC1_MODE, HC1_SETPOINT, HC2_MODE):
+            cache.set(path, {"id": path})
+        cache.invalidate(HC1_MODE)
+        self.assertIsNone(cache.get(HC1_MODE))
+        self.assertIsNone(cache.get(HC1_SETPOINT))
+        self.assertIsNone(cache.get("/heatingCircuits/hc1"))
+        self.assertEqual(cache.get(HC2_MODE), {"id": HC2_MODE})
+
+    # response fetched before write is not stored after it
+    def test_generation(self):
+        cache = ResponseCache()
+        generation = cache.generation
+        cache.invalidate(HC1_MODE)
+        cache.set(HC1_MODE, {"value": "old"}, generation)
+        self.assertIsNone(cache.get(HC1_MODE))
+
+
+class ConnectorCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connector = FakeConnector(
+            values={HC1_MODE: None, HC2_MODE: None}, response_cache=True
+        )
+
+    async def test_read_through(self):
+        connector = self.connector
+        await connector.get(HC1_MODE)
+        response = await connector.get(HC1_MODE)
+        response["value"] = "changed"
+        self.assertEqual(connector.gets, [HC1_MODE])
+        self.assertEqual((await connector.get(HC1_MODE))["value"], None)
+        self.assertEqual(connector.stats["cache_hits"], 2)
+
+    # PUT makes the next GET ask gateway
+    async def test_put_invalidates(self):
+        connector = self.connector
+        await connector.get(HC1_MODE)
+        await connector.get(HC2_MODE)
+        await connector.put(HC1_MODE, "manual")
+        self.assertEqual((await connector.get(HC1_MODE))["value"], "manual")
+        await connector.get(HC2_MODE)
+        self.assertEqual(connector.gets, [HC1_MODE, HC2_MODE, HC1_MODE])
+
+    # GET racing with PUT doesn't cache value from before the write
+    async def test_get_during_put(self):
+        connector = self.connector
+        connector.release.clear()
+        get = asyncio.ensure_future(connector.get(HC1_MODE))
+        await asyncio.sleep(0)
+        await connector.put(HC1_MODE, "manual")
+        connector.release.set()
+        self.assertIsNone((await get)["value"])
+        self.assertEqual((await connector.get(HC1_MODE))["value"], "manual")
+        self.assertEqual(connector.gets, [HC1_MODE, HC1_MODE])
@@ -0,0 +1,144 @@
+import asyncio
+import random
+import re
+import unittest
+
+from bosch_thermostat_client.crawler import crawl_all, iter_crawl
+from bosch_thermostat_client.exceptions import DeviceException
+
+
+def refs(*ids):
+    return {"references": [{"id": ref_id} for ref_id in ids]}
+
+
+TREE = {
+    "/r": {"id": "/r", **refs("/r/a", "/r/b", "/r/missing")},
+    "/r/a": {"id": "/r/a", **refs("/r/a/1", "/shared")},
+    "/r/b": {"id": "/r/b", **refs("/shared", "/r/b/1")},
+    "/r/a/1": {"id": "/r/a/1", "value": 1},
+    "/r/b/1": {"id": "/r/b/1", **refs("/r/b/1/x")},
+    "/r/b/1/x": {"id": "/r/b/1/x", "value": 2},
+    "/shared": {"id": "/shared", "value": 3},
+}
+
+
+def random_tree(seed):
+    """Tree without shared references, some references are missing."""
+    rnd = random.Random(seed)
+    tree = {}
+
+    def node(path, deep):
+        if deep == 0 or rnd.random() < 0.3:
+            tree[path] = {"id": path, "value": 1}
+            return
+        children = [f"{path}/{idx}" for idx in range(rnd.randint(1, 4))]
+        tree[path] = {"id": path, **refs(*children)}
+        for child in children:
+            if rnd.random() > 0.1:
+                node(child, deep - 1)
+
+    node("/r", 5)
+    return tree
+
+
+async def recursive_crawl(url, deep, get, exclude=None):
+    """Depth-first crawl used before breadth-first crawler."""
+    found = []
+    try:
+        resp = await get(url)
+    except DeviceException:
+        return found
+    if ("references" not in resp or deep == 0) and "id" in resp:
+        if not exclude or not re.match(exclude, resp["id"]):
+            found.append(resp)
+    elif "references" in resp:
+        for ref in resp["references"]:
+            if "id" in ref and deep > 0:
+                found += await recursive_crawl(ref["id"], deep - 1, get, exclude)
+    return found
+
+
+class Gateway:
+    def __init__(self, tree):
+        self.tree = tree
+        self.requested = []
+        self.running = 0
+        self.peak = 0
+
+    async def get(self, uri):
+        self.requested.append(uri)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            # Let responses arrive in different order than requests.
+            for _ in range(1 + len(self.requested) % 3):
+                await asyncio.sleep(0)
+            if uri not in self.tree:
+                raise DeviceException(uri)
+            return self.tree[uri]
+        finally:
+            self.running -= 1
+
+
+def ids(responses):
+    return [resp["id"] for resp in responses]
+
+
+class CrawlerTest(unittest.IsolatedAsyncioTestCase):
+    # one level is fetched before the next one
+    async def test_breadth_first(self):
+        gateway = Gateway(TREE)
+        await crawl_all("/r", 5, gateway.get, concurrency=1)
+        self.assertEqual(
+            gateway.requested,
+            [
+                "/r",
+                "/r/a",
+                "/r/b",
+                "/r/missing",
+                "/r/a/1",
+                "/shared",
+                "/r/b/1",
+                "/r/b/1/x",
+            ],
+        )
+
+    # reference reachable from many nodes is fetched and returned once
+    async def test_visited(self):
+        gateway = Gateway(TREE)
+        found = await crawl_all("/r", 5, gateway.get)
+        self.assertEqual(ids(found), ["/r/a/1", "/shared", "/r/b/1/x"])
+        self.assertEqual(len(gateway.requested), len(set(gateway.requested)))
+
+    async def test_deep(self):
+        found = await crawl_all("/r", 2, Gateway(TREE).get)
+        self.assertEqual(ids(found), ["/r/a/1", "/shared", "/r/b/1"])
+        found = await crawl_all("/r", 0, Gateway(TREE).get)
+        self.assertEqual(ids(found), ["/r"])
+
+    async def test_exclude(self):
+        found = await crawl_all("/r", 5, Gateway(TREE).get, exclude="/shared")
+        self.assertEqual(ids(found), ["/r/a/1", "/r/b/1/x"])
+
+    async def test_concurrency(self):
+        tree = {"/r": {"id": "/r", **refs(*(f"/r/{idx}" for idx in range(10)))}}
+        for concurrency in (1, 3):
+            gateway = Gateway(tree)
+            await crawl_all("/r", 9, gateway.get, concurrency=concurrency)
+            self.assertEqual(gateway.peak, concurrency)
+
+    # result is in the same order as of depth-first crawl
+    async def test_depth_first_order(self):
+        for seed in range(10):
+            tree = random_tree(seed)
+            for deep in (0, 1, 3, 9):
+                for exclude in (None, "/r/1"):
+                    expected = await recursive_crawl(
+                        "/r", deep, Gateway(tree).get, exclude
+                    )
+                    found = await crawl_all("/r", deep, Gateway(tree).get, exclude)
+                    self.assertEqual(ids(found), ids(expected), (seed, deep, exclude))
+
+    async def test_iter_crawl(self):
+        found = [resp async for resp in iter_crawl("/r", 5, Gateway(TREE).get)]
+        self.assertCountEqual(ids(found), ["/r/a/1", "/shared", "/r/b/1/x"])
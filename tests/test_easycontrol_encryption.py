@@ -0,0 +1,92 @@
+import json
+import unittest
+from unittest import mock
+
+from bosch_thermostat_client.encryption import EasycontrolEncryption
+from bosch_thermostat_client.encryption import easycontrol
+from bosch_thermostat_client.encryption.easycontrol import (
+    decode_string_value,
+    edge_post_process,
+)
+from bosch_thermostat_client.helper import check_base64
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+RESPONSE = {
+    "id": "/zones/list",
+    "type": "refEnum",
+    "references": [
+        {"id": "/zones/zn1/name", "type": "stringValue", "value": "TGl2aW5n"},
+        {"id": "/zones/zn1/temp", "type": "floatValue", "value": "21"},
+        {
+            "id": "/zones/zn1/program",
+            "type": "switchProgram",
+            "switchPoints": [{"type": "stringValue", "value": "YW\nJj"}],
+        },
+    ],
+}
+DECODED = {
+    "id": "/zones/list",
+    "type": "refEnum",
+    "references": [
+        {"id": "/zones/zn1/name", "type": "stringValue", "value": "Living"},
+        {"id": "/zones/zn1/temp", "type": "floatValue", "value": 21.0},
+        {
+            "id": "/zones/zn1/program",
+            "type": "switchProgram",
+            "switchPoints": [{"type": "stringValue", "value": "abc"}],
+        },
+    ],
+}
+
+
+class DecodeTest(unittest.TestCase):
+    # decoding matches check_base64 used before
+    def test_decode_string_value(self):
+        for value in (
+            "TGl2aW5n",
+            "YW\nJj",
+            "Zm9v YmFy",
+            "YWI=",
+            "auto",
+            "test",
+            "1234",
+            "off",
+            "",
+            "žluť",
+            None,
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(decode_string_value(value), check_base64(value))
+        self.assertEqual(decode_string_value("YW\nJj"), "abc")
+
+    def test_edge_post_process(self):
+        self.assertEqual(edge_post_process(json.loads(json.dumps(RESPONSE))), DECODED)
+        self.assertEqual(edge_post_process([1, "a", None]), [1, "a", None])
+
+
+class LoadsTest(unittest.TestCase):
+    def setUp(self):
+        self.encryption = EasycontrolEncryption(ACCESS_KEY, "pw")
+        self.raw = self.encryption.encrypt(json.dumps(RESPONSE))
+
+    @unittest.skipIf(easycontrol.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        with mock.patch.object(
+            easycontrol, "edge_post_process", wraps=edge_post_process
+        ) as post_process:
+            self.assertEqual(self.encryption.json_decrypt(self.raw), DECODED)
+        post_process.assert_called_once()
+
+    # integer too big for orjson falls back to json module
+    @unittest.skipIf(easycontrol.orjson is None, "orjson is not installed")
+    def test_orjson_fallback(self):
+        raw = self.encryption.encrypt(json.dumps({"id": "/a", "value": 2**70}))
+        self.assertEqual(self.encryption.json_decrypt(raw)["value"], 2**70)
+
+    def test_without_orjson(self):
+        with (
+            mock.patch.object(easycontrol, "orjson", None),
+            mock.patch.object(easycontrol, "edge_post_process") as post_process,
+        ):
+            self.assertEqual(self.encryption.json_decrypt(self.raw), DECODED)
+        post_process.assert_not_called()
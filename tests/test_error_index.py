@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+
+from bosch_thermostat_client.const.easycontrol import EASYCONTROL
+from bosch_thermostat_client.const.ivt import IVT
+from bosch_thermostat_client.const.nefit import NEFIT
+from bosch_thermostat_client.db import get_errors, get_shared_error_index
+from bosch_thermostat_client.db.error_index import UNKNOWN_ERROR, build_error_index
+
+
+def scan_easycontrol(errorcodes, dcd, ccd, act, fc):
+    """Row scan done by EasyControl notification sensor before the index."""
+    msg = UNKNOWN_ERROR
+    rows = errorcodes.get(dcd, {}).get(ccd)
+    if not rows:
+        return msg
+    if len(rows) == 1:
+        return rows[0]["message"]
+    for row in rows:
+        if act == row["failure-type"] and fc == row["error-class"]:
+            return row["message"]
+        if act == row["failure-type"] or fc == row["error-class"]:
+            msg = row["message"]
+    return msg
+
+
+class ErrorIndexTest(unittest.TestCase):
+    # every code, failure type and error class gives the same message
+    def test_easycontrol(self):
+        errorcodes = get_errors(EASYCONTROL)
+        index = build_error_index(EASYCONTROL, errorcodes)
+        cases = [*errorcodes.items(), ("unknown", {"1": []})]
+        for dcd, ccds in cases:
+            for ccd, rows in [*ccds.items(), ("unknown", [])]:
+                acts = {row["failure-type"] for row in rows} | {"", "X"}
+                fcs = {row["error-class"] for row in rows} | {"", "99"}
+                for act in acts:
+                    for fc in fcs:
+                        self.assertEqual(
+                            index.message(dcd, ccd, act, fc),
+                            scan_easycontrol(errorcodes, dcd, ccd, act, fc),
+                            (dcd, ccd, act, fc),
+                        )
+
+    def test_ivt(self):
+        errorcodes = get_errors(IVT)
+        index = build_error_index(IVT, errorcodes)
+        for ccd, row in errorcodes.items():
+            self.assertEqual(index.title(ccd), row.get("title", UNKNOWN_ERROR))
+            flattened = {}
+            for key, tail, value in index.fields(ccd):
+                flattened[f"{key}{tail}"] = value
+            expected = {}
+            for key, description in row.items():
+                if isinstance(description, list):
+                    for alternative in description:
+                        for altkey, value in alternative.items():
+                            expected[f"{key}_{altkey}"] = value
+                else:
+                    expected[key] = description
+            self.assertEqual(flattened, expected, ccd)
+        self.assertEqual(index.title("unknown"), UNKNOWN_ERROR)
+        self.assertEqual(index.fields("unknown"), ())
+
+    def test_nefit(self):
+        errorcodes = get_errors(NEFIT)
+        index = build_error_index(NEFIT, errorcodes)
+        for code, causes in errorcodes.items():
+            self.assertIn(code, index)
+            for cause, value in causes.items():
+                self.assertEqual(
+                    index.description(code, cause), value.get("description", "")
+                )
+        self.assertNotIn("unknown", index)
+
+    # index is built once per device type
+    def test_shared(self):
+        async def load():
+            return [await get_shared_error_index(EASYCONTROL) for _ in range(2)]
+
+        first, second = asyncio.run(load())
+        self.assertIs(first, second)
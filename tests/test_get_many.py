@@ -0,0 +1,91 @@
+import asyncio
+import time
+import unittest
+from contextlib import aclosing
+from unittest import mock
+
+from bosch_thermostat_client import bosch_cli
+from bosch_thermostat_client.const import RATE_LIMIT
+from bosch_thermostat_client.exceptions import DeviceException
+
+from .fake_connector import FakeConnector, fake_gateway
+
+VALUES = {f"/p/{idx}": idx for idx in range(5)}
+PATHS = list(VALUES)
+
+
+class GetManyTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connector = FakeConnector(values=VALUES)
+        # The first path answers last.
+        self.connector.delays = {PATHS[0]: 0.02}
+
+    # iter_many yields as responses arrive, get_many keeps order of paths
+    async def test_order(self):
+        arrived = [path async for path, _ in self.connector.iter_many(PATHS)]
+        self.assertEqual(arrived[-1], PATHS[0])
+        self.assertCountEqual(arrived, PATHS)
+        results = await self.connector.get_many(reversed(PATHS))
+        self.assertEqual(list(results), PATHS[::-1])
+        self.assertEqual(
+            [result["value"] for result in results.values()], [4, 3, 2, 1, 0]
+        )
+
+    # duplicate path is requested once
+    async def test_duplicates(self):
+        results = await self.connector.get_many([PATHS[1], PATHS[1], PATHS[2]])
+        self.assertEqual(list(results), PATHS[1:3])
+        self.assertEqual(sorted(self.connector.gets), PATHS[1:3])
+
+    # failed path doesn't fail the others
+    async def test_partial_failure(self):
+        self.connector.failing = {PATHS[2]}
+        results = await self.connector.get_many(PATHS + ["/unknown"])
+        self.assertIsInstance(results[PATHS[2]], DeviceException)
+        self.assertIsInstance(results["/unknown"], DeviceException)
+        for path in PATHS[:2] + PATHS[3:]:
+            self.assertEqual(results[path]["value"], VALUES[path])
+
+    # leaving iter_many early cancels requests nobody waits for
+    async def test_early_exit(self):
+        self.connector.delays = {path: 10 for path in PATHS[1:]}
+        async with aclosing(self.connector.iter_many(PATHS)) as results:
+            async for path, result in results:
+                break
+        self.assertEqual(path, PATHS[0])
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.connector._single_flight.in_flight, 0)
+        self.assertCountEqual(self.connector.gets, PATHS)
+
+
+class RawQueryManyTest(unittest.IsolatedAsyncioTestCase):
+    # query command prints every answer under rate limit and logs failures
+    async def test_runquery(self):
+        gateway = fake_gateway(connector_options={RATE_LIMIT: 10})
+        connector = gateway._connector
+        connector.values = dict(VALUES)
+        connector.failing = {PATHS[1]}
+        started = time.monotonic()
+        with (
+            mock.patch.object(bosch_cli.click, "secho") as secho,
+            self.assertLogs(bosch_cli._LOGGER) as logs,
+        ):
+            await bosch_cli._runquery(gateway, PATHS)
+        # Burst of 10 requests/s bucket is 10, so all 5 go at once.
+        self.assertLess(time.monotonic() - started, 0.5)
+        printed = secho.call_args.args[0]
+        self.assertEqual(printed.count('"id"'), 4)
+        self.assertNotIn(f'"{PATHS[1]}"', printed)
+        self.assertTrue(any(PATHS[1] in line for line in logs.output))
+        self.assertEqual(connector.stats["rate_limit"], 10)
+
+    # requests over burst wait for tokens
+    async def test_rate_limit(self):
+        gateway = fake_gateway(connector_options={RATE_LIMIT: 20})
+        gateway._connector.values = {f"/q/{idx}": idx for idx in range(25)}
+        started = time.monotonic()
+        results = await gateway.raw_query_many(list(gateway._connector.values))
+        self.assertGreater(time.monotonic() - started, 0.2)
+        self.assertEqual(
+            [result["value"] for result in results.values()], list(range(25))
+        )
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import unittest
+
+from aiohttp import ClientSession
+
+from bosch_thermostat_client.connectors import HttpConnector
+from bosch_thermostat_client.encryption import IVTEncryption
+
+from .gateway_test_server import GatewayTestServer
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+
+
+class HttpPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GatewayTestServer()
+        await self.server.start_server()
+        self.host = f"{self.server.host}:{self.server.port}"
+        self.encryption = IVTEncryption(ACCESS_KEY, "pw")
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def respond(self, request):
+        body = self.encryption.encrypt(json.dumps({"id": request.path}))
+        self.server.send_response(request, body=body, content_type="application/json")
+
+    async def serve(self, count):
+        """Answer count requests, return client ports they came from."""
+        ports = []
+        for _ in range(count):
+            request = await self.server.receive_request(timeout=1)
+            ports.append(request.transport.get_extra_info("peername")[1])
+            self.respond(request)
+        return ports
+
+    # own session keeps at most max_in_flight connections and reuses them
+    async def test_pool(self):
+        connector = HttpConnector(
+            self.host, self.encryption, http_pool=True, max_in_flight=2
+        )
+        await connector.connect()
+        session = connector._websession
+        pool = session.connector
+        self.assertEqual(pool.limit_per_host, 2)
+        paths = [f"/p/{idx}" for idx in range(6)]
+        gets = asyncio.gather(*(connector.get(path) for path in paths))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.server.awaiting_request_count, 2)
+        ports = await self.serve(len(paths))
+        results = await gets
+        self.assertEqual([result["id"] for result in results], paths)
+        self.assertEqual(len(set(ports)), 2)
+        await connector.close()
+        self.assertTrue(session.closed)
+        self.assertTrue(pool.closed)
+        self.assertIsNone(connector._websession)
+
+    # session given by caller is left open
+    async def test_caller_session(self):
+        async with ClientSession() as session:
+            connector = HttpConnector(self.host, self.encryption, loop=session)
+            get = asyncio.ensure_future(connector.get("/gateway/uuid"))
+            await self.serve(1)
+            self.assertEqual((await get)["id"], "/gateway/uuid")
+            await connector.close()
+            self.assertFalse(session.closed)
+            self.assertIs(connector._websession, session)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bosch_thermostat_client.connectors.negative_cache import NegativeCache
+from bosch_thermostat_client.const import GET
+from bosch_thermostat_client.exceptions import DeviceException
+
+from .fake_connector import FakeConnector
+
+DEAD = "/heatingCircuits/hc1/notThere"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class NegativeCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch(
+            "bosch_thermostat_client.connectors.negative_cache.time.time", self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # URI is dead until probe interval passes
+    def test_expiry(self):
+        cache = NegativeCache(min_interval=60)
+        self.assertEqual(cache.failed(DEAD), 60)
+        self.assertIn(DEAD, cache)
+        self.clock.now += 59
+        self.assertIn(DEAD, cache)
+        self.clock.now += 2
+        self.assertNotIn(DEAD, cache)
+        self.assertEqual(cache.dead, [])
+
+    # every failed probe doubles interval up to maximum
+    def test_backoff(self):
+        cache = NegativeCache(min_interval=60, max_interval=200)
+        intervals = [cache.failed(DEAD) for _ in range(4)]
+        self.assertEqual(intervals, [60, 120, 200, 200])
+        cache.succeeded(DEAD)
+        self.assertNotIn(DEAD, cache)
+        self.assertEqual(cache.failed(DEAD), 60)
+
+    # stored URIs are loaded only for the same gateway and firmware
+    async def test_persist(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "negative.json")
+            cache = NegativeCache(filename=filename)
+            await cache.bind("123", "04.07.03")
+            cache.failed(DEAD)
+            await cache.save()
+            same = NegativeCache(filename=filename)
+            await same.bind("123", "04.07.03")
+            self.assertIn(DEAD, same)
+            upgraded = NegativeCache(filename=filename)
+            await upgraded.bind("123", "04.08.01")
+            self.assertNotIn(DEAD, upgraded)
+
+    # connector skips dead URI and asks again after interval
+    async def test_connector(self):
+        connector = FakeConnector(values={DEAD: 1}, negative_cache=True)
+        connector._unsupported(DEAD)
+        with self.assertRaises(DeviceException):
+            await connector.get(DEAD)
+        self.assertEqual(connector.gets, [])
+        self.clock.now += 61
+        self.assertEqual(await connector.get(DEAD), {"id": DEAD, "value": 1})
+        self.assertEqual(connector.gets, [DEAD])
+        self.assertEqual(len(connector.negative_cache), 0)
+
+    # URI timing out while gateway answers others is dead
+    async def test_timeout(self):
+        connector = FakeConnector(negative_cache=True)
+
+        async def send(timeout, attempt):
+            # Answer to other request arrives meanwhile.
+            connector._request_done()
+            raise asyncio.TimeoutError
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await connector._with_retries(GET, DEAD, send)
+        self.assertIn(DEAD, connector.negative_cache)
@@ -0,0 +1,66 @@
+import json
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from bosch_thermostat_client.connectors.ivt import IVTXMPPConnector
+from bosch_thermostat_client.const import GET
+from bosch_thermostat_client.encryption import (
+    EasycontrolEncryption,
+    IVTEncryption,
+    available_backends,
+)
+from bosch_thermostat_client.encryption.offload import get_executor
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+RESPONSE = {
+    "id": "/recordings/heatSources/total/energyMonitoring/consumption",
+    "recording": [{"y": idx, "c": 60} for idx in range(500)],
+}
+
+
+class OffloadTest(unittest.IsolatedAsyncioTestCase):
+    def connector(self, executor, encryption):
+        connector = IVTXMPPConnector(
+            "123456789",
+            ACCESS_KEY,
+            encryption,
+            decrypt_executor=executor,
+            decrypt_threshold=1024,
+        )
+        self.assertIs(connector._decrypt_executor, executor)
+        return connector
+
+    async def decrypt(self, executor, encryption_class=IVTEncryption):
+        """Route big response through executor, return what request got."""
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                encryption = encryption_class(ACCESS_KEY, "pw", backend=backend)
+                connector = self.connector(executor, encryption)
+                raw = encryption.encrypt(json.dumps(RESPONSE)).decode()
+                self.assertTrue(connector._offload_decrypt(raw))
+                request = connector._router.register(GET, RESPONSE["id"], seq_no=1)
+                connector.main_listener(
+                    {"type": "chat", "body": f"HTTP/1.0 200 OK\nSeq-No: 1\n\n{raw}"}
+                )
+                self.assertEqual(await request.future, RESPONSE)
+
+    async def test_thread(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        await self.decrypt(executor)
+        self.assertTrue(executor._threads)
+
+    # encryption class, key and backend name are pickled to worker process
+    async def test_process(self):
+        executor = ProcessPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        await self.decrypt(executor)
+        await self.decrypt(executor, EasycontrolEncryption)
+        self.assertTrue(executor._processes)
+
+    def test_get_executor(self):
+        self.assertIsInstance(get_executor("thread"), ThreadPoolExecutor)
+        self.assertIs(get_executor("thread"), get_executor("thread"))
+        self.assertIsInstance(get_executor("process"), ProcessPoolExecutor)
+        with self.assertRaises(ValueError):
+            get_executor("fiber")
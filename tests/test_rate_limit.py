@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from bosch_thermostat_client.connectors import rate_limit
+from bosch_thermostat_client.connectors.rate_limit import TokenBucket
+
+from .fake_connector import FakeConnector
+
+
+class Clock:
+    """Fake monotonic time which sleeping moves forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        fakes = {
+            "time": SimpleNamespace(monotonic=self.clock),
+            "asyncio": SimpleNamespace(sleep=self.clock.sleep, Lock=asyncio.Lock),
+        }
+        for name, fake in fakes.items():
+            patcher = mock.patch.object(rate_limit, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def acquire(self, bucket, count):
+        """Acquire count tokens, return seconds it took."""
+        started = self.clock.now
+        for _ in range(count):
+            await bucket.acquire()
+        return self.clock.now - started
+
+    # burst goes at once, then requests are spaced by 1 / rate
+    async def test_refill(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual(await self.acquire(bucket, 3), 0)
+        self.assertAlmostEqual(await self.acquire(bucket, 4), 2)
+        # Idle time refills the bucket, but never above burst.
+        self.clock.now += 60
+        self.assertEqual(await self.acquire(bucket, 3), 0)
+        self.assertAlmostEqual(await self.acquire(bucket, 1), 0.5)
+
+    # failure halves rate down to min_rate and drops saved tokens
+    async def test_decrease(self):
+        bucket = TokenBucket(rate=4, burst=4, min_rate=1)
+        bucket.failure()
+        self.assertEqual(bucket.rate, 2)
+        self.assertAlmostEqual(await self.acquire(bucket, 1), 0.5)
+        for _ in range(5):
+            bucket.failure()
+        self.assertEqual(bucket.rate, 1)
+        self.assertEqual(bucket.failures, 6)
+        self.assertAlmostEqual(await self.acquire(bucket, 2), 2)
+
+    # success raises rate additively up to max rate
+    async def test_recovery(self):
+        bucket = TokenBucket(rate=2, increase=0.5)
+        bucket.failure()
+        self.assertEqual(bucket.rate, 1)
+        rates = []
+        for _ in range(3):
+            bucket.success()
+            rates.append(bucket.rate)
+        self.assertEqual(rates, [1.5, 2, 2])
+
+    def test_defaults(self):
+        bucket = TokenBucket(rate=0.5)
+        for _ in range(10):
+            bucket.failure()
+        self.assertAlmostEqual(bucket.rate, 0.05)
+        self.assertEqual(bucket._burst, 1)
+
+
+class ConnectorRateLimitTest(unittest.IsolatedAsyncioTestCase):
+    # connector waits for token and reports outcome of requests
+    async def test_connector(self):
+        connector = FakeConnector(rate_limit=10, rate_limit_burst=1)
+        await connector._throttle()
+        connector._request_done(success=False)
+        self.assertEqual(connector.stats["rate_limit"], 5)
+        self.assertEqual(connector.stats["rate_limit_failures"], 1)
+        connector._request_done()
+        self.assertEqual(connector.stats["rate_limit"], 5.1)
@@ -0,0 +1,119 @@
+import unittest
+
+from bosch_thermostat_client.connectors.router import ResponseRouter
+from bosch_thermostat_client.const import BODY_400, GET, PUT, WRONG_ENCRYPTION
+from bosch_thermostat_client.exceptions import (
+    DeviceException,
+    EncryptionException,
+    MsgException,
+)
+
+OK = "HTTP/1.0 200 OK"
+NO_CONTENT = "HTTP/1.0 204 No Content"
+BAD_REQUEST = "HTTP/1.0 400 Bad Request"
+
+
+class RouterTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.router = ResponseRouter()
+
+    # response goes to request of the same Seq-No
+    async def test_seq_no(self):
+        first = self.router.register(GET, "/a", seq_no=1)
+        second = self.router.register(GET, "/b", seq_no=2)
+        self.assertTrue(self.router.route({"id": "/other"}, OK, seq_no=2))
+        self.assertEqual(await second.future, {"id": "/other"})
+        self.assertTrue(second.correlated)
+        self.assertFalse(first.future.done())
+
+    # responses coming in different order than requests
+    async def test_out_of_order(self):
+        requests = [
+            self.router.register(GET, f"/p/{seq_no}", seq_no=seq_no)
+            for seq_no in range(5)
+        ]
+        for seq_no in (3, 0, 4, 1, 2):
+            self.router.route({"id": f"/p/{seq_no}"}, OK, seq_no=seq_no)
+        for seq_no, request in enumerate(requests):
+            self.assertEqual((await request.future)["id"], f"/p/{seq_no}")
+
+    # without Seq-No response is matched by id
+    async def test_path(self):
+        first = self.router.register(GET, "/p/1")
+        second = self.router.register(GET, "/p/7/")
+        self.assertTrue(self.router.route({"id": "/p/7"}, OK))
+        self.assertEqual(await second.future, {"id": "/p/7"})
+        self.assertTrue(second.correlated)
+        self.assertFalse(first.future.done())
+
+    # requests differing only by query can't be told apart by id
+    async def test_path_with_query(self):
+        first = self.router.register(GET, "/rec?interval=2024-01-01")
+        second = self.router.register(GET, "/rec?interval=2024-01-02")
+        self.assertFalse(self.router.route({"id": "/rec"}, OK))
+        self.assertFalse(first.future.done())
+        self.assertFalse(second.future.done())
+        self.router.unregister(first)
+        self.assertTrue(self.router.route({"id": "/rec"}, OK))
+        self.assertEqual(await second.future, {"id": "/rec"})
+
+    # error without Seq-No can't be blamed on any of several requests
+    async def test_error_without_seq_no_many_pending(self):
+        requests = [self.router.register(GET, f"/p/{idx}") for idx in range(3)]
+        self.assertFalse(self.router.route(BODY_400, BAD_REQUEST))
+        self.assertFalse(self.router.route(None, WRONG_ENCRYPTION))
+        for request in requests:
+            self.assertFalse(request.future.done())
+
+    # error without Seq-No goes to the only waiting request
+    async def test_error_without_seq_no_one_pending(self):
+        request = self.router.register(GET, "/p/7")
+        self.assertTrue(self.router.route(BODY_400, BAD_REQUEST))
+        with self.assertRaises(MsgException):
+            await request.future
+        self.assertFalse(request.correlated)
+
+    async def test_error_with_seq_no(self):
+        first = self.router.register(GET, "/p/1", seq_no=1)
+        second = self.router.register(GET, "/p/7", seq_no=7)
+        self.assertTrue(self.router.route(None, WRONG_ENCRYPTION, seq_no=7))
+        with self.assertRaises(EncryptionException):
+            await second.future
+        self.assertTrue(second.correlated)
+        self.assertFalse(first.future.done())
+        # Seq-No of request which doesn't wait anymore.
+        self.assertFalse(self.router.route(BODY_400, BAD_REQUEST, seq_no=5))
+        self.assertFalse(first.future.done())
+
+    async def test_put_no_content(self):
+        get = self.router.register(GET, "/a")
+        put = self.router.register(PUT, "/b")
+        self.assertTrue(self.router.route(None, NO_CONTENT))
+        self.assertTrue(await put.future)
+        self.assertFalse(get.future.done())
+
+    # cancelled request leaves no trace in indexes
+    async def test_cancel(self):
+        request = self.router.register(GET, "/p/1", seq_no=1)
+        request.future.cancel()
+        self.router.unregister(request)
+        self.assertEqual(len(self.router), 0)
+        self.assertEqual(self.router.pending, [])
+        self.assertFalse(self.router.route({"id": "/p/1"}, OK, seq_no=1))
+        self.assertFalse(self.router.route({"id": "/p/1"}, OK))
+        # Unregister twice is harmless.
+        self.router.unregister(request)
+        self.assertEqual(len(self.router), 0)
+
+    # response which can't be read fails its request
+    async def test_fail(self):
+        first = self.router.register(GET, "/p/1", seq_no=1)
+        second = self.router.register(GET, "/p/7", seq_no=7)
+        self.assertTrue(self.router.fail(DeviceException("broken"), seq_no=7))
+        with self.assertRaises(DeviceException):
+            await second.future
+        self.assertFalse(first.future.done())
+        # Without Seq-No only the single waiting request fails.
+        self.router.register(GET, "/p/8")
+        self.assertFalse(self.router.fail(DeviceException("broken")))
+        self.assertFalse(first.future.done())
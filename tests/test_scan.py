@@ -0,0 +1,185 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from bosch_thermostat_client.exceptions import DeviceException
+from bosch_thermostat_client.scan import NOT_FOUND, NdjsonSink, stream_scan
+
+from .fake_connector import FakeConnector, fake_gateway
+
+
+def refs(*ids):
+    return [{"id": ref_id} for ref_id in ids]
+
+
+TREE = {
+    "/a": {"id": "/a", "type": "refEnum", "references": refs("/a/1", "/a/2")},
+    "/a/1": {"id": "/a/1", "type": "floatValue", "value": 1},
+    "/a/2": {"id": "/a/2", "type": "refEnum", "references": refs("/a/2/x", "/s")},
+    "/a/2/x": {"id": "/a/2/x", "type": "floatValue", "value": 2},
+    "/b": {"id": "/b", "type": "refEnum", "references": refs("/b/1", "/s")},
+    "/b/1": {"id": "/b/1", "type": "floatValue", "value": 3},
+    "/s": {"id": "/s", "type": "floatValue", "value": 4},
+}
+
+
+class Gateway:
+    """Serve TREE, optionally fail some URIs or die after some requests."""
+
+    def __init__(self, failing=(), die_after=None):
+        self.requested = []
+        self.failing = set(failing)
+        self.die_after = die_after
+
+    async def get(self, uri):
+        if self.die_after is not None and len(self.requested) >= self.die_after:
+            raise RuntimeError("connection lost")
+        self.requested.append(uri)
+        await asyncio.sleep(0)
+        if uri not in TREE or uri in self.failing:
+            raise DeviceException(uri)
+        return json.loads(json.dumps(TREE[uri]))
+
+
+class ScanTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self._dir.name, "scan.ndjson")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def read(self, filename=None):
+        with open(filename or self.output) as output:
+            return [json.loads(line) for line in output]
+
+    async def scan(self, roots, gateway, resume=False, concurrency=4):
+        sink = await NdjsonSink.open(self.output, resume=resume)
+        try:
+            return await stream_scan(roots, gateway.get, sink, concurrency=concurrency)
+        finally:
+            await sink.close()
+
+    async def test_scan(self):
+        gateway = Gateway()
+        written = await self.scan(["/a", "/b", "/nope"], gateway)
+        nodes = self.read()
+        self.assertEqual(written, len(TREE))
+        self.assertIn({"/nope": NOT_FOUND}, nodes)
+        ids = [node["id"] for node in nodes if "id" in node]
+        self.assertCountEqual(ids, TREE)
+        self.assertCountEqual(gateway.requested, [*TREE, "/nope"])
+
+    # interrupted scan continues without fetching done URIs again
+    async def test_resume(self):
+        gateway = Gateway(die_after=3)
+        with self.assertRaises(RuntimeError):
+            await self.scan(["/a", "/b"], gateway, concurrency=1)
+        first = gateway.requested
+        gateway = Gateway()
+        await self.scan(["/a", "/b"], gateway, resume=True)
+        ids = [node["id"] for node in self.read()]
+        self.assertCountEqual(ids, TREE)
+        self.assertFalse(set(first) & set(gateway.requested))
+
+    # URI which failed is not checkpointed and it's fetched again on resume
+    async def test_resume_retries_failed(self):
+        await self.scan(["/a"], Gateway(failing={"/a/2/x"}))
+        self.assertNotIn("/a/2/x", [node.get("id") for node in self.read()])
+        gateway = Gateway()
+        await self.scan(["/a"], gateway, resume=True)
+        self.assertEqual(gateway.requested, ["/a/2/x"])
+        self.assertIn("/a/2/x", [node.get("id") for node in self.read()])
+
+    # root which wasn't found is tried again on resume but written once
+    async def test_resume_not_found_root(self):
+        await self.scan(["/a", "/nope"], Gateway())
+        gateway = Gateway()
+        await self.scan(["/a", "/nope"], gateway, resume=True)
+        await self.scan(["/a", "/nope"], gateway, resume=True)
+        self.assertEqual(gateway.requested, ["/nope", "/nope"])
+        self.assertEqual(self.read().count({"/nope": NOT_FOUND}), 1)
+
+    # concurrent scans sharing visited URIs write common node once
+    async def test_shared_visited(self):
+        gateway = Gateway()
+        sinks = [
+            await NdjsonSink.open(os.path.join(self._dir.name, f"{name}.ndjson"))
+            for name in ("a", "b")
+        ]
+        visited = set()
+        try:
+            await asyncio.gather(
+                stream_scan(["/a"], gateway.get, sinks[0], visited=visited),
+                stream_scan(["/b"], gateway.get, sinks[1], visited=visited),
+            )
+        finally:
+            for sink in sinks:
+                await sink.close()
+        ids = [node["id"] for sink in sinks for node in self.read(sink.filename)]
+        self.assertCountEqual(ids, TREE)
+        self.assertCountEqual(gateway.requested, TREE)
+
+
+CIRCUITS = {
+    "/gateway/uuid": {"id": "/gateway/uuid", "value": "123456789"},
+    "/gateway/versionFirmware": {"id": "/gateway/versionFirmware", "value": "04.07.03"},
+    "/system/bus": {"id": "/system/bus", "value": "EMS"},
+    "/system/info": {"id": "/system/info", "values": [{"Id": "158"}]},
+    "/heatingCircuits": {
+        "id": "/heatingCircuits",
+        "type": "refEnum",
+        "references": refs("/heatingCircuits/hc1", "/heatingCircuits/hc2"),
+    },
+    "/dhwCircuits": {
+        "id": "/dhwCircuits",
+        "type": "refEnum",
+        "references": refs("/dhwCircuits/dhw1"),
+    },
+}
+
+
+class CircuitConnector(FakeConnector):
+    """Answer every URI below circuits."""
+
+    def respond(self, path):
+        if path.startswith(("/heatingCircuits/hc", "/dhwCircuits/dhw")):
+            return {"id": path, "type": "stringValue", "value": "auto"}
+        return super().respond(path)
+
+
+class SmallscanAllTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self._dir.name, "circuits.ndjson")
+        self.gateway = fake_gateway(CIRCUITS, connector=CircuitConnector)
+        self.connector = self.gateway._connector
+        await self.gateway.initialize()
+
+    async def asyncTearDown(self):
+        self._dir.cleanup()
+
+    def read(self):
+        with open(self.output) as output:
+            nodes = [json.loads(line) for line in output]
+        return [node["id"] for node in nodes if "id" in node]
+
+    # every circuit is scanned, resumed scan fetches only failed URIs
+    async def test_resume(self):
+        roots = await self.gateway._discover_circuit_roots()
+        self.assertEqual(
+            list(roots),
+            ["/heatingCircuits/hc1", "/heatingCircuits/hc2", "/dhwCircuits/dhw1"],
+        )
+        uris = [uri for circuit in roots.values() for uri in circuit]
+        self.connector.failing = set(uris[::2])
+        written = await self.gateway.smallscan_all(self.output)
+        self.assertEqual(written, {self.output: len(uris) - len(uris[::2])})
+        self.connector.failing = set()
+        self.connector.gets = []
+        await self.gateway.smallscan_all(self.output, resume=True)
+        scanned = [uri for uri in self.connector.gets if uri in uris]
+        self.assertCountEqual(scanned, uris[::2])
+        self.assertCountEqual(self.read(), uris)
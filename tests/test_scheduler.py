@@ -0,0 +1,110 @@
+import asyncio
+import unittest
+
+from bosch_thermostat_client.connectors.scheduler import (
+    BACKGROUND,
+    INTERACTIVE_READ,
+    INTERACTIVE_WRITE,
+    RequestScheduler,
+    current_priority,
+    request_priority,
+)
+
+
+class SchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def run_queued(self, scheduler, requests):
+        """Queue (name, priority) requests behind busy slot, return run order."""
+        order = []
+
+        async def request(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await scheduler.acquire()
+        tasks = []
+        for name, priority in requests:
+            tasks.append(asyncio.ensure_future(request(name, priority)))
+            await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    # writes go first, then reads, background last, FIFO within class
+    async def test_priority(self):
+        order = await self.run_queued(
+            RequestScheduler(),
+            [
+                ("poll1", BACKGROUND),
+                ("read1", INTERACTIVE_READ),
+                ("poll2", BACKGROUND),
+                ("write", INTERACTIVE_WRITE),
+                ("read2", INTERACTIVE_READ),
+            ],
+        )
+        self.assertEqual(order, ["write", "read1", "read2", "poll1", "poll2"])
+
+    # request waiting longer than max_wait is not starved
+    async def test_starvation(self):
+        order = await self.run_queued(
+            RequestScheduler(max_wait=0),
+            [("poll", BACKGROUND), ("read", INTERACTIVE_READ)],
+        )
+        self.assertEqual(order, ["poll", "read"])
+
+    async def test_capacity(self):
+        scheduler = RequestScheduler(capacity=2)
+        running = []
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with scheduler.slot():
+                running.append(1)
+                peak = max(peak, len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        self.assertEqual(peak, 2)
+        self.assertEqual(scheduler.active, 0)
+        self.assertEqual(scheduler.stats["interactive_read"]["granted"], 6)
+
+    # cancelled waiter leaves queue and doesn't take slot
+    async def test_cancel_waiting(self):
+        scheduler = RequestScheduler()
+        await scheduler.acquire()
+        waiting = asyncio.ensure_future(scheduler.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.queue_depth["background"], 1)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.queue_depth["background"], 0)
+        scheduler.release()
+        self.assertEqual(scheduler.active, 0)
+        await asyncio.wait_for(scheduler.acquire(), 1)
+        self.assertEqual(scheduler.active, 1)
+
+    # slot granted to waiter cancelled before it ran goes to the next one
+    async def test_cancel_granted(self):
+        scheduler = RequestScheduler()
+        await scheduler.acquire()
+        first = asyncio.ensure_future(scheduler.acquire())
+        second = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0)
+        scheduler.release()
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(scheduler.active, 1)
+        scheduler.release()
+        self.assertEqual(scheduler.active, 0)
+
+    async def test_request_priority(self):
+        self.assertEqual(current_priority(), INTERACTIVE_READ)
+        with request_priority(BACKGROUND):
+            self.assertEqual(current_priority(), BACKGROUND)
+            with request_priority(INTERACTIVE_WRITE):
+                self.assertEqual(current_priority(), INTERACTIVE_WRITE)
+            self.assertEqual(current_priority(), BACKGROUND)
+        self.assertEqual(current_priority(), INTERACTIVE_READ)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from slixmpp.exceptions import IqTimeout
+
+from bosch_thermostat_client.connectors import session
+from bosch_thermostat_client.connectors.ivt import IVTXMPPConnector
+from bosch_thermostat_client.connectors.session import XMPPSessionSupervisor
+from bosch_thermostat_client.encryption import IVTEncryption
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+
+
+class FakeServer:
+    """Stand in for XMPP relay the connector talks to."""
+
+    def __init__(self, connector, refuse=0, auth=True):
+        self.connector = connector
+        self.refuse = refuse
+        self.auth = auth
+        self.answer_pings = True
+        self.connects = 0
+        self.pings = 0
+        self.sent = []
+        client = connector.client
+        connector.connect_client = self.connect
+        client.abort = self.drop
+        client.send_message = lambda mto, mbody, mtype: self.sent.append(mbody)
+        client.plugin["xep_0199"].ping = self.ping
+
+    def connect(self):
+        self.connects += 1
+        if self.refuse:
+            # Connection attempt never ends with session.
+            self.refuse -= 1
+            return
+        asyncio.get_running_loop().call_soon(self._session_start)
+
+    def _session_start(self):
+        self.connector._auth(self.auth)
+        if self.auth:
+            self.connector.connected_event.set()
+
+    def drop(self):
+        """Stream got closed, slixmpp fires disconnected event."""
+        self.connector._disconnected(None)
+
+    async def ping(self, timeout):
+        self.pings += 1
+        if not self.answer_pings:
+            raise IqTimeout(None)
+        return 0.001
+
+
+async def wait_for(condition):
+    async with asyncio.timeout(1):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+class SupervisorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(session, "TIMEOUT", 0.02)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.encryption = IVTEncryption(ACCESS_KEY, "pw")
+        self.connector = IVTXMPPConnector("123456789", ACCESS_KEY, self.encryption)
+        self.supervisor = XMPPSessionSupervisor(
+            self.connector,
+            ping_interval=0.01,
+            min_backoff=0.001,
+            max_backoff=0.004,
+        )
+        self.connector._supervisor = self.supervisor
+
+    async def asyncTearDown(self):
+        await self.supervisor.stop()
+
+    def answer(self, body, seq_no):
+        raw = self.encryption.encrypt(json.dumps(body)).decode()
+        self.connector.main_listener(
+            {"type": "chat", "body": f"HTTP/1.0 200 OK\nSeq-No: {seq_no}\n\n{raw}"}
+        )
+
+    async def test_reconnect_on_disconnect(self):
+        server = FakeServer(self.connector)
+        await self.supervisor.wait_connected()
+        self.assertEqual(server.connects, 1)
+        server.drop()
+        self.assertFalse(self.connector.connected_event.is_set())
+        await self.supervisor.wait_connected()
+        await wait_for(lambda: self.supervisor.reconnects == 1)
+        self.assertEqual(server.connects, 2)
+        self.assertTrue(self.connector.auth_success)
+
+    # refused connections are retried until session opens
+    async def test_retry_refused(self):
+        server = FakeServer(self.connector, refuse=2)
+        await self.supervisor.wait_connected(timeout=1)
+        self.assertEqual(server.connects, 3)
+
+    def test_backoff(self):
+        with mock.patch.object(session.random, "uniform", lambda low, high: high):
+            upper = [self.supervisor._backoff(attempt) for attempt in range(5)]
+        with mock.patch.object(session.random, "uniform", lambda low, high: low):
+            lower = [self.supervisor._backoff(attempt) for attempt in range(5)]
+        # Delay doubles up to max_backoff, jitter keeps at least half of it.
+        self.assertEqual(upper, [0.001, 0.002, 0.004, 0.004, 0.004])
+        self.assertEqual(lower, [delay / 2 for delay in upper])
+        delays = {self.supervisor._backoff(3) for _ in range(20)}
+        self.assertGreater(len(delays), 1)
+        self.assertTrue(all(0.002 <= delay <= 0.004 for delay in delays))
+
+    async def test_keepalive(self):
+        server = FakeServer(self.connector)
+        await self.supervisor.wait_connected()
+        await wait_for(lambda: server.pings >= 3)
+        self.assertEqual(server.connects, 1)
+        # Ping without answer drops the session and opens a new one.
+        server.answer_pings = False
+        await wait_for(lambda: server.connects == 2)
+        server.answer_pings = True
+        await self.supervisor.wait_connected()
+        self.assertEqual(self.supervisor.reconnects, 1)
+
+    async def test_failed_auth_stops(self):
+        server = FakeServer(self.connector, auth=False)
+        self.supervisor.start()
+        await wait_for(lambda: not self.supervisor.running)
+        self.assertEqual(server.connects, 1)
+        self.assertFalse(self.connector.auth_success)
+
+    # request in flight when session drops is sent again after reconnect
+    async def test_resend_pending(self):
+        server = FakeServer(self.connector)
+        await self.supervisor.wait_connected()
+        request = asyncio.ensure_future(self.connector.get("/gateway/uuid"))
+        await wait_for(lambda: server.sent)
+        [message] = server.sent
+        server.drop()
+        await wait_for(lambda: len(server.sent) == 2)
+        self.assertEqual(server.sent, [message, message])
+        self.assertEqual(server.connects, 2)
+        [pending] = self.connector._router.pending
+        self.answer({"id": "/gateway/uuid", "value": "1"}, pending.seq_no)
+        self.assertEqual((await request)["value"], "1")
@@ -0,0 +1,72 @@
+import asyncio
+import copy
+import json
+import unittest
+
+from bosch_thermostat_client.const import MODELS
+from bosch_thermostat_client.db import (
+    get_db_of_firmware,
+    get_initial_db,
+    get_shared_db_of_firmware,
+    get_shared_initial_db,
+)
+from bosch_thermostat_client.db.shared import freeze, schema_view
+
+DEVICE = "RC300_RC200"
+FIRMWARE = "04.07.03"
+
+
+class FreezeTest(unittest.TestCase):
+    def setUp(self):
+        self.frozen = freeze({"hc": {"refs": {"mode": {"id": "/mode"}}, "ids": [1]}})
+
+    def test_read_only(self):
+        changes = [
+            lambda: self.frozen.update(x=1),
+            lambda: self.frozen["hc"].pop("ids"),
+            lambda: self.frozen["hc"]["refs"].__setitem__("x", 1),
+            lambda: self.frozen["hc"]["refs"]["mode"].setdefault("x", 1),
+            lambda: self.frozen["hc"]["ids"].append(2),
+        ]
+        for change in changes:
+            with self.assertRaises(TypeError):
+                change()
+
+    # frozen value still works as plain JSON
+    def test_compatible(self):
+        self.assertIsInstance(self.frozen["hc"], dict)
+        self.assertEqual(json.loads(json.dumps(self.frozen)), self.frozen)
+        self.assertIn("refs", self.frozen["hc"])
+        self.assertEqual(self.frozen["hc"].get("missing", {}), {})
+        mutable = copy.deepcopy(self.frozen)
+        mutable["hc"]["ids"].append(2)
+        self.assertEqual(self.frozen["hc"]["ids"], [1])
+        view = dict(self.frozen)
+        view["extra"] = 1
+        self.assertNotIn("extra", self.frozen)
+
+
+class SharedSchemaTest(unittest.TestCase):
+    def test_view(self):
+        async def load():
+            views = []
+            for _ in range(2):
+                initial_db = await get_shared_initial_db("IVT")
+                firmware_db = await get_shared_db_of_firmware(DEVICE, FIRMWARE)
+                views.append(schema_view(firmware_db, initial_db, exclude=(MODELS,)))
+            old = await get_db_of_firmware(DEVICE, FIRMWARE)
+            initial_db = await get_initial_db("IVT")
+            initial_db.pop(MODELS)
+            old.update(initial_db)
+            return views, old
+
+        (first, second), old = asyncio.run(load())
+        self.assertEqual(first, old)
+        self.assertIsNot(first, second)
+        self.assertIs(first["heatingCircuits"], second["heatingCircuits"])
+        with self.assertRaises(TypeError):
+            first["heatingCircuits"]["refs"]["new"] = {}
+        # Top level belongs to gateway.
+        first["extra"] = 1
+        self.assertNotIn("extra", second)
+        json.dumps(first)
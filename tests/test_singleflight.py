@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from bosch_thermostat_client.exceptions import DeviceException
+
+from .fake_connector import FakeConnector
+
+VALUES = {"/a": 1, "/b": 2}
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connector = FakeConnector(values=VALUES)
+        self.connector.release.clear()
+
+    async def gather(self, connector, paths):
+        tasks = [asyncio.ensure_future(connector.get(path)) for path in paths]
+        await asyncio.sleep(0)
+        connector.release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    # concurrent GETs of the same path send one request
+    async def test_coalesce(self):
+        connector = self.connector
+        results = await self.gather(connector, ["/a"] * 5 + ["/b"])
+        self.assertCountEqual(connector.gets, ["/a", "/b"])
+        self.assertEqual(results[:5], [{"id": "/a", "value": 1}] * 5)
+        self.assertEqual(connector.stats["coalesced"], 4)
+        # Every caller gets its own copy.
+        self.assertEqual(len({id(result) for result in results[:5]}), 5)
+
+    # error of shared request reaches every caller
+    async def test_error(self):
+        connector = self.connector
+        connector.error = DeviceException("broken")
+        results = await self.gather(connector, ["/a"] * 3)
+        self.assertEqual(connector.gets, ["/a"])
+        for result in results:
+            self.assertIsInstance(result, DeviceException)
+
+    # caller which gives up doesn't cancel request of others
+    async def test_cancelled_caller(self):
+        connector = self.connector
+        first = asyncio.ensure_future(connector.get("/a"))
+        second = asyncio.ensure_future(connector.get("/a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        connector.release.set()
+        self.assertEqual(await second, {"id": "/a", "value": 1})
+        self.assertTrue(first.cancelled())
+
+    # request nobody waits for anymore is cancelled
+    async def test_cancelled_every_caller(self):
+        connector = self.connector
+        callers = [asyncio.ensure_future(connector.get("/a")) for _ in range(2)]
+        await asyncio.sleep(0)
+        [request] = connector._single_flight._calls.values()
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(request.done())
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertTrue(request.cancelled())
+        self.assertEqual(connector._single_flight.in_flight, 0)
+
+    # finished request is not shared with later callers
+    async def test_sequential(self):
+        connector = self.connector
+        connector.release.set()
+        await connector.get("/a")
+        await connector.get("/a")
+        self.assertEqual(connector.gets, ["/a", "/a"])
+        self.assertEqual(connector._single_flight.in_flight, 0)
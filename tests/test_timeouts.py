@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from bosch_thermostat_client.connectors.base import BaseConnector
+from bosch_thermostat_client.connectors.timeouts import RttEstimator
+from bosch_thermostat_client.const import GET
+
+
+class RttEstimatorTest(unittest.TestCase):
+    # retry backs off without changing timeout of next requests
+    def test_retry_timeout(self):
+        estimator = RttEstimator(initial=3)
+        self.assertEqual(estimator.retry_timeout(0), 3)
+        self.assertEqual(estimator.retry_timeout(2), 12)
+        self.assertEqual(estimator.retry_timeout(5), 30)
+        self.assertEqual(estimator.timeout, 3)
+        estimator.set_fixed(5)
+        self.assertEqual(estimator.retry_timeout(2), 5)
+
+
+class RetriesTest(unittest.IsolatedAsyncioTestCase):
+    async def attempts(self, **kwargs):
+        connector = BaseConnector(get_timeout=3, **kwargs)
+        timeouts = []
+
+        async def send(timeout, attempt):
+            timeouts.append(timeout)
+            raise asyncio.TimeoutError
+
+        for _ in range(2):
+            with self.assertRaises(asyncio.TimeoutError):
+                await connector._with_retries(GET, "/dead", send)
+        return timeouts
+
+    # dead URI is asked once by default
+    async def test_no_retries_by_default(self):
+        self.assertEqual(await self.attempts(), [3, 3])
+
+    async def test_opt_in_retries(self):
+        timeouts = await self.attempts(get_retries=2)
+        self.assertEqual(timeouts, [3, 6, 12, 3, 6, 12])
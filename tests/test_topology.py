@@ -0,0 +1,138 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from bosch_thermostat_client.gateway.topology import load_snapshot
+
+from .fake_connector import fake_gateway
+from .test_bootstrap import RootsConnector
+from .test_scan import CIRCUITS
+
+POOL = "/heatSources/poolStatus"
+STATUS = "/heatingCircuits/hc1/status"
+
+
+class GatewayConnector(RootsConnector):
+    """Gateway whose circuit status, pool switch and firmware can change."""
+
+    def __init__(self, responses=None, **kwargs):
+        super().__init__(responses, **kwargs)
+        self.status = "auto"
+        self.firmware = "04.07.03"
+        self.pool = "off"
+
+    def respond(self, path):
+        if path == STATUS:
+            return {"id": path, "type": "stringValue", "value": self.status}
+        if path == POOL:
+            return {
+                "id": path,
+                "type": "stringValue",
+                "value": self.pool,
+                "allowedValues": ["on", "off"],
+            }
+        if path == "/gateway/versionFirmware":
+            return {"id": path, "value": self.firmware}
+        return super().respond(path)
+
+
+class TopologyTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self._dir.name, "topology.json")
+        gateway = fake_gateway(CIRCUITS, connector=GatewayConnector)
+        await gateway.initialize()
+        self.supported = await gateway.get_capabilities()
+        await gateway.save_topology(self.filename)
+        self.snapshot = await load_snapshot(self.filename)
+        self.gateway = fake_gateway(CIRCUITS, connector=GatewayConnector)
+        self.connector = self.gateway._connector
+
+    async def asyncTearDown(self):
+        await self.gateway.close()
+        self._dir.cleanup()
+
+    def status(self):
+        return self.gateway.heating_circuits[0].get_property("status")
+
+    def pool(self):
+        return list(self.gateway.regular_switches)[0]
+
+    # snapshot keeps structure and gateway info, not current values
+    def test_snapshot(self):
+        responses = self.snapshot["responses"]
+        self.assertEqual(
+            responses[POOL],
+            {"id": POOL, "type": "stringValue", "allowedValues": ["on", "off"]},
+        )
+        # Circuit without status is not created, so status is kept.
+        self.assertEqual(responses[STATUS]["value"], "auto")
+        self.assertEqual(responses["/gateway/versionFirmware"]["value"], "04.07.03")
+        self.assertEqual(responses["/system/info"]["values"], [{"Id": "158"}])
+        self.assertEqual(set(self.snapshot), {"version", "key", "responses"})
+
+    async def test_round_trip(self):
+        supported = await self.gateway.restore_topology(self.snapshot)
+        self.assertEqual(self.connector.gets, [])
+        self.assertEqual(supported, self.supported)
+        self.assertEqual(self.gateway.firmware, "04.07.03")
+        self.assertEqual(self.gateway.bus_type, "EMS")
+        self.assertEqual(
+            [circuit.name for circuit in self.gateway.heating_circuits], ["hc1", "hc2"]
+        )
+        self.assertEqual(
+            self.pool().get_property(self.pool().attr_id),
+            {"allowedValues": ["on", "off"]},
+        )
+        self.assertEqual(self.status()["value"], "auto")
+        self.assertEqual(await self.gateway.revalidation, [])
+        self.assertEqual(
+            self.gateway.export_topology()["responses"], self.snapshot["responses"]
+        )
+
+    # values fetched by revalidation replace those missing in snapshot
+    async def test_revalidation_values(self):
+        self.connector.status = "manual"
+        self.connector.pool = "on"
+        await self.gateway.restore_topology(self.snapshot)
+        circuit = self.gateway.heating_circuits[0]
+        self.assertEqual(await self.gateway.revalidation, [])
+        self.assertIs(self.gateway.heating_circuits[0], circuit)
+        self.assertEqual(self.status()["value"], "manual")
+        self.assertTrue(self.pool().state)
+        self.assertCountEqual(self.connector.gets, self.snapshot["responses"])
+
+    async def test_stale_snapshot(self):
+        for snapshot in (
+            {**self.snapshot, "version": 1},
+            {**self.snapshot, "responses": {}},
+            None,
+        ):
+            with self.subTest(snapshot=snapshot):
+                self.assertIsNone(await self.gateway.restore_topology(snapshot))
+        self.assertIsNone(
+            await self.gateway.restore_topology(self.snapshot, uuid="987654321")
+        )
+        self.assertIsNone(self.gateway.revalidation)
+        self.assertEqual(self.connector.gets, [])
+
+    # gateway with new firmware is discovered again and snapshot replaced
+    async def test_firmware_changed(self):
+        self.connector.firmware = "04.08.02"
+        self.connector.status = "manual"
+        await self.gateway.restore_topology(self.snapshot)
+        circuit = self.gateway.heating_circuits[0]
+        self.assertEqual(await self.gateway.revalidation, ["/gateway/versionFirmware"])
+        self.assertEqual(self.gateway.firmware, "04.08.02")
+        self.assertEqual(self.gateway.export_topology()["key"], "123456789:04.08.02")
+        self.assertIsNot(self.gateway.heating_circuits[0], circuit)
+        self.assertEqual(self.status()["value"], "manual")
+
+    async def test_close(self):
+        self.connector.release.clear()
+        await self.gateway.restore_topology(self.snapshot)
+        await self.gateway.close()
+        with self.assertRaises(asyncio.CancelledError):
+            await self.gateway.revalidation
+        self.assertTrue(self.gateway.revalidation.cancelled())
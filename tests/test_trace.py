@@ -0,0 +1,30 @@
+import logging
+import unittest
+
+from bosch_thermostat_client.trace import get_tracer
+
+tracer = get_tracer("bosch_thermostat_client.test_trace")
+
+
+class TraceTest(unittest.TestCase):
+    def test_record(self):
+        with self.assertLogs(
+            "bosch_thermostat_client.test_trace", logging.DEBUG
+        ) as logs:
+            tracer("request", method="get", path="/gateway/uuid")
+        record = logs.records[0]
+        self.assertEqual(
+            record.getMessage(), 'request method="get" path="/gateway/uuid"'
+        )
+        self.assertEqual(
+            record.trace, {"event": "request", "method": "get", "path": "/gateway/uuid"}
+        )
+        # Record points at code calling tracer.
+        self.assertEqual(record.funcName, "test_record")
+        self.assertEqual(record.filename, "test_trace.py")
+
+    def test_disabled(self):
+        logger = logging.getLogger("bosch_thermostat_client.test_trace")
+        logger.setLevel(logging.INFO)
+        self.addCleanup(logger.setLevel, logging.NOTSET)
+        self.assertFalse(tracer.enabled)
@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+
+from .fake_connector import FakeConnector
+
+QUIET = 0.2
+SETPOINT = "/heatingCircuits/hc1/temperatureRoomManual"
+
+
+class WriteQueueTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connector = FakeConnector(write_debounce=QUIET)
+
+    # values written quickly one after another are sent once
+    async def test_debounce(self):
+        results = await asyncio.gather(
+            *(self.connector.put(SETPOINT, value) for value in (20, 20.5, 21))
+        )
+        self.assertEqual(self.connector.puts, [(SETPOINT, 21)])
+        self.assertEqual(results, [True] * 3)
+        self.assertEqual(self.connector.stats["writes_coalesced"], 2)
+
+    # quiet period starts again with every new value
+    async def test_quiet_period(self):
+        first = asyncio.ensure_future(self.connector.put(SETPOINT, 20))
+        await asyncio.sleep(QUIET / 2)
+        second = asyncio.ensure_future(self.connector.put(SETPOINT, 21))
+        await asyncio.sleep(QUIET * 0.75)
+        self.assertEqual(self.connector.puts, [])
+        await asyncio.gather(first, second)
+        self.assertEqual(self.connector.puts, [(SETPOINT, 21)])
+
+    async def test_paths(self):
+        await asyncio.gather(
+            self.connector.put(SETPOINT, 21), self.connector.put("/dhw/mode", "on")
+        )
+        self.assertCountEqual(
+            self.connector.puts, [(SETPOINT, 21), ("/dhw/mode", "on")]
+        )
+
+    # caller which gives up doesn't stop the write of others
+    async def test_cancelled_caller(self):
+        first = asyncio.ensure_future(self.connector.put(SETPOINT, 20))
+        second = asyncio.ensure_future(self.connector.put(SETPOINT, 21))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertTrue(await second)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.connector.puts, [(SETPOINT, 21)])
+
+    # lone cancelled caller still gets its value written
+    async def test_cancelled_only_caller(self):
+        put = asyncio.ensure_future(self.connector.put(SETPOINT, 20))
+        await asyncio.sleep(0)
+        put.cancel()
+        await self.connector.flush_writes()
+        self.assertEqual(self.connector.puts, [(SETPOINT, 20)])
+
+    async def test_error(self):
+        self.connector.error = ValueError("bad")
+        puts = [self.connector.put(SETPOINT, value) for value in (20, 21)]
+        results = await asyncio.gather(*puts, return_exceptions=True)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    async def test_flush(self):
+        put = asyncio.ensure_future(self.connector.put(SETPOINT, 21))
+        await asyncio.sleep(0)
+        await self.connector.flush_writes()
+        self.assertEqual(self.connector.puts, [(SETPOINT, 21)])
+        self.assertTrue(await put)
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import re
+import unittest
+
+from bosch_thermostat_client.connectors.easycontrol import EasycontrolConnector
+from bosch_thermostat_client.connectors.ivt import IVTXMPPConnector
+from bosch_thermostat_client.connectors.nefit import NefitConnector
+from bosch_thermostat_client.const import GET, PUT
+from bosch_thermostat_client.encryption import (
+    EasycontrolEncryption,
+    IVTEncryption,
+    NefitEncryption,
+)
+from bosch_thermostat_client.exceptions import DeviceException, EncryptionException
+
+ACCESS_KEY = "abc1abc2abc3abc4"
+
+
+def connected(connector):
+    """Pretend session is open and keep messages connector sends."""
+    connector.sent = []
+    connector._auth_success = True
+    connector.connected_event.set()
+    connector.client.send_message = lambda mto, mbody, mtype: connector.sent.append(
+        mbody
+    )
+    return connector
+
+
+def seq_no(message):
+    return int(re.search(r"Seq-No: (\d+)", message).group(1))
+
+
+def answer(connector, body, seq_no=None):
+    """Deliver encrypted response as gateway would send it."""
+    headers = "" if seq_no is None else f"Seq-No: {seq_no}\n"
+    raw = connector._encryption.encrypt(json.dumps(body)).decode()
+    connector.main_listener(
+        {"type": "chat", "body": f"HTTP/1.0 200 OK\n{headers}\n{raw}"}
+    )
+
+
+async def sent(connector, count):
+    while len(connector.sent) < count:
+        await asyncio.sleep(0)
+
+
+class XMPPConnectorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connector = IVTXMPPConnector(
+            "123456789", ACCESS_KEY, IVTEncryption(ACCESS_KEY, "pw")
+        )
+
+    # requests sent before session exists open it once
+    async def test_connect_once(self):
+        connects = []
+
+        async def session_start():
+            await asyncio.sleep(0.01)
+            self.connector._auth_success = True
+            self.connector.connected_event.set()
+
+        def connect_client():
+            connects.append(asyncio.ensure_future(session_start()))
+
+        self.connector.connect_client = connect_client
+        await asyncio.gather(*(self.connector._ensure_connected() for _ in range(5)))
+        self.assertEqual(len(connects), 1)
+
+    # offloaded decrypt is tracked and its failure reaches waiting request
+    async def test_decrypt_failure(self):
+        self.connector._offload_decrypt = lambda raw: True
+
+        async def json_decrypt(raw):
+            raise DeviceException("Unable to decode")
+
+        self.connector._json_decrypt = json_decrypt
+        request = self.connector._router.register(GET, "/gateway/uuid", seq_no=3)
+        self.connector.main_listener(
+            {"type": "chat", "body": "HTTP/1.0 200 OK\nSeq-No: 3\n\nxxxx"}
+        )
+        self.assertEqual(len(self.connector._decrypt_tasks), 1)
+        with self.assertRaises(DeviceException):
+            await request.future
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.connector._decrypt_tasks), 0)
+
+    # requests in flight at once get their own responses by Seq-No
+    async def test_in_flight(self):
+        connector = connected(
+            IVTXMPPConnector(
+                "123456789",
+                ACCESS_KEY,
+                IVTEncryption(ACCESS_KEY, "pw"),
+                max_in_flight=3,
+            )
+        )
+        paths = ["/a", "/b", "/c"]
+        tasks = [asyncio.ensure_future(connector.get(path)) for path in paths]
+        await sent(connector, 3)
+        self.assertEqual(len(connector._router), 3)
+        seq_nos = {path: seq_no(msg) for path, msg in zip(paths, connector.sent)}
+        self.assertEqual(len(set(seq_nos.values())), 3)
+        # Responses come in reverse order and carry only Seq-No.
+        for path in reversed(paths):
+            answer(connector, {"id": "/x", "value": path}, seq_nos[path])
+        results = await asyncio.gather(*tasks)
+        self.assertEqual([result["value"] for result in results], paths)
+        self.assertEqual(len(connector._router), 0)
+
+    # gateway which doesn't echo Seq-No gets requests one by one
+    async def test_nefit_one_in_flight(self):
+        connector = connected(
+            NefitConnector(
+                "123456789",
+                NefitEncryption(ACCESS_KEY, "pw"),
+                access_key=ACCESS_KEY,
+                max_in_flight=4,
+            )
+        )
+        self.assertEqual(connector.scheduler.capacity, 1)
+        tasks = [asyncio.ensure_future(connector.get(path)) for path in ("/a", "/b")]
+        await sent(connector, 1)
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(connector.sent), 1)
+        answer(connector, {"id": "/a"})
+        await sent(connector, 2)
+        answer(connector, {"id": "/b"})
+        results = await asyncio.gather(*tasks)
+        self.assertEqual([result["id"] for result in results], ["/a", "/b"])
+
+    # EasyControl PUT has no Seq-No header, so it's not indexed by one
+    async def test_easycontrol_put_without_seq_no(self):
+        connector = connected(
+            EasycontrolConnector(
+                "123456789",
+                EasycontrolEncryption(ACCESS_KEY, "pw"),
+                access_key=ACCESS_KEY,
+                max_in_flight=2,
+            )
+        )
+        put = asyncio.ensure_future(connector.put("/p", 1))
+        get = asyncio.ensure_future(connector.get("/g"))
+        await sent(connector, 2)
+        put_message, get_message = connector.sent
+        self.assertNotIn("Seq-No", put_message)
+        [pending_put] = [
+            request for request in connector._router.pending if request.method == PUT
+        ]
+        self.assertIsNone(pending_put.seq_no)
+        # Seq-No isn't used up by PUT.
+        self.assertEqual(seq_no(get_message), 0)
+        connector.main_listener(
+            {"type": "chat", "body": "HTTP/1.0 204 No Content\nContent-Length: 0\n\n"}
+        )
+        answer(connector, {"id": "/g"}, seq_no(get_message))
+        self.assertTrue(await put)
+        self.assertEqual((await get)["id"], "/g")
+
+    # cancelled request raises CancelledError instead of returning None
+    async def test_cancel_propagates(self):
+        connector = connected(self.connector)
+        get = asyncio.ensure_future(connector._get("/a"))
+        await sent(connector, 1)
+        get.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await get
+        self.assertEqual(len(connector._router), 0)
+
+    async def test_wrong_encryption_propagates(self):
+        connector = connected(self.connector)
+        get = asyncio.ensure_future(connector.get("/a"))
+        await sent(connector, 1)
+        connector.main_listener(
+            {
+                "type": "chat",
+                "body": f"HTTP/1.0 200 OK\nSeq-No: {seq_no(connector.sent[0])}\n\nxx==",
+            }
+        )
+        with self.assertRaises(EncryptionException):
+            await get
+        self.assertEqual(len(connector._router), 0)
+
+    # request without answer times out and is unregistered
+    async def test_timeout(self):
+        connector = connected(self.connector)
+        connector.set_timeout(0.01)
+        with self.assertRaises(DeviceException):
+            await connector.get("/a")
+        self.assertEqual(len(connector._router), 0)